@@ -6,17 +6,27 @@ A simple web interface for the Agentic Writer System that allows users to
 generate articles on any topic with different styles.
 """
 
-from flask import Flask, render_template, request, redirect, url_for, session, jsonify
-import markdown
+from flask import (Flask, Response, make_response, render_template, request, redirect, url_for, session, jsonify,
+                   stream_with_context)
+from datetime import datetime, timezone
+import hashlib
 import os
+import json
 import time
 from src.agentic_system import AgenticSystem
-from src.utils.config import WRITING_STYLES, PUBLISHING_PLATFORMS
-from src.utils.file_manager import get_article_history
+from src.jobs import JobManager, JobQueueFull, RunAlreadyActive
+from src.utils.config import (WRITING_STYLES, PUBLISHING_PLATFORMS, JOB_WORKERS, JOB_QUEUE_LIMIT,
+                              ARTICLES_PAGE_SIZE, ARTICLES_MAX_PAGE_SIZE)
+from src.utils.file_manager import get_article, get_article_html, get_article_page, get_catalog, get_latest_article
+from src.utils.artifacts import list_runs
+from src.utils.llm import get_metrics
 
 app = Flask(__name__)
 app.secret_key = os.urandom(24)  # For session management
 
+# Generations run in the background so requests return immediately
+jobs = JobManager(max_workers=JOB_WORKERS, max_queued=JOB_QUEUE_LIMIT)
+
 @app.route('/', methods=['GET', 'POST'])
 def index():
     """
@@ -64,10 +74,30 @@ def process_article():
                           style=session.get('style', 'conversational'),
                           platform=session.get('platform', 'none'))
 
+def enqueue(system):
+    """
+    Queue a run on the job manager and answer with where to follow its progress.
+    """
+    try:
+        job = jobs.submit(system)
+    except JobQueueFull as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 503
+    except RunAlreadyActive as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 409
+    
+    session['job_id'] = job.id
+    return jsonify({
+        'status': 'queued',
+        'job_id': job.id,
+        'run_id': system.run_id,
+        'progress_url': url_for('get_job_progress', job_id=job.id),
+        'events_url': url_for('job_events', job_id=job.id)
+    }), 202
+
 @app.route('/generate', methods=['POST'])
 def generate():
     """
-    API endpoint that generates the article and returns progress updates.
+    API endpoint that queues the article for generation and returns its job id.
     """
     # Get data from session
     topic = session.get('topic', '')
@@ -78,98 +108,119 @@ def generate():
     if not topic:
         return jsonify({'error': 'No topic provided'}), 400
     
-    # Create the agentic system
-    system = AgenticSystem(topic, description, style, platform)
+    # Queue the run; the client follows it at /api/progress/<job_id>
+    return enqueue(AgenticSystem(topic, description, style, platform))
+
+@app.route('/resume/<run_id>', methods=['POST'])
+def resume(run_id):
+    """
+    API endpoint that queues an interrupted run to resume from its checkpoints.
+    """
+    try:
+        system = AgenticSystem.resume(run_id)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 404
     
-    # Generate the article synchronously (faster with our optimizations)
+    return enqueue(system)
+
+@app.route('/derive/<run_id>', methods=['POST'])
+def derive(run_id):
+    """
+    API endpoint that queues a regeneration of an earlier run with a different style,
+    platform or description, reusing every phase the change doesn't affect.
+    """
+    data = request.get_json(silent=True) or request.form
     try:
-        system.generate_full_article()
-        return jsonify({
-            'status': 'complete',
-            'redirect': url_for('show_article')
-        })
-    except Exception as e:
-        return jsonify({
-            'status': 'error',
-            'message': str(e)
-        }), 500
-
-def progress_callback(phase, section=None, progress=None, total=None):
-    """
-    Callback function for progress updates.
-    In a real app, this would update a database or use websockets.
-    """
-    from datetime import datetime
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-    
-    if section:
-        print(f"[{timestamp}] Progress: {phase} - {section} - {progress}/{total}")
-    else:
-        print(f"[{timestamp}] Progress: {phase} - {progress}/{total}")
+        system = AgenticSystem.derive(
+            run_id,
+            description=data.get('description'),
+            style=data.get('style'),
+            platform=data.get('platform')
+        )
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 404
+    
+    return enqueue(system)
+
+@app.route('/generate/stream', methods=['POST'])
+def generate_stream():
+    """
+    API endpoint that queues the article for generation and streams the draft as plain text
+    while it is written, a paragraph or section at a time.
+    """
+    # Get data from session
+    topic = session.get('topic', '')
+    description = session.get('description', '')
+    style = session.get('style', 'conversational')
+    platform = session.get('platform', 'none')
+    
+    if not topic:
+        return jsonify({'error': 'No topic provided'}), 400
+    
+    # The run goes through the job queue like /generate, so it counts against the
+    # worker and queue limits and shows up in /api/jobs
+    try:
+        job = jobs.submit(AgenticSystem(topic, description, style, platform))
+    except JobQueueFull as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 503
+    session['job_id'] = job.id
+    
+    def stream():
+        last = 0
+        while True:
+            events = job.events(last, timeout=15)
+            if not events:
+                if job.finished:
+                    break
+                continue
+            for event in events:
+                if event['event'] == 'draft':
+                    yield event['data']['text']
+                elif event['event'] == 'status' and event['data']['status'] == 'failed':
+                    yield f"\n\nError: {event['data']['error']}"
+                last = event['id']
+    
+    return Response(stream_with_context(stream()), mimetype='text/plain',
+                    headers={'X-Job-Id': job.id, 'X-Accel-Buffering': 'no'})
+
+def render_article(article):
+    """
+    Render an article page from its catalog entry and the cached HTML,
+    without reading the metadata file or converting the Markdown again.
+    """
+    html_content = get_article_html(article)
+    if html_content is None:
+        html_content = "<p>Error: Could not read article file.</p>"
+    
+    return render_template('article.html',
+                          topic=article.get('topic') or 'Unknown Topic',
+                          description=article.get('description') or '',
+                          style=article.get('style') or 'conversational',
+                          article_html=html_content)
 
 @app.route('/article')
 def show_article():
     """
     Page that displays the generated article.
     """
-    # In a real app, we would retrieve the article from a database
-    # For now, we'll just get the most recent article from the articles directory
-    
-    articles = get_article_history()
+    # The most recent article, looked up in the catalog
+    latest_article = get_latest_article()
     
-    if not articles:
+    if not latest_article:
         return render_template('article.html', 
                               topic="No Article Found",
                               description="No articles have been generated yet.",
                               style="",
                               article_html="<p>No articles have been generated yet.</p>")
     
-    # Get the most recent article
-    latest_article = articles[0]
-    
-    # Read the article file
-    from src.utils.config import ARTICLES_DIR
-    article_path = os.path.join(ARTICLES_DIR, latest_article["article_file"])
-    
-    try:
-        with open(article_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-    except:
-        content = "Error: Could not read article file."
-    
-    # Read the metadata file
-    from src.utils.config import METADATA_DIR
-    metadata_path = os.path.join(METADATA_DIR, latest_article["metadata_file"])
-    
-    try:
-        with open(metadata_path, 'r', encoding='utf-8') as f:
-            import json
-            metadata = json.load(f)
-    except:
-        metadata = {}
-    
-    # Convert markdown to HTML
-    html_content = markdown.markdown(content)
-    
-    return render_template('article.html',
-                          topic=metadata.get('topic', 'Unknown Topic'),
-                          description=metadata.get('description', ''),
-                          style=metadata.get('style', 'conversational'),
-                          article_html=html_content)
+    return render_article(latest_article)
 
 @app.route('/article/<article_id>')
 def show_specific_article(article_id):
     """
     Page that displays a specific article by ID.
     """
-    articles = get_article_history()
-    
-    # Find the article with the matching ID
-    article = None
-    for a in articles:
-        if a.get('id') == article_id:
-            article = a
-            break
+    article = get_article(article_id)
     
     if not article:
         return render_template('article.html', 
@@ -178,73 +229,190 @@ def show_specific_article(article_id):
                               style="",
                               article_html="<p>The requested article could not be found.</p>")
     
-    # Read the article file
-    from src.utils.config import ARTICLES_DIR
-    article_path = os.path.join(ARTICLES_DIR, article["article_file"])
-    
-    try:
-        with open(article_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-    except:
-        content = "Error: Could not read article file."
+    return render_article(article)
+
+def article_url(status):
+    """
+    Get the page of the article a finished job saved.
+    """
+    if status.get('article_id'):
+        return url_for('show_specific_article', article_id=status['article_id'])
+    return url_for('show_article')
+
+def job_status(job):
+    """
+    Get a job's status for the API, with the article page to open once it is done.
+    """
+    status = job.to_dict()
+    if status['status'] == 'complete':
+        status['redirect'] = article_url(status)
+    return status
+
+@app.route('/api/progress/<job_id>')
+def get_job_progress(job_id):
+    """
+    API endpoint that returns a job's status: current phase and section, finished
+    and running steps, per-phase times and elapsed time.
+    """
+    job = jobs.get(job_id)
+    if not job:
+        return jsonify({'status': 'error', 'message': f'Unknown job: {job_id}'}), 404
+    return jsonify(job_status(job))
+
+@app.route('/api/events/<job_id>')
+def job_events(job_id):
+    """
+    Server-sent events endpoint that pushes a job's status and progress updates,
+    and its draft a paragraph or section at a time, as they happen.
     
-    # Read the metadata file
-    from src.utils.config import METADATA_DIR
-    metadata_path = os.path.join(METADATA_DIR, article["metadata_file"])
+    Reconnecting clients send Last-Event-ID and only get the events they missed.
+    The stream ends after the job's final status event.
+    """
+    job = jobs.get(job_id)
+    if not job:
+        return jsonify({'status': 'error', 'message': f'Unknown job: {job_id}'}), 404
     
-    try:
-        with open(metadata_path, 'r', encoding='utf-8') as f:
-            import json
-            metadata = json.load(f)
-    except:
-        metadata = {}
+    after = request.headers.get('Last-Event-ID', type=int) or request.args.get('after', 0, type=int)
     
-    # Convert markdown to HTML
-    html_content = markdown.markdown(content)
+    def stream():
+        last = after
+        yield "retry: 3000\n\n"
+        while True:
+            events = job.events(last, timeout=15)
+            if not events:
+                if job.finished:
+                    break
+                # Comment line so proxies don't drop the idle connection
+                yield ": keep-alive\n\n"
+                continue
+            for event in events:
+                data = event['data']
+                if event['event'] == 'status' and data['status'] == 'complete':
+                    data = dict(data, redirect=article_url(data))
+                yield f"id: {event['id']}\nevent: {event['event']}\ndata: {json.dumps(data)}\n\n"
+                last = event['id']
     
-    return render_template('article.html',
-                          topic=metadata.get('topic', 'Unknown Topic'),
-                          description=metadata.get('description', ''),
-                          style=metadata.get('style', 'conversational'),
-                          article_html=html_content)
+    return Response(stream_with_context(stream()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 @app.route('/api/progress')
 def get_progress():
     """
-    API endpoint that returns the current progress.
-    In a real app, this would retrieve progress from a database or cache.
+    API endpoint that returns the progress of this session's latest job.
+    """
+    job = jobs.get(session.get('job_id', ''))
+    if not job:
+        return jsonify({'status': 'idle', 'message': 'No article is being generated'})
+    return jsonify(job_status(job))
+
+@app.route('/api/jobs')
+def list_jobs():
     """
-    # Mock progress data
-    progress_data = {
-        'phase': 'writing',
-        'section': 'How AI Agents Work',
-        'progress': 2,
-        'total': 5,
-        'message': 'Writing content for section 2 of 5'
-    }
+    API endpoint that returns the known jobs, newest first, and counts by status.
+    """
+    return jsonify({'stats': jobs.stats(), 'jobs': jobs.list()})
+
+@app.route('/api/metrics')
+def metrics():
+    """
+    API endpoint that returns LLM call metrics: latency percentiles, token counts,
+    cache hits and retries, broken down by model, agent and phase.
+    """
+    recent = request.args.get('recent', 20, type=int)
+    return jsonify(get_metrics(recent))
+
+@app.route('/api/runs')
+def runs():
+    """
+    API endpoint that returns checkpointed runs, optionally filtered by status
+    (e.g. ?status=failed for runs that can be resumed).
+    """
+    return jsonify(list_runs(request.args.get('status')))
+
+def article_listing():
+    """
+    Get the page of articles a listing request asks for.
+    
+    Query parameters: limit, cursor, sort (timestamp or topic), order (desc or asc)
+    and the topic, platform and style filters.
+    """
+    limit = request.args.get('limit', ARTICLES_PAGE_SIZE, type=int)
+    return get_article_page(
+        min(max(limit, 1), ARTICLES_MAX_PAGE_SIZE),
+        cursor=request.args.get('cursor'),
+        sort=request.args.get('sort', 'timestamp'),
+        descending=request.args.get('order', 'desc') != 'asc',
+        topic=request.args.get('topic'),
+        platform=request.args.get('platform'),
+        style=request.args.get('style')
+    )
+
+def next_page_url(endpoint, cursor):
+    """
+    Build the URL of the next page of a listing, keeping its filters and sort order.
+    """
+    args = request.args.to_dict()
+    args['cursor'] = cursor
+    return url_for(endpoint, **args)
+
+def catalog_response(build):
+    """
+    Answer a listing request, or 304 Not Modified if the client's copy is current.
     
-    return jsonify(progress_data)
+    The ETag and Last-Modified come from the catalog's last write (and the query),
+    so a conditional request costs one lookup instead of a listing.
+    """
+    last_write = get_catalog().last_modified() or 0
+    etag = hashlib.md5(f"{last_write}|{request.full_path}".encode('utf-8')).hexdigest()
+    # HTTP dates are in whole seconds: stamp the end of the second of the last write, and
+    # only once that second is over, so a later write always gets a later date
+    modified = int(last_write) + 1
+    last_modified = datetime.fromtimestamp(modified, tz=timezone.utc)
+    
+    if request.if_none_match:
+        not_modified = request.if_none_match.contains(etag)
+    else:
+        not_modified = bool(request.if_modified_since) and last_modified <= request.if_modified_since
+    
+    try:
+        response = Response(status=304) if not_modified else make_response(build())
+    except ValueError as e:
+        # A bad cursor or sort key
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    response.set_etag(etag)
+    if time.time() >= modified:
+        response.last_modified = last_modified
+    response.cache_control.no_cache = True
+    return response
 
 @app.route('/api/articles')
 def list_articles():
     """
-    API endpoint that returns a list of generated articles.
+    API endpoint that returns one page of generated articles.
+    
+    The URL of the next page, if any, is in the Link header (rel="next").
     """
-    articles = get_article_history()
-    return jsonify(articles)
+    def build():
+        page = article_listing()
+        response = jsonify(page['articles'])
+        if page['next_cursor']:
+            response.headers['Link'] = f'<{next_page_url("list_articles", page["next_cursor"])}>; rel="next"'
+            response.headers['X-Next-Cursor'] = page['next_cursor']
+        return response
+    
+    return catalog_response(build)
 
 @app.route('/articles')
 def show_articles_page():
     """
-    Page that displays all generated articles.
+    Page that displays generated articles, one page at a time.
     """
-    articles = get_article_history()
-    
-    # Add IDs to articles for linking
-    for i, article in enumerate(articles):
-        article['id'] = f"article_{i}"
+    def build():
+        page = article_listing()
+        next_url = next_page_url('show_articles_page', page['next_cursor']) if page['next_cursor'] else None
+        return render_template('articles.html', articles=page['articles'], next_url=next_url)
     
-    return render_template('articles.html', articles=articles)
+    return catalog_response(build)
 
 if __name__ == '__main__':
     app.run(debug=True) 
\ No newline at end of file
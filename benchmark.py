@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Agentic Writer System - Editing Benchmark
+
+Compares the two-pass review + humanize default with the fused single-pass
+editor on the same drafts, reporting latency and token usage for each.
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+def sample_article(sections, words_per_section, trial):
+    """
+    Build a synthetic article draft.
+
+    Args:
+        sections: Number of "##" sections
+        words_per_section: Approximate length of each section in words
+        trial: Trial number, mixed into the text so no two trials share cached responses
+
+    Returns:
+        The article text
+    """
+    sentence = "AI agents plan their work, call tools and check their own results before moving on."
+    repeats = max(1, words_per_section // len(sentence.split()))
+    parts = [f"# Benchmark Article {trial}\n\n{sentence} (Draft {trial}.)"]
+    for i in range(sections):
+        parts.append(f"## Section {i + 1}\n\n" + " ".join([sentence] * repeats))
+    parts.append(f"## Conclusion\n\n{sentence}")
+    return "\n\n".join(parts)
+
+def measure(run, get_metrics):
+    """
+    Run one editing variant and measure it.
+
+    Args:
+        run: Function performing the editing
+        get_metrics: The LLM metrics accessor
+
+    Returns:
+        Dictionary with wall time, calls and token counts
+    """
+    before = get_metrics(0)["calls"]["overall"]
+    start = time.time()
+    run()
+    elapsed = time.time() - start
+    after = get_metrics(0)["calls"]["overall"]
+    return {
+        "time": elapsed,
+        "calls": after["calls"] - before["calls"],
+        "prompt_tokens": after["prompt_tokens"] - before["prompt_tokens"],
+        "completion_tokens": after["completion_tokens"] - before["completion_tokens"]
+    }
+
+def report(results):
+    """
+    Print a comparison of the measured variants.
+
+    Args:
+        results: Dictionary mapping variant name to a list of measurements
+    """
+    print(f"\n{'variant':<10} {'median s':>9} {'mean s':>8} {'calls':>6} {'prompt tok':>11} {'compl tok':>10}")
+    summary = {}
+    for variant, runs in results.items():
+        summary[variant] = {
+            "median": statistics.median(r["time"] for r in runs),
+            "mean": statistics.mean(r["time"] for r in runs),
+            "calls": statistics.mean(r["calls"] for r in runs),
+            "prompt_tokens": statistics.mean(r["prompt_tokens"] for r in runs),
+            "completion_tokens": statistics.mean(r["completion_tokens"] for r in runs)
+        }
+        s = summary[variant]
+        print(f"{variant:<10} {s['median']:>9.2f} {s['mean']:>8.2f} {s['calls']:>6.1f} "
+              f"{s['prompt_tokens']:>11.0f} {s['completion_tokens']:>10.0f}")
+
+    separate, fused = summary["separate"], summary["fused"]
+    print(f"\nFused vs separate: {fused['median'] / max(separate['median'], 1e-9):.0%} of the latency, "
+          f"{fused['completion_tokens'] / max(separate['completion_tokens'], 1):.0%} of the completion tokens, "
+          f"{fused['prompt_tokens'] / max(separate['prompt_tokens'], 1):.0%} of the prompt tokens")
+
+def main():
+    """
+    Main entry point for the benchmark.
+    """
+    parser = argparse.ArgumentParser(description="Compare two-pass and fused review + humanize")
+    parser.add_argument("--trials", type=int, default=3, help="Number of drafts to edit with each variant")
+    parser.add_argument("--sections", type=int, default=5, help="Number of sections per draft")
+    parser.add_argument("--words", type=int, default=150, help="Approximate words per section")
+    parser.add_argument("--style", default="conversational", help="The writing style to use")
+    parser.add_argument("--platform", default="medium", help="The target publishing platform")
+    parser.add_argument("--review-mode", default="full", choices=["full", "sections"],
+                        help="Edit whole articles or section by section")
+    args = parser.parse_args()
+
+    # The system reads its configuration at import time: default to the local stand-in
+    # server, and use a throwaway cache and no checkpoints so every call is measured
+    os.environ.setdefault("LLM_BACKEND", "standin")
+    os.environ["CACHE_DIR"] = tempfile.mkdtemp(prefix="agentic-writer-benchmark-")
+    os.environ["CHECKPOINTS_ENABLED"] = "0"
+    os.environ["REVIEW_MODE"] = args.review_mode
+
+    from src.agentic_system import AgenticSystem
+    from src.utils.llm import backend, get_metrics
+    from src.utils.metrics import llm_context
+
+    print(f"Backend: {backend.describe()}")
+    print(f"{args.trials} trials, {args.sections} sections of ~{args.words} words, "
+          f"style {args.style}, platform {args.platform}, review mode {args.review_mode}")
+
+    results = {"separate": [], "fused": []}
+    for trial in range(args.trials):
+        draft = sample_article(args.sections, args.words, trial)
+        for variant in results:
+            system = AgenticSystem("Benchmark", "", args.style, args.platform)
+            system.article_content = draft
+
+            def run():
+                if variant == "fused":
+                    with llm_context(agent=system.editor.name, phase="editing"):
+                        system._edit()
+                else:
+                    with llm_context(agent=system.reviewer.name, phase="reviewing"):
+                        system._review()
+                    with llm_context(agent=system.humanizer.name, phase="humanizing"):
+                        system._humanize()
+
+            results[variant].append(measure(run, get_metrics))
+            print(f"Trial {trial + 1} {variant}: {results[variant][-1]['time']:.2f}s")
+
+    report(results)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
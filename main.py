@@ -9,8 +9,25 @@ generate articles on any topic with different styles.
 import argparse
 import sys
 from src.agentic_system import AgenticSystem
-from src.utils.config import WRITING_STYLES, PUBLISHING_PLATFORMS
+from src.utils.config import WRITING_STYLES, PUBLISHING_PLATFORMS, BATCH_WORKERS, BATCH_LLM_CONCURRENCY
 from src.utils.file_manager import get_article_history
+from src.utils.artifacts import list_runs
+
+# Whether streamed article text has left the cursor mid-line
+_stream_line_open = False
+
+def token_callback(chunk):
+    """
+    Callback function for streamed article text.
+    Prints each chunk as soon as it arrives.
+    
+    Args:
+        chunk: The next piece of generated text
+    """
+    global _stream_line_open
+    sys.stdout.write(chunk)
+    sys.stdout.flush()
+    _stream_line_open = not chunk.endswith("\n")
 
 def progress_callback(phase, section=None, progress=None, total=None):
     """
@@ -23,9 +40,15 @@ def progress_callback(phase, section=None, progress=None, total=None):
         progress: Optional progress value
         total: Optional total value
     """
+    global _stream_line_open
     from datetime import datetime
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
     
+    # Start progress on a fresh line after streamed text
+    if _stream_line_open:
+        print()
+        _stream_line_open = False
+    
     if section:
         print(f"[{timestamp}] [{phase.upper()}] {section} - {progress}/{total}")
     else:
@@ -48,7 +71,26 @@ def list_articles():
     print("------------------------------")
     
     for i, article in enumerate(articles):
-        print(f"{i+1}. {article['topic']} ({article['platform']}) - {article['timestamp']}")
+        print(f"{i+1}. {article['topic']} ({article['platform']}) - {article['timestamp']} [id {article['id']}]")
+    
+    print()
+
+def list_unfinished_runs():
+    """
+    List checkpointed runs that did not complete and can be resumed.
+    """
+    runs = [run for run in list_runs() if run.get("status") != "complete"]
+    
+    if not runs:
+        print("No interrupted runs to resume.")
+        return
+    
+    print("\nResumable Runs:")
+    print("---------------")
+    
+    for run in runs:
+        completed = ", ".join(run.get("completed", [])) or "nothing"
+        print(f"{run['run_id']}: {run['topic']} [{run.get('status')}] - completed: {completed}")
     
     print()
 
@@ -76,6 +118,87 @@ def list_platforms():
     
     print()
 
+def revise_outline(system, outline_path):
+    """
+    Apply an edited outline to a run's article and report what was rewritten.
+    
+    Args:
+        system: The AgenticSystem holding the run's artifacts
+        outline_path: Path of the file with the revised outline
+    """
+    with open(outline_path, "r", encoding="utf-8") as f:
+        outline_text = f.read()
+    
+    print(f"\nRevising the outline of '{system.topic}'...")
+    print(f"Run: {system.run_id}")
+    
+    try:
+        result = system.revise_outline(outline_text)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return 1
+    
+    diff = result["diff"]
+    print(f"\nAdded: {', '.join(diff['added']) or 'none'}")
+    print(f"Changed: {', '.join(diff['changed']) or 'none'}")
+    print(f"Removed: {', '.join(diff['removed']) or 'none'}")
+    print(f"Rewritten sections: {len(result['rewritten'])}")
+    if result["skipped"]:
+        print(f"Not applied (the article keeps these parts): {', '.join(result['skipped'])}")
+    print("The revised article has been saved to the 'articles' directory.")
+    
+    return 0
+
+def batch_callback(result, done, total):
+    """
+    Callback function for finished batch jobs.
+    Prints the job's status and timing.
+    
+    Args:
+        result: The job result
+        done: Number of jobs finished so far
+        total: Number of jobs in the batch
+    """
+    from datetime import datetime
+    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    
+    elapsed = f"{result['time']:.1f}s" if result.get("time") is not None else "-"
+    detail = result.get("run_id", "") if result["status"] == "complete" else result.get("error", "")
+    print(f"[{timestamp}] [{done}/{total}] {result['status']:<8} {result['id']}: {result['topic']} "
+          f"({result['style']}, {result['platform']}) {elapsed} {detail}")
+    sys.stdout.flush()
+
+def run_batch_file(path, workers, llm_concurrency, report_path=None):
+    """
+    Generate every article listed in a jobs file and write a report.
+    
+    Args:
+        path: Path of the JSON Lines jobs file
+        workers: Number of worker processes
+        llm_concurrency: Maximum number of LLM requests in flight across all workers
+        report_path: Optional path for the JSON report
+    """
+    from src.batch import load_jobs, run_batch, write_report
+    
+    try:
+        jobs = load_jobs(path)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 1
+    
+    print(f"\nRunning {len(jobs)} jobs on {workers} workers (at most {llm_concurrency} LLM requests at once)...")
+    report = run_batch(jobs, workers, llm_concurrency, on_result=batch_callback)
+    report_path = write_report(report, report_path)
+    
+    summary = report["summary"]
+    print(f"\nBatch complete: {summary['complete']} complete, {summary['failed']} failed")
+    speedup = f"{summary['speedup']:.1f}x" if summary.get("speedup") is not None else "-"
+    print(f"Wall time: {summary['wall_time']:.1f}s for {summary['total_job_time']:.1f}s of job time ({speedup})")
+    print(f"LLM calls: {summary['llm_calls']} ({summary['cache_hits']} cache hits)")
+    print(f"Report: {report_path}")
+    
+    return 1 if summary["failed"] else 0
+
 def main():
     """
     Main entry point for the command-line interface.
@@ -85,17 +208,36 @@ def main():
     # Main arguments
     parser.add_argument("--topic", "-t", help="The main topic of the article")
     parser.add_argument("--description", "-d", help="Additional description or context")
-    parser.add_argument("--style", "-s", default="conversational", 
+    parser.add_argument("--style", "-s",
                        choices=list(WRITING_STYLES.keys()),
-                       help="The writing style to use")
-    parser.add_argument("--platform", "-p", default="none",
+                       help="The writing style to use (default: conversational)")
+    parser.add_argument("--platform", "-p",
                        choices=list(PUBLISHING_PLATFORMS.keys()),
-                       help="The target publishing platform")
+                       help="The target publishing platform (default: none)")
+    parser.add_argument("--no-stream", action="store_true",
+                       help="Don't print the article draft live while it is being written")
+    parser.add_argument("--resume", metavar="RUN_ID",
+                       help="Resume an interrupted run from its checkpoints ('latest' for the most recent one)")
+    parser.add_argument("--from-run", metavar="RUN_ID",
+                       help="Regenerate an earlier run with the given --style, --platform or --description, "
+                            "reusing every phase those don't affect")
+    parser.add_argument("--revise-outline", metavar="FILE",
+                       help="With --from-run, apply an edited outline and rewrite only the sections it changes")
     
     # Utility commands
     parser.add_argument("--list-articles", action="store_true", help="List previously generated articles")
     parser.add_argument("--list-styles", action="store_true", help="List available writing styles")
     parser.add_argument("--list-platforms", action="store_true", help="List available publishing platforms")
+    parser.add_argument("--list-runs", action="store_true", help="List interrupted runs that can be resumed")
+    
+    # Batch generation
+    parser.add_argument("--batch", metavar="JOBS_FILE",
+                       help="Generate every article in a JSON Lines file of {topic, description, style, platform} jobs")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS,
+                       help="Number of worker processes for --batch")
+    parser.add_argument("--llm-concurrency", type=int, default=BATCH_LLM_CONCURRENCY,
+                       help="Maximum number of LLM requests in flight across all --batch workers")
+    parser.add_argument("--report", metavar="PATH", help="Where to write the --batch report (JSON)")
     
     args = parser.parse_args()
     
@@ -112,27 +254,76 @@ def main():
         list_platforms()
         return
     
-    # Check if we have a topic
-    if not args.topic:
-        parser.print_help()
-        print("\nError: --topic is required to generate an article")
+    if args.list_runs:
+        list_unfinished_runs()
         return
     
-    # Create the agentic system
-    system = AgenticSystem(
-        topic=args.topic,
-        description=args.description or "",
-        style=args.style,
-        platform=args.platform
-    )
+    if args.batch:
+        return run_batch_file(args.batch, args.workers, args.llm_concurrency, args.report)
+    
+    if args.resume:
+        # Pick up an interrupted run where it stopped
+        run_id = args.resume
+        if run_id == "latest":
+            runs = [run for run in list_runs() if run.get("status") != "complete"]
+            if not runs:
+                print("Error: there is no interrupted run to resume")
+                return 1
+            run_id = runs[0]["run_id"]
+        
+        try:
+            system = AgenticSystem.resume(run_id)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 1
+    elif args.from_run:
+        # Only the phases affected by the changed inputs run again
+        try:
+            system = AgenticSystem.derive(
+                args.from_run,
+                description=args.description,
+                style=args.style,
+                platform=args.platform
+            )
+        except ValueError as e:
+            print(f"Error: {e}")
+            return 1
+    else:
+        # Check if we have a topic
+        if not args.topic:
+            parser.print_help()
+            print("\nError: --topic is required to generate an article")
+            return
+        
+        # Create the agentic system
+        system = AgenticSystem(
+            topic=args.topic,
+            description=args.description or "",
+            style=args.style or "conversational",
+            platform=args.platform or "none"
+        )
+    
+    if args.revise_outline:
+        if not args.from_run:
+            print("Error: --revise-outline needs the run to revise with --from-run")
+            return 1
+        return revise_outline(system, args.revise_outline)
     
     # Generate the article with progress updates
-    print(f"\nGenerating article about '{args.topic}'...")
-    print(f"Style: {args.style}")
-    print(f"Platform: {args.platform}")
+    print(f"\nGenerating article about '{system.topic}'...")
+    print(f"Style: {system.style}")
+    print(f"Platform: {system.platform}")
+    print(f"Run: {system.run_id}")
     print("\nProgress:")
     
-    article = system.run_with_progress_callback(progress_callback)
+    try:
+        article = system.run_with_progress_callback(
+            progress_callback,
+            token_callback=None if args.no_stream else token_callback
+        )
+    except (Exception, KeyboardInterrupt):
+        print(f"\nArticle generation stopped. Resume it with: python main.py --resume {system.run_id}")
+        raise
     
     print("\nArticle generation complete!")
     print("The article has been saved to the 'articles' directory.")
@@ -5,7 +5,11 @@ Coordinates all agents and manages the article generation process.
 
 import time
 import json
-from typing import Dict, List, Optional, Callable
+import hashlib
+import threading
+import contextvars
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Callable, Tuple
 from datetime import datetime
 
 from src.agents.base import Agent
@@ -13,16 +17,84 @@ from src.agents.planner import PlannerAgent
 from src.agents.writer import WriterAgent
 from src.agents.reviewer import ReviewerAgent
 from src.agents.humanizer import HumanizerAgent
+from src.agents.editor import EditorAgent
 from src.tools.web_research import WebResearchTool
-from src.utils.file_manager import save_article
-from src.utils.llm import generate_text
+from src.utils.file_manager import reserve_article_name, save_article, update_article_metadata
+from src.utils.artifacts import ArtifactStore, new_run_id, read_manifest, run_directory, write_manifest
+from src.utils.concurrency import map_in_context
+from src.utils.config import (
+    CHECKPOINTS_ENABLED, EDIT_MODE, FUSED_EDIT_PLATFORMS, FUSED_EDIT_STYLES, PIPELINE_MAX_WORKERS, WRITER_PARALLELISM
+)
+from src.utils.dag import DAGScheduler
+from src.utils.llm import generate_text, agenerate_text, render_prompt
+from src.utils.markdown_sections import (
+    article_overview, block_keys, join_sections, section_body, section_markdown, split_sections
+)
+from src.utils.metrics import llm_context
+
+# What each artifact is computed from: the run inputs it reads and the artifacts it
+# builds on. An artifact's fingerprint covers both, so changing an input invalidates
+# exactly the artifacts downstream of it. The planner and writer prompts use the style
+# and platform too, so trying another style on an existing run reuses its research and
+# reruns everything from the outline on; artifacts not listed here (e.g. "save_name"
+# and "saved") belong to a single run.
+_ARTIFACT_INPUTS = {
+    "platform_style": (("topic", "platform"), ()),
+    "subtopics": (("topic",), ()),
+    "research": (("topic", "platform"), ("subtopics",)),
+    "outline": (("topic", "description", "style", "platform"), ("platform_style", "research")),
+    "article_content": (("style", "platform"), ("outline", "research")),
+    "improved_article": (("style", "platform", "edit_mode"), ("article_content",)),
+    "final_article": (("style", "platform", "edit_mode"), ("improved_article",)),
+    "improvements": ((), ("final_article",))
+}
+
+def edit_mode(style: str, platform: Optional[str]) -> str:
+    """
+    Choose how the review and humanizing passes run for a style and platform.
+    
+    Args:
+        style: The writing style
+        platform: The publishing platform
+        
+    Returns:
+        "fused" for a single EditorAgent pass, "separate" for the two-pass default
+    """
+    if style in FUSED_EDIT_STYLES or (platform and platform in FUSED_EDIT_PLATFORMS):
+        return "fused"
+    return EDIT_MODE
+
+def _artifact(name: str) -> property:
+    """
+    Create an attribute that reads and writes an artifact of the current run.
+    
+    Args:
+        name: The artifact name
+        
+    Returns:
+        Property backed by the system's artifact store
+    """
+    return property(
+        lambda self: self.artifacts.get(name),
+        lambda self, value: self._store(name, value),
+        doc=f"The {name} artifact of the current run."
+    )
 
 class AgenticSystem:
     """
     Main system that coordinates all agents and manages the article generation process.
     """
     
-    def __init__(self, topic: str, description: str, style: str = "conversational", platform: str = None):
+    # Agent outputs live in the run's artifact store, so each is computed once and reused
+    outline = _artifact("outline")
+    research = _artifact("research")
+    platform_style = _artifact("platform_style")
+    article_content = _artifact("article_content")
+    improved_article = _artifact("improved_article")
+    final_article = _artifact("final_article")
+    
+    def __init__(self, topic: str, description: str, style: str = "conversational", platform: str = None,
+                 run_id: str = None):
         """
         Initialize the AgenticSystem.
         
@@ -31,6 +103,7 @@ class AgenticSystem:
             description: Additional description or context
             style: The writing style to use
             platform: Optional publishing platform
+            run_id: Optional run identifier (a new one is generated if omitted)
         """
         self.topic = topic
         self.description = description
@@ -42,30 +115,172 @@ class AgenticSystem:
         self.writer = WriterAgent("Writer", self)
         self.reviewer = ReviewerAgent("Reviewer", self)
         self.humanizer = HumanizerAgent("Humanizer", self)
+        self.editor = EditorAgent("Editor", self)
+        self.edit_mode = edit_mode(style, platform)
         
         # Initialize tools
         self.web_research_tool = WebResearchTool()
         
-        # Initialize state
-        self.outline = None
-        self.research = None
-        self.platform_style = None
-        self.article_content = None
-        self.improved_article = None
-        self.final_article = None
+        # Initialize state, checkpointing every phase output under the run directory
+        self.run_id = run_id or new_run_id()
+        self.artifacts = ArtifactStore(
+            self.run_id,
+            directory=run_directory(self.run_id) if CHECKPOINTS_ENABLED else None
+        )
+        self._manifest = {
+            "run_id": self.run_id,
+            "topic": topic,
+            "description": description,
+            "style": style,
+            "platform": platform,
+            "status": "created",
+            "completed": [],
+            "created_at": datetime.now().isoformat()
+        }
+        # Background threads of the run (improvements summaries), joined by wait_for_background
+        self._background = []
+        
+        # Optional callbacks for progress updates and streamed article text
+        self.progress_callback = None
+        self.token_callback = None
         
-        # Progress tracking
+        # Progress tracking (steps of the pipeline may update it from several threads)
         self.progress = {
             "phase": "initialization",
             "section": None,
             "progress": 0,
             "total": 100,
             "start_time": time.time(),
-            "phase_times": {}
+            "phase_times": {},
+            "running": []
         }
+        self._progress_lock = threading.RLock()
+        self._scheduler = None
         
         # Log initialization
-        self._log(f"Initialized AgenticSystem for topic: {topic}")
+        self._log(f"Initialized AgenticSystem for topic: {topic} (run {self.run_id})")
+    
+    @classmethod
+    def resume(cls, run_id: str) -> "AgenticSystem":
+        """
+        Recreate the system of an interrupted run from its checkpoints.
+        
+        Running it again skips every phase whose output was checkpointed.
+        
+        Args:
+            run_id: The run identifier
+            
+        Returns:
+            The AgenticSystem for the run
+        """
+        manifest = read_manifest(run_id)
+        if manifest is None:
+            raise ValueError(f"No checkpointed run found with id {run_id}")
+        
+        system = cls(
+            manifest["topic"],
+            manifest.get("description", ""),
+            manifest.get("style", "conversational"),
+            manifest.get("platform"),
+            run_id=run_id
+        )
+        system._manifest.update(manifest)
+        loaded = system.artifacts.load()
+        system._log(f"Resuming run {run_id} with checkpointed {', '.join(loaded) if loaded else 'nothing'}")
+        return system
+    
+    @classmethod
+    def derive(cls, base_run_id: str, description: str = None, style: str = None,
+               platform: str = None) -> "AgenticSystem":
+        """
+        Start a new run from an earlier one with some inputs changed.
+        
+        Artifacts of the base run whose inputs are unchanged are reused, so only the
+        phases affected by the change run again (e.g. everything after research for a new style).
+        
+        Args:
+            base_run_id: The run to start from
+            description: Optional new description
+            style: Optional new writing style
+            platform: Optional new publishing platform
+            
+        Returns:
+            The AgenticSystem for the new run
+        """
+        manifest = read_manifest(base_run_id)
+        if manifest is None:
+            raise ValueError(f"No checkpointed run found with id {base_run_id}")
+        
+        system = cls(
+            manifest["topic"],
+            manifest.get("description", "") if description is None else description,
+            style or manifest.get("style", "conversational"),
+            platform or manifest.get("platform")
+        )
+        system._manifest["base_run_id"] = base_run_id
+        reused = system.artifacts.load(run_directory(base_run_id), keep=system._is_current)
+        system._log(f"Reusing {', '.join(reused) if reused else 'nothing'} from run {base_run_id}")
+        return system
+    
+    def _fingerprint(self, name: str) -> Optional[str]:
+        """
+        Fingerprint the inputs an artifact is computed from, including its upstream artifacts.
+        
+        Args:
+            name: The artifact name
+            
+        Returns:
+            The fingerprint, or None for artifacts that are never reused across runs
+        """
+        if name not in _ARTIFACT_INPUTS:
+            return None
+        fields, upstream = _ARTIFACT_INPUTS[name]
+        inputs = {
+            "artifact": name,
+            "inputs": {field: getattr(self, field) for field in fields},
+            "upstream": [self._fingerprint(dep) for dep in upstream]
+        }
+        return hashlib.md5(json.dumps(inputs, sort_keys=True).encode("utf-8")).hexdigest()
+    
+    def _is_current(self, name: str, fingerprint: Optional[str]) -> bool:
+        """
+        Check whether a stored artifact was computed from this run's inputs.
+        
+        Args:
+            name: The artifact name
+            fingerprint: The fingerprint the artifact was stored with
+            
+        Returns:
+            True if the artifact can be reused
+        """
+        return fingerprint is not None and fingerprint == self._fingerprint(name)
+    
+    def _store(self, name: str, value):
+        """
+        Store an artifact of the run along with its input fingerprint.
+        
+        Args:
+            name: The artifact name
+            value: The artifact value
+            
+        Returns:
+            The value
+        """
+        self.artifacts.put(name, value, self._fingerprint(name))
+        return value
+    
+    def _update_manifest(self, **changes):
+        """
+        Update the run manifest and write it next to the checkpoints.
+        
+        Args:
+            **changes: Manifest fields to set
+        """
+        with self._progress_lock:
+            self._manifest.update(changes)
+            self._manifest["updated_at"] = datetime.now().isoformat()
+            if CHECKPOINTS_ENABLED:
+                write_manifest(self.run_id, self._manifest)
     
     def _log(self, message: str):
         """
@@ -94,93 +309,228 @@ class AgenticSystem:
         self._log(f"Platform style analysis completed in {elapsed:.2f} seconds")
         return self.platform_style
     
-    def generate_text(self, prompt: str) -> str:
+    def generate_text(self, prompt: str, task: str = None) -> str:
         """
         Generate text using the LLM.
         
         Args:
             prompt: The prompt to send to the model
+            task: Optional routing task that selects the model
+            
+        Returns:
+            Generated text response
+        """
+        return generate_text(prompt, task=task)
+    
+    async def agenerate_text(self, prompt: str, task: str = None) -> str:
+        """
+        Generate text using the LLM without blocking the event loop.
+        
+        Args:
+            prompt: The prompt to send to the model
+            task: Optional routing task that selects the model
             
         Returns:
             Generated text response
         """
-        return generate_text(prompt)
+        return await agenerate_text(prompt, task=task)
     
     def _update_progress(self, phase: str, section: str = None, progress: int = None, total: int = None):
         """
         Update the progress tracking information.
         
         Args:
-            phase: The current phase of the process
+            phase: The pipeline step being reported on
             section: Optional section being processed
             progress: Optional progress value
             total: Optional total value
         """
-        # If we're starting a new phase, record the time of the previous phase
-        if phase != self.progress["phase"]:
-            end_time = time.time()
-            elapsed = end_time - self.progress.get("phase_start_time", self.progress["start_time"])
-            self.progress["phase_times"][self.progress["phase"]] = elapsed
-            self._log(f"Phase '{self.progress['phase']}' completed in {elapsed:.2f} seconds")
-            self.progress["phase_start_time"] = end_time
+        with self._progress_lock:
+            self.progress["phase"] = phase
             
-        self.progress["phase"] = phase
+            if section is not None:
+                self.progress["section"] = section
+                
+            if progress is not None:
+                self.progress["progress"] = progress
+                
+            if total is not None:
+                self.progress["total"] = total
+                
+            # Log progress update
+            progress_msg = f"Progress: {phase}"
+            if section:
+                progress_msg += f" - {section}"
+            if progress is not None and total is not None:
+                progress_msg += f" - {progress}/{total}"
+            self._log(progress_msg)
+                
+            # Call the progress callback if set
+            if self.progress_callback:
+                self.progress_callback(
+                    phase=self.progress["phase"],
+                    section=self.progress["section"],
+                    progress=self.progress["progress"],
+                    total=self.progress["total"]
+                )
+    
+    def _step_started(self, name: str):
+        """
+        Record that a pipeline step started.
         
-        if section is not None:
-            self.progress["section"] = section
-            
-        if progress is not None:
-            self.progress["progress"] = progress
-            
-        if total is not None:
-            self.progress["total"] = total
-            
-        # Log progress update
-        progress_msg = f"Progress: {phase}"
-        if section:
-            progress_msg += f" - {section}"
-        if progress is not None and total is not None:
-            progress_msg += f" - {progress}/{total}"
-        self._log(progress_msg)
+        Args:
+            name: The step name
+        """
+        with self._progress_lock:
+            self.progress["running"].append(name)
+            self._update_progress(name, progress=0, total=100)
+    
+    def _step_finished(self, name: str, elapsed: float):
+        """
+        Record that a pipeline step finished.
+        
+        Args:
+            name: The step name
+            elapsed: Wall time of the step in seconds
+        """
+        with self._progress_lock:
+            self.progress["running"].remove(name)
+            self.progress["phase_times"][name] = elapsed
+            self._log(f"Phase '{name}' completed in {elapsed:.2f} seconds")
+            if name not in self._manifest["completed"]:
+                self._update_manifest(completed=self._manifest["completed"] + [name])
+            self._update_progress(name, progress=100, total=100)
+    
+    def _step(self, phase: str, agent: str, func: Callable[[Dict], object],
+              reuse: Optional[str] = None) -> Callable[[Dict], object]:
+        """
+        Wrap a pipeline step so its LLM calls are attributed to an agent and phase.
+        
+        Args:
+            phase: The pipeline phase for metrics
+            agent: The agent for metrics
+            func: The step function, called with the results of its dependencies
+            reuse: Optional artifact that makes the step unnecessary when it already exists
             
-        # Call the progress callback if set
-        if hasattr(self, "progress_callback") and self.progress_callback:
-            self.progress_callback(
-                phase=self.progress["phase"],
-                section=self.progress["section"],
-                progress=self.progress["progress"],
-                total=self.progress["total"]
-            )
+        Returns:
+            The wrapped step function
+        """
+        def run(results: Dict):
+            if reuse and self.artifacts.has(reuse):
+                self._log(f"Reusing checkpointed {reuse}")
+                return self.artifacts.get(reuse)
+            with llm_context(agent=agent, phase=phase):
+                return func(results)
+        return run
     
-    def run_with_progress_callback(self, callback=None):
+    def _build_pipeline(self) -> DAGScheduler:
+        """
+        Declare the article pipeline as a dependency graph.
+        
+        Platform analysis, the subtopic call, similar-article analysis and trending
+        topics don't depend on each other and run concurrently; planning waits for
+        all of them, and writing, reviewing, humanizing and saving follow in order (in the
+        fused edit mode a single editing step replaces reviewing and humanizing).
+        Steps whose output is already in the artifact store (e.g. after resuming) are skipped.
+        
+        Returns:
+            The scheduler holding the pipeline
+        """
+        scheduler = DAGScheduler(max_workers=PIPELINE_MAX_WORKERS)
+        
+        scheduler.add("platform_analysis", self._step(
+            "platform_analysis", "System", lambda results: self.analyze_platform_style(),
+            reuse="platform_style"))
+        # The research inputs are only needed while the research itself is missing
+        scheduler.add("subtopics", self._step(
+            "research", "System", lambda results: self._store("subtopics", self._generate_subtopics()),
+            reuse="subtopics"))
+        scheduler.add("similar_articles", self._step(
+            "research", "System", lambda results: self._analyze_similar_articles(), reuse="research"))
+        scheduler.add("trending_topics", self._step(
+            "research", "System", lambda results: self.web_research_tool.find_trending_topics(self.topic),
+            reuse="research"))
+        scheduler.add("research", self._step(
+            "research", "System", self._compile_research, reuse="research"),
+            deps=["subtopics", "similar_articles", "trending_topics"])
+        scheduler.add("planning", self._step(
+            "planning", self.planner.name, lambda results: self._plan(), reuse="outline"),
+            deps=["platform_analysis", "research"])
+        scheduler.add("writing", self._step(
+            "writing", self.writer.name, lambda results: self._write(), reuse="article_content"),
+            deps=["planning"])
+        if self.edit_mode == "fused":
+            scheduler.add("editing", self._step(
+                "editing", self.editor.name, lambda results: self._edit(), reuse="final_article"),
+                deps=["writing"])
+            last = "editing"
+        else:
+            scheduler.add("reviewing", self._step(
+                "reviewing", self.reviewer.name, lambda results: self._review(), reuse="improved_article"),
+                deps=["writing"])
+            scheduler.add("humanizing", self._step(
+                "humanizing", self.humanizer.name, lambda results: self._humanize(), reuse="final_article"),
+                deps=["reviewing"])
+            last = "humanizing"
+        # Saving checks for its own checkpoint, to restart an unfinished improvements summary
+        scheduler.add("saving", self._step(
+            "saving", "System", lambda results: self._save()),
+            deps=[last])
+        
+        return scheduler
+    
+    def run_with_progress_callback(self, callback=None, token_callback=None):
         """
         Run the full article generation process with progress updates.
         
         Args:
             callback: Optional function to call with progress updates
+            token_callback: Optional function to call with each chunk of the article draft as it is written
             
         Returns:
             The generated article
         """
         self.progress_callback = callback
+        self.token_callback = token_callback
         self.progress["start_time"] = time.time()
-        self.progress["phase_start_time"] = time.time()
         
         self._log(f"Starting article generation for topic: {self.topic}")
+        self._update_manifest(status="running", error=None)
+        
+        self._scheduler = self._build_pipeline()
+        try:
+            self._scheduler.run(on_start=self._step_started, on_finish=self._step_finished)
+        except BaseException as e:
+            # Everything finished so far stays checkpointed for a resume
+            self._update_manifest(status="failed", error=str(e) or type(e).__name__)
+            self._log(f"Run {self.run_id} failed: {e}")
+            raise
+        self._update_manifest(status="complete")
         
-        # Phase 1: Platform Analysis
-        self._update_progress("platform_analysis", progress=0, total=100)
-        if self.platform and self.platform.lower() != "none":
-            self.platform_style = self.analyze_platform_style()
-        self._update_progress("platform_analysis", progress=100, total=100)
+        # Complete
+        self._update_progress("complete", progress=100, total=100)
+        
+        # Log total time
+        total_time = time.time() - self.progress["start_time"]
+        self._log(f"Article generation completed in {total_time:.2f} seconds")
+        
+        # Log time breakdown
+        timings = self._scheduler.timings()
+        self._log("Time breakdown by phase:")
+        for phase, elapsed in self.progress["phase_times"].items():
+            self._log(f"  {phase}: {elapsed:.2f} seconds ({elapsed/total_time*100:.1f}%)")
+        self._log(f"Critical path: {' -> '.join(timings['critical_path'])} "
+                  f"({timings['critical_path_time']:.2f} seconds; steps took {timings['total_step_time']:.2f} seconds in total)")
         
-        # Phase 2: Research
-        self._update_progress("research", progress=0, total=100)
-        self.research = self.conduct_comprehensive_research()
-        self._update_progress("research", progress=100, total=100)
+        return self.final_article
+    
+    def _plan(self) -> Dict:
+        """
+        Create the article outline.
         
-        # Phase 3: Planning
-        self._update_progress("planning", progress=0, total=100)
+        Returns:
+            The planner's result
+        """
         planning_context = {
             "topic": self.topic,
             "description": self.description,
@@ -189,12 +539,16 @@ class AgenticSystem:
             "platform_style": self.platform_style,
             "research": self.research
         }
-        planning_result = self.planner.act("Create an article outline", planning_context)
-        self.outline = planning_result
-        self._update_progress("planning", progress=100, total=100)
+        self.outline = self.planner.act("Create an article outline", planning_context)
+        return self.outline
+    
+    def _write(self) -> str:
+        """
+        Write the article draft from the outline.
         
-        # Phase 4: Writing
-        self._update_progress("writing", progress=0, total=100)
+        Returns:
+            The article draft
+        """
         writing_context = {
             "outline": self.outline.get("outline", ""),
             "sections": self.outline.get("sections", []),
@@ -204,27 +558,40 @@ class AgenticSystem:
             "research": self.research
         }
         
-        # Track progress through sections
-        total_sections = len(writing_context["sections"])
-        self._update_progress("writing", progress=0, total=total_sections)
+        # Track progress through the parts of the article, as the writer counts them
+        total_parts = self.writer.count_parts(writing_context["sections"])
+        self._update_progress("writing", progress=0, total=total_parts)
         
         writing_result = self.writer.act("Write article content", writing_context)
         self.article_content = writing_result.get("article_content", "")
-        self._update_progress("writing", progress=total_sections, total=total_sections)
+        self._update_progress("writing", progress=total_parts, total=total_parts)
+        return self.article_content
+    
+    def _review(self) -> str:
+        """
+        Review and improve the article draft.
         
-        # Phase 5: Reviewing
-        self._update_progress("reviewing", progress=0, total=100)
+        Returns:
+            The improved article
+        """
         reviewing_context = {
             "article_content": self.article_content,
             "style": self.style,
-            "platform": self.platform
+            "platform": self.platform,
+            # The improvements summary is produced after saving, off the critical path
+            "summarize": False
         }
         reviewing_result = self.reviewer.act("Review and improve article", reviewing_context)
         self.improved_article = reviewing_result.get("improved_article", self.article_content)
-        self._update_progress("reviewing", progress=100, total=100)
+        return self.improved_article
+    
+    def _humanize(self) -> str:
+        """
+        Add a human touch to the improved article.
         
-        # Phase 6: Humanizing
-        self._update_progress("humanizing", progress=0, total=100)
+        Returns:
+            The final article
+        """
         humanizing_context = {
             "article_content": self.improved_article,
             "style": self.style,
@@ -232,26 +599,212 @@ class AgenticSystem:
         }
         humanizing_result = self.humanizer.act("Add human touch to article", humanizing_context)
         self.final_article = humanizing_result.get("humanized_article", self.improved_article)
-        self._update_progress("humanizing", progress=100, total=100)
+        return self.final_article
+    
+    def _edit(self) -> str:
+        """
+        Review and humanize the article draft in a single pass.
         
-        # Phase 7: Saving
-        self._update_progress("saving", progress=0, total=100)
-        self.save_article(self.final_article)
-        self._update_progress("saving", progress=100, total=100)
+        Returns:
+            The final article
+        """
+        editing_context = {
+            "article_content": self.article_content,
+            "style": self.style,
+            "platform": self.platform
+        }
+        editing_result = self.editor.act("Edit article", editing_context)
+        edited = editing_result.get("edited_article", self.article_content)
+        self.improved_article = edited
+        self.final_article = edited
+        return self.final_article
+    
+    def revise_outline(self, outline_text: str) -> Dict:
+        """
+        Apply an edited outline to the generated article.
         
-        # Complete
-        self._update_progress("complete", progress=100, total=100)
+        Only sections that were added or whose heading or bullet points changed are
+        rewritten, and only those go through the review and humanizing passes again;
+        the rest of the final article is kept. The revised article is saved as a new article.
         
-        # Log total time
-        total_time = time.time() - self.progress["start_time"]
-        self._log(f"Article generation completed in {total_time:.2f} seconds")
+        Args:
+            outline_text: The revised outline in the planner's markdown format
+            
+        Returns:
+            Dictionary with the final article, the outline diff, the rewritten headings,
+            the headings of outline edits that were not applied and the saved paths
+        """
+        if not self.article_content or not self.outline:
+            raise ValueError("There is no generated article to revise yet")
         
-        # Log time breakdown
-        self._log("Time breakdown by phase:")
-        for phase, elapsed in self.progress["phase_times"].items():
-            self._log(f"  {phase}: {elapsed:.2f} seconds ({elapsed/total_time*100:.1f}%)")
+        new_sections = self.planner._parse_outline(outline_text)
+        if not new_sections:
+            raise ValueError("The revised outline has no sections")
         
-        return self.final_article
+        self.progress["start_time"] = time.time()
+        self._log(f"Revising outline for topic: {self.topic}")
+        self._update_manifest(status="running", error=None)
+        
+        try:
+            with llm_context(agent=self.writer.name, phase="writing"):
+                result = self.writer.rewrite_sections(
+                    self.article_content,
+                    self.outline.get("sections", []),
+                    new_sections,
+                    self.style,
+                    self.platform,
+                    self.research
+                )
+            
+            self.outline = {**self.outline, "outline": outline_text, "sections": new_sections}
+            previous_draft = self.article_content
+            self.article_content = result["article_content"]
+            self._polish_sections(result["rewritten_keys"], previous_draft)
+            
+            # The improvements summary described the previous text, and the revised
+            # article is saved under a new name rather than over the one revised
+            for name in ("improvements", "save_name", "saved"):
+                self.artifacts.discard(name)
+            paths = self._save()
+        except BaseException as e:
+            self._update_manifest(status="failed", error=str(e) or type(e).__name__)
+            self._log(f"Run {self.run_id} failed: {e}")
+            raise
+        self._update_manifest(status="complete")
+        
+        return {
+            "article": self.final_article,
+            "diff": result["diff"],
+            "rewritten": result["rewritten"],
+            "skipped": result["skipped"],
+            "paths": paths
+        }
+    
+    def _polish_sections(self, keys: List[Tuple[Optional[str], int]], previous_draft: str):
+        """
+        Run the review and humanizing passes on some sections of the draft and splice
+        the results into the improved and final articles.
+        
+        Sections of the draft that the final article doesn't have (e.g. because the
+        reviewer renamed them) are polished too, so the articles stay in step. Sections
+        the passes added to the articles (e.g. a "Key Takeaways" section) are kept where they were.
+        
+        Args:
+            keys: Block keys (see block_keys) of the draft sections to polish
+            previous_draft: The draft the improved and final articles were made from
+        """
+        draft = split_sections(self.article_content)
+        draft_keys = block_keys(draft)
+        overview = article_overview(draft)
+        previous_keys = block_keys(split_sections(previous_draft))
+        improved = split_sections(self.improved_article or "")
+        final = split_sections(self.final_article or "")
+        touched = set(keys)
+        final_keys = set(block_keys(final))
+        
+        pending = [i for i, key in enumerate(draft_keys) if key in touched or key not in final_keys]
+        self._log(f"Reviewing and humanizing {len(pending)} of {len(draft)} sections")
+        
+        def polish(block: Dict):
+            # Only the section text is sent, with an overview of the article as in map_sections;
+            # the title and heading are put back afterwards
+            title, text = "", section_body(block).strip("\n")
+            if block["heading"] is None and text.startswith("# "):
+                title, _, text = text.partition("\n")
+            scope = f"{overview}\nThis part: {block['heading'] or 'introduction'}"
+            
+            def assemble(content: str) -> str:
+                if block["heading"] is not None:
+                    return section_markdown(block["heading"], content)
+                content = content.strip("\n")
+                return f"{title}\n\n{content}" if title else content
+            
+            if self.edit_mode == "fused":
+                with llm_context(agent=self.editor.name, phase="editing"):
+                    edited = self.editor.act("Edit article section", {
+                        "article_content": text,
+                        "style": self.style,
+                        "platform": self.platform,
+                        "scope": scope
+                    }).get("edited_article", text)
+                return assemble(edited), assemble(edited)
+            with llm_context(agent=self.reviewer.name, phase="reviewing"):
+                reviewed = self.reviewer.act("Review and improve article section", {
+                    "article_content": text,
+                    "style": self.style,
+                    "platform": self.platform,
+                    "summarize": False,
+                    "scope": scope
+                }).get("improved_article", text)
+            with llm_context(agent=self.humanizer.name, phase="humanizing"):
+                humanized = self.humanizer.act("Add human touch to article section", {
+                    "article_content": reviewed,
+                    "style": self.style,
+                    "platform": self.platform,
+                    "scope": scope
+                }).get("humanized_article", reviewed)
+            return assemble(reviewed), assemble(humanized)
+        
+        polished = dict(zip(
+            pending,
+            map_in_context(polish, [draft[i] for i in pending], WRITER_PARALLELISM)
+        ))
+        
+        reviewed_blocks, humanized_blocks = {}, {}
+        for i, (reviewed, humanized) in polished.items():
+            reviewed_blocks[i] = {"heading": draft[i]["heading"], "markdown": reviewed}
+            humanized_blocks[i] = {"heading": draft[i]["heading"], "markdown": humanized}
+        
+        self.improved_article = join_sections(self._reassemble(
+            draft, reviewed_blocks, improved, previous_keys, dict(zip(block_keys(final), final))
+        ))
+        self.final_article = join_sections(self._reassemble(draft, humanized_blocks, final, previous_keys, {}))
+    
+    def _reassemble(self, draft: List[Dict], polished: Dict[int, Dict], blocks: List[Dict],
+                    previous_keys: List[Tuple[Optional[str], int]], fallback: Dict) -> List[Dict]:
+        """
+        Rebuild a reviewed article from the draft's sections after some were polished again.
+        
+        Sections only the reviewed article has, because a pass added them, are found by
+        aligning it with the draft it was made from and stay in front of the same section.
+        
+        Args:
+            draft: The draft's section blocks
+            polished: New blocks for some draft sections, by index in the draft
+            blocks: The reviewed article's section blocks
+            previous_keys: Block keys of the draft the reviewed article was made from
+            fallback: Blocks by key to use for draft sections the reviewed article lacks
+            
+        Returns:
+            The reviewed article's section blocks
+        """
+        draft_keys = block_keys(draft)
+        keys = block_keys(blocks)
+        reviewed = dict(zip(keys, blocks))
+        
+        # Sections inserted between the draft's; renamed ones show up as replaced instead
+        added = set()
+        matcher = SequenceMatcher(None, previous_keys, keys, autojunk=False)
+        for tag, _, _, start, end in matcher.get_opcodes():
+            if tag == "insert":
+                added.update(range(start, end))
+        
+        # Each added section goes before the nearest section after it that is still in the draft
+        preceding = {}
+        anchor = None
+        present = set(draft_keys)
+        for j in reversed(range(len(blocks))):
+            if j in added:
+                preceding.setdefault(anchor, []).insert(0, blocks[j])
+            elif keys[j] in present:
+                anchor = keys[j]
+        
+        result = []
+        for i, key in enumerate(draft_keys):
+            result.extend(preceding.get(key, []))
+            result.append(polished[i] if i in polished else reviewed.get(key, fallback.get(key)))
+        result.extend(preceding.get(None, []))
+        return result
     
     def generate_full_article(self):
         """
@@ -262,16 +815,49 @@ class AgenticSystem:
         """
         return self.run_with_progress_callback(None)
     
-    def save_article(self, article_content):
+    def _save(self) -> Dict:
+        """
+        Save the final article and record where it went.
+        
+        The file name is reserved and checkpointed before anything is written, so a
+        run resumed after a crash during saving overwrites its own files instead of
+        saving the article a second time. A run resumed after saving reuses the saved
+        files and restarts the improvements summary if it didn't finish.
+        
+        Returns:
+            Dictionary with paths to the saved files
+        """
+        saved = self.artifacts.get("saved")
+        if saved is not None:
+            self._log("Reusing checkpointed saved")
+            if not self.artifacts.has("improvements") and self.article_content and self.final_article:
+                self._summarize_improvements_later(saved["metadata_path"], self.final_article)
+            return saved
+        
+        reserved = self.artifacts.get("save_name")
+        if reserved is None:
+            reserved = reserve_article_name(self.topic, self.platform)
+            self.artifacts.put("save_name", reserved)
+        paths = self.save_article(self.final_article, reserved)
+        self.artifacts.put("saved", paths)
+        return paths
+    
+    def save_article(self, article_content, reserved: Optional[Dict] = None):
         """
         Save the article and its metadata.
         
+        The improvements summary is not waited for: unless it is already known, the
+        metadata is saved with a pending placeholder and patched once the summary has
+        been generated in the background.
+        
         Args:
             article_content: The article content to save
+            reserved: Optional file name from reserve_article_name to save under
             
         Returns:
             Dictionary with paths to the saved files
         """
+        improvements = self.artifacts.get("improvements")
         # Prepare metadata
         metadata = {
             "topic": self.topic,
@@ -285,16 +871,92 @@ class AgenticSystem:
                 "platform_style": self.platform_style,
                 "research_summary": self.research.get("summary", "") if self.research else "",
                 "outline": self.outline.get("outline", "") if self.outline else "",
-                "improvements": self.reviewer.act("Summarize improvements", {"original_article": self.article_content, "improved_article": self.improved_article}) if hasattr(self, "article_content") and hasattr(self, "improved_article") else {}
+                "improvements": improvements if improvements is not None else {"status": "pending"},
+                "edit_mode": self.edit_mode
             },
-            "performance": {
-                "total_time": time.time() - self.progress["start_time"],
-                "phase_times": self.progress["phase_times"]
-            }
+            "run_id": self.run_id,
+            "base_run_id": self._manifest.get("base_run_id"),
+            "performance": self._performance()
         }
         
         # Save article and metadata
-        return save_article(article_content, metadata)
+        paths = save_article(article_content, metadata, reserved)
+        
+        if improvements is None and self.article_content and article_content:
+            self._summarize_improvements_later(paths["metadata_path"], article_content)
+        
+        return paths
+    
+    def _summarize_improvements_later(self, metadata_path: str, final_article: str):
+        """
+        Summarize how the final article improved on the draft in a background thread,
+        then patch the summary into the saved metadata.
+        
+        Args:
+            metadata_path: Path of the saved metadata file
+            final_article: The article as saved
+        """
+        original_article = self.article_content
+        
+        def summarize():
+            with llm_context(agent=self.reviewer.name, phase="summary"):
+                return self.reviewer.act("Summarize improvements", {
+                    "original_article": original_article,
+                    "improved_article": final_article
+                })["improvements"]
+        
+        def run():
+            try:
+                improvements = self.artifacts.get_or_compute(
+                    "improvements", summarize, self._fingerprint("improvements"))
+            except Exception as e:
+                self._log(f"Error summarizing improvements: {e}")
+                improvements = {"status": "failed", "error": str(e)}
+            update_article_metadata(metadata_path, {"generation_process.improvements": improvements})
+            self._log("Improvements summary added to metadata")
+        
+        # Not a daemon, so a CLI run still finishes the summary before the process exits
+        thread = threading.Thread(
+            target=contextvars.copy_context().run, args=(run,), name="improvements-summary"
+        )
+        self._background.append(thread)
+        thread.start()
+    
+    def wait_for_background(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for background work of the run (every improvements summary started) to finish.
+        
+        Args:
+            timeout: Optional maximum time to wait in total, in seconds
+            
+        Returns:
+            True if nothing is left running
+        """
+        deadline = time.time() + timeout if timeout is not None else None
+        for thread in list(self._background):
+            thread.join(None if deadline is None else max(0.0, deadline - time.time()))
+        return not any(thread.is_alive() for thread in self._background)
+    
+    def _performance(self) -> Dict:
+        """
+        Summarize where the time of the run went.
+        
+        Steps run concurrently, so the end-to-end time follows the critical path
+        rather than the sum of the phase times.
+        
+        Returns:
+            Dictionary with total time, per-phase times and the critical path so far
+        """
+        with self._progress_lock:
+            performance = {
+                "total_time": time.time() - self.progress["start_time"],
+                "phase_times": dict(self.progress["phase_times"])
+            }
+        if self._scheduler:
+            timings = self._scheduler.timings()
+            performance["critical_path"] = timings["critical_path"]
+            performance["critical_path_time"] = timings["critical_path_time"]
+        return performance
     
     def conduct_comprehensive_research(self):
         """
@@ -306,28 +968,60 @@ class AgenticSystem:
         self._log(f"Researching topic: {self.topic}...")
         start_time = time.time()
         
-        # Generate subtopics based on the main topic
-        subtopics_prompt = f"""
-        Generate 3-5 key subtopics that would be important to cover in an article about {self.topic}.
-        List each subtopic on a new line with no numbering or bullets.
+        subtopics = self._generate_subtopics()
+        research_results = self._compile_research({
+            "subtopics": subtopics,
+            "similar_articles": self._analyze_similar_articles(),
+            "trending_topics": self.web_research_tool.find_trending_topics(self.topic)
+        })
+        
+        elapsed = time.time() - start_time
+        self._log(f"Research completed in {elapsed:.2f} seconds")
+        
+        return research_results
+    
+    def _generate_subtopics(self) -> List[str]:
         """
+        Ask the LLM for the key subtopics of the topic.
+        
+        Returns:
+            List of subtopics
+        """
+        subtopics_prompt = render_prompt("""
+        Generate 3-5 key subtopics that would be important to cover in an article about {topic}.
+        List each subtopic on a new line with no numbering or bullets.
+        """, topic=self.topic)
         
-        subtopics_text = generate_text(subtopics_prompt)
-        subtopics = [s.strip() for s in subtopics_text.split("\n") if s.strip()]
+        subtopics_text = generate_text(subtopics_prompt, task="research.subtopics")
+        return [s.strip() for s in subtopics_text.split("\n") if s.strip()]
+    
+    def _analyze_similar_articles(self) -> Optional[Dict]:
+        """
+        Analyze similar articles on the target platform, if there is one.
         
-        # Conduct research on the topic and subtopics
-        research_results = self.web_research_tool.research_topic(self.topic, subtopics)
+        Returns:
+            Dictionary containing the analysis, or None without a platform
+        """
+        if not self.platform or self.platform.lower() == "none":
+            return None
+        return self.web_research_tool.analyze_similar_articles(self.topic, self.platform)
+    
+    def _compile_research(self, results: Dict) -> Dict:
+        """
+        Research the subtopics and combine everything into the research results.
         
-        # If we have a platform, also analyze similar articles on that platform
-        if self.platform and self.platform.lower() != "none":
-            similar_articles = self.web_research_tool.analyze_similar_articles(self.topic, self.platform)
-            research_results["similar_articles"] = similar_articles
+        Args:
+            results: Dictionary with "subtopics", "similar_articles" and "trending_topics"
+            
+        Returns:
+            Dictionary containing research results
+        """
+        research_results = self.web_research_tool.research_topic(self.topic, results["subtopics"])
         
-        # Find trending topics related to the main topic
-        trending_topics = self.web_research_tool.find_trending_topics(self.topic)
-        research_results["trending_topics"] = trending_topics
+        if results["similar_articles"] is not None:
+            research_results["similar_articles"] = results["similar_articles"]
         
-        elapsed = time.time() - start_time
-        self._log(f"Research completed in {elapsed:.2f} seconds")
+        research_results["trending_topics"] = results["trending_topics"]
         
-        return research_results 
\ No newline at end of file
+        self.research = research_results
+        return research_results
@@ -5,6 +5,7 @@ Defines the common interface and functionality for all agents.
 
 from typing import Dict, Optional, TYPE_CHECKING, Any
 import time
+import asyncio
 from datetime import datetime
 
 # This avoids circular imports
@@ -52,4 +53,20 @@ class Agent:
         Returns:
             Dictionary containing the results of the action
         """
-        raise NotImplementedError("Subclasses must implement the act method") 
\ No newline at end of file
+        raise NotImplementedError("Subclasses must implement the act method") 
+    
+    async def aact(self, task: str, context: Optional[Dict] = None) -> Dict:
+        """
+        Perform the agent's primary action from async code.
+        
+        The default runs act in a worker thread so the event loop stays free;
+        subclasses can override it with a natively async implementation.
+        
+        Args:
+            task: Description of the task to perform
+            context: Optional context information
+            
+        Returns:
+            Dictionary containing the results of the action
+        """
+        return await asyncio.to_thread(self.act, task, context)
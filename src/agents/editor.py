@@ -0,0 +1,130 @@
+"""
+Editor Agent for the Agentic Writer System.
+Responsible for reviewing and humanizing article content in a single pass.
+"""
+
+from typing import Dict, Optional, List
+
+from src.agents.base import Agent
+from src.agents.humanizer import pick_traits
+from src.utils.config import REVIEW_MODE, REVIEW_PARALLELISM
+from src.utils.llm import generate_text, render_prompt
+from src.utils.markdown_sections import map_sections, split_sections
+
+class EditorAgent(Agent):
+    """
+    Agent that improves an article and adds a human touch in one request,
+    combining the ReviewerAgent and HumanizerAgent instructions.
+    """
+    
+    def act(self, task: str, context: Optional[Dict] = None) -> Dict:
+        """
+        Review, improve and humanize article content.
+        
+        Args:
+            task: Description of the editing task
+            context: Dictionary containing article content and metadata
+            
+        Returns:
+            Dictionary containing the edited article
+        """
+        if not context:
+            context = {}
+            
+        article_content = context.get("article_content", "")
+        style = context.get("style", "conversational")
+        platform = context.get("platform")
+        mode = context.get("mode", REVIEW_MODE)
+        # Set when the content is one part of an article (see map_sections)
+        scope = context.get("scope")
+        traits = pick_traits()
+        
+        self.log(f"Editing article content in a single pass ({mode} mode)")
+        
+        if mode == "sections" and len(split_sections(article_content)) > 1:
+            # Edit each section concurrently, with a short overview of the whole article
+            edited_content = map_sections(
+                article_content,
+                lambda text, part, overview: self._edit_article(
+                    text, style, platform, traits=traits, scope=f"{overview}\nThis part: {part}"
+                ),
+                REVIEW_PARALLELISM
+            )
+        else:
+            # Edit the article in a single call
+            edited_content = self._edit_article(article_content, style, platform, traits=traits, scope=scope)
+            
+        return {
+            "edited_article": edited_content,
+            "original_article": article_content
+        }
+    
+    def _edit_article(self, content: str, style: str, platform: str = None,
+                      traits: List[str] = None, scope: str = None) -> str:
+        """
+        Improve the article and make it feel human in a single comprehensive pass.
+        
+        Args:
+            content: The article content
+            style: The writing style
+            platform: Optional publishing platform
+            traits: Optional personality traits (picked at random if omitted)
+            scope: Optional overview of the whole article when content is only one part of it
+            
+        Returns:
+            Edited article content (or edited part)
+        """
+        platform_str = f" for {platform}" if platform else ""
+        traits_str = ", ".join(traits or pick_traits())
+        
+        if scope:
+            request = render_prompt("""
+            Edit this part of an article{platform_str}: make it more engaging, readable and coherent, and make it feel authentically human.
+            It will be put back into the article in the same place, so don't add a heading, introduction or conclusion of its own.
+            
+            {scope}
+            """, platform_str=platform_str, scope=scope)
+            label = "PART"
+        else:
+            request = f"Edit this article{platform_str}: make it more engaging, readable and coherent, and make it feel authentically human."
+            label = "ARTICLE"
+            
+        prompt = render_prompt("""
+        {request}
+        
+        Do both of these in one pass:
+        1. IMPROVE:
+           - Simplify complex sentences and break up long paragraphs
+           - Add subheadings where appropriate and improve transitions between ideas
+           - Enhance the hook in the introduction and make the conclusion more impactful
+           - Add compelling examples where appropriate
+           - Ensure a logical progression of ideas and remove redundancies
+           - Keep a consistent tone in {style} style and consistent terminology
+           
+        2. HUMANIZE:
+           - Add occasional first-person perspective and genuine-feeling reflections
+           - Use conversational language, contractions and the odd rhetorical question
+           - Add a few natural asides or thought transitions if they suit the style
+           - Let these personality traits show through word choice and perspective, without stating them: {traits_str}
+           
+        Example of a good edit:
+        
+        ORIGINAL:
+        ```
+        AI tools can help with content creation. They use algorithms to generate text. Many businesses are using them now.
+        ```
+        
+        EDITED:
+        ```
+        I still remember the first time an AI writing assistant finished a paragraph for me—it was a little unsettling, honestly. These tools analyze patterns in language to generate text that reads naturally, and from small startups to Fortune 500 companies, more and more teams are bringing them into their content workflows.
+        ```
+        
+        Please maintain the article's core structure, content and expertise level. The human touch should be subtle and appropriate for a {style} style. Return only the complete edited text.
+        
+        {label}:
+        {content}
+        
+        EDITED {label}:
+        """, request=request, style=style, traits_str=traits_str, label=label, content=content)
+        
+        return generate_text(prompt, task="editor.edit")
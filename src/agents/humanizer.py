@@ -7,7 +7,21 @@ from typing import Dict, Optional, List
 import random
 
 from src.agents.base import Agent
-from src.utils.llm import generate_text
+from src.utils.config import REVIEW_MODE, REVIEW_PARALLELISM
+from src.utils.llm import generate_text, render_prompt
+from src.utils.markdown_sections import map_sections, split_sections
+
+def pick_traits() -> List[str]:
+    """
+    Select a few personality traits to incorporate.
+    
+    Returns:
+        List of three traits
+    """
+    return random.sample([
+        "thoughtful", "curious", "empathetic", "enthusiastic", 
+        "analytical", "reflective", "practical", "creative"
+    ], 3)
 
 class HumanizerAgent(Agent):
     """
@@ -31,18 +45,33 @@ class HumanizerAgent(Agent):
         article_content = context.get("article_content", "")
         style = context.get("style", "conversational")
         platform = context.get("platform")
-        
-        self.log("Adding human touch to article content")
-        
-        # Humanize the article in a single call
-        humanized_content = self._humanize_article(article_content, style, platform)
+        mode = context.get("mode", REVIEW_MODE)
+        # Set when the content is one part of an article (see map_sections)
+        scope = context.get("scope")
+        
+        self.log(f"Adding human touch to article content ({mode} mode)")
+        
+        if mode == "sections" and len(split_sections(article_content)) > 1:
+            # Humanize each section concurrently; one set of traits keeps the voice consistent
+            traits = pick_traits()
+            humanized_content = map_sections(
+                article_content,
+                lambda text, part, overview: self._humanize_article(
+                    text, style, platform, traits=traits, scope=f"{overview}\nThis part: {part}"
+                ),
+                REVIEW_PARALLELISM
+            )
+        else:
+            # Humanize the article in a single call
+            humanized_content = self._humanize_article(article_content, style, platform, scope=scope)
         
         return {
             "humanized_article": humanized_content,
             "original_article": article_content
         }
     
-    def _humanize_article(self, content: str, style: str, platform: str = None) -> str:
+    def _humanize_article(self, content: str, style: str, platform: str = None,
+                          traits: List[str] = None, scope: str = None) -> str:
         """
         Add a human touch to the article in a single comprehensive pass.
         
@@ -50,21 +79,29 @@ class HumanizerAgent(Agent):
             content: The article content
             style: The writing style
             platform: Optional publishing platform
+            traits: Optional personality traits (picked at random if omitted)
+            scope: Optional overview of the whole article when content is only one part of it
             
         Returns:
-            Humanized article content
+            Humanized article content (or humanized part)
         """
         platform_str = f" for {platform}" if platform else ""
+        traits_str = ", ".join(traits or pick_traits())
         
-        # Select a few personality traits to incorporate
-        personality_traits = random.sample([
-            "thoughtful", "curious", "empathetic", "enthusiastic", 
-            "analytical", "reflective", "practical", "creative"
-        ], 3)
-        traits_str = ", ".join(personality_traits)
+        if scope:
+            request = render_prompt("""
+            Revise this part of an article{platform_str} to make it feel more authentically human and engaging.
+            It will be put back into the article in the same place, so don't add a heading, introduction or conclusion of its own.
+            
+            {scope}
+            """, platform_str=platform_str, scope=scope)
+            label = "PART"
+        else:
+            request = f"Revise this article{platform_str} to make it feel more authentically human and engaging."
+            label = "ARTICLE"
         
-        prompt = f"""
-        Revise this article{platform_str} to make it feel more authentically human and engaging.
+        prompt = render_prompt("""
+        {request}
         
         Add these human elements:
         1. PERSONAL VOICE:
@@ -98,10 +135,10 @@ class HumanizerAgent(Agent):
         
         Please maintain the article's core content and expertise level while making it feel like it was written by a real person with genuine experiences and opinions. The humanization should be subtle and appropriate for a {style} style.
         
-        ARTICLE:
+        {label}:
         {content}
         
-        HUMANIZED ARTICLE:
-        """
+        HUMANIZED {label}:
+        """, request=request, style=style, traits_str=traits_str, label=label, content=content)
         
-        return generate_text(prompt) 
\ No newline at end of file
+        return generate_text(prompt, task="humanizer.humanize") 
\ No newline at end of file
@@ -6,7 +6,7 @@ Responsible for creating article outlines and planning the content structure.
 from typing import Dict, Optional, List
 
 from src.agents.base import Agent
-from src.utils.llm import generate_text
+from src.utils.llm import generate_with_cascade, render_prompt
 
 class PlannerAgent(Agent):
     """
@@ -54,7 +54,7 @@ class PlannerAgent(Agent):
         Returns:
             Dictionary containing the outline and section prompts
         """
-        prompt = f"""
+        prompt = render_prompt("""
         Create a detailed outline for an article about {topic}.
         
         Additional context: {description}
@@ -67,9 +67,13 @@ class PlannerAgent(Agent):
         3. 2-3 bullet points under each section describing what to cover
         
         Format the outline as a Markdown document with ## for section headings and - for bullet points.
-        """
+        """, topic=topic, description=description, style=style)
         
-        outline_text = generate_text(prompt)
+        outline_text = generate_with_cascade(
+            prompt,
+            "planner.outline",
+            validator=lambda text: bool(self._parse_outline(text))
+        )
         
         # Parse the outline to create section prompts
         sections = self._parse_outline(outline_text)
@@ -103,7 +107,7 @@ class PlannerAgent(Agent):
         common_formats = platform_style.get("common_formats", ["listicle", "how-to", "explainer"])
         tone = platform_style.get("tone", "informative")
         
-        prompt = f"""
+        prompt = render_prompt("""
         Create a detailed outline for an article about {topic} specifically for publication on {platform}.
         
         Additional context: {description}
@@ -112,7 +116,7 @@ class PlannerAgent(Agent):
         - Be written in a {style} style with a {tone} tone
         - Have approximately {avg_section_count} sections
         - Target around {avg_word_count} words total
-        - Use a {' or '.join(common_formats)} format that works well on {platform}
+        - Use a {formats} format that works well on {platform}
         
         Your outline should include:
         1. A catchy, {platform}-optimized title
@@ -120,9 +124,14 @@ class PlannerAgent(Agent):
         3. 2-3 bullet points under each section describing what to cover
         
         Format the outline as a Markdown document with ## for section headings and - for bullet points.
-        """
-        
-        outline_text = generate_text(prompt)
+        """, topic=topic, platform=platform, description=description, style=style, tone=tone,
+           avg_section_count=avg_section_count, avg_word_count=avg_word_count, formats=" or ".join(common_formats))
+        
+        outline_text = generate_with_cascade(
+            prompt,
+            "planner.outline",
+            validator=lambda text: bool(self._parse_outline(text))
+        )
         
         # Parse the outline to create section prompts
         sections = self._parse_outline(outline_text)
@@ -3,10 +3,28 @@ Reviewer Agent for the Agentic Writer System.
 Responsible for reviewing and improving article content.
 """
 
+import json
 from typing import Dict, Optional, List
 
 from src.agents.base import Agent
-from src.utils.llm import generate_text
+from src.utils.config import REVIEW_MODE, REVIEW_PARALLELISM
+from src.utils.llm import generate_text, generate_with_cascade, render_prompt
+from src.utils.markdown_sections import map_sections, split_sections
+
+def _is_json_object(text: str) -> bool:
+    """
+    Check whether a response parses as a JSON object.
+    
+    Args:
+        text: The response text
+        
+    Returns:
+        True if the text is a JSON object
+    """
+    try:
+        return isinstance(json.loads(text), dict)
+    except ValueError:
+        return False
 
 class ReviewerAgent(Agent):
     """
@@ -30,6 +48,10 @@ class ReviewerAgent(Agent):
         article_content = context.get("article_content", "")
         style = context.get("style", "conversational")
         platform = context.get("platform")
+        summarize = context.get("summarize", True)
+        mode = context.get("mode", REVIEW_MODE)
+        # Set when the content is one part of an article (see map_sections)
+        scope = context.get("scope")
         
         # If this is a summarize improvements task, handle it separately
         if task.lower().startswith("summarize"):
@@ -42,18 +64,33 @@ class ReviewerAgent(Agent):
                 }
             return {"improvements": {}}
         
-        self.log("Reviewing and improving article content")
-        
-        # Improve the article in a single call
-        improved_content = self._improve_article(article_content, style, platform)
-        
-        return {
+        self.log(f"Reviewing and improving article content ({mode} mode)")
+        
+        if mode == "sections" and len(split_sections(article_content)) > 1:
+            # Improve each section concurrently, with a short overview of the whole article
+            improved_content = map_sections(
+                article_content,
+                lambda text, part, overview: self._improve_article(
+                    text, style, platform, scope=f"{overview}\nThis part: {part}"
+                ),
+                REVIEW_PARALLELISM
+            )
+        else:
+            # Improve the article in a single call
+            improved_content = self._improve_article(article_content, style, platform, scope=scope)
+        
+        result = {
             "improved_article": improved_content,
-            "original_article": article_content,
-            "improvements_made": self._summarize_improvements(article_content, improved_content)
+            "original_article": article_content
         }
+        
+        # Callers that summarize later (e.g. against the final text) can skip this call
+        if summarize:
+            result["improvements_made"] = self._summarize_improvements(article_content, improved_content)
+        
+        return result
     
-    def _improve_article(self, content: str, style: str, platform: str = None) -> str:
+    def _improve_article(self, content: str, style: str, platform: str = None, scope: str = None) -> str:
         """
         Improve the article in a single comprehensive pass.
         
@@ -61,14 +98,29 @@ class ReviewerAgent(Agent):
             content: The article content
             style: The writing style
             platform: Optional publishing platform
+            scope: Optional overview of the whole article when content is only one part of it
             
         Returns:
-            Improved article content
+            Improved article content (or improved part)
         """
         platform_str = f" for {platform}" if platform else ""
         
-        prompt = f"""
-        Review and improve this article{platform_str} to make it more engaging, readable, and coherent.
+        if scope:
+            request = render_prompt("""
+            Review and improve this part of an article{platform_str} to make it more engaging, readable, and coherent.
+            It will be put back into the article in the same place, so don't add a heading, introduction or conclusion of its own.
+            
+            {scope}
+            """, platform_str=platform_str, scope=scope)
+            result = "Return only the complete improved part."
+            label = "PART"
+        else:
+            request = f"Review and improve this article{platform_str} to make it more engaging, readable, and coherent."
+            result = "Return the complete improved article."
+            label = "ARTICLE"
+        
+        prompt = render_prompt("""
+        {request}
         
         Focus on:
         1. READABILITY:
@@ -102,15 +154,15 @@ class ReviewerAgent(Agent):
         AI-powered writing assistants have revolutionized content creation, offering a helping hand to writers across industries. These sophisticated tools leverage advanced algorithms to analyze patterns in language and generate human-like text that resonates with readers. From small startups to Fortune 500 companies, organizations are increasingly incorporating these AI collaborators into their content workflows—and seeing impressive results.
         ```
         
-        Please maintain the article's core structure and message while making it more polished and professional. Return the complete improved article.
+        Please maintain the article's core structure and message while making it more polished and professional. {result}
         
-        ARTICLE:
+        {label}:
         {content}
         
-        IMPROVED ARTICLE:
-        """
+        IMPROVED {label}:
+        """, request=request, style=style, result=result, label=label, content=content)
         
-        return generate_text(prompt)
+        return generate_text(prompt, task="reviewer.improve")
     
     def _summarize_improvements(self, original: str, improved: str) -> Dict:
         """
@@ -123,7 +175,7 @@ class ReviewerAgent(Agent):
         Returns:
             Dictionary summarizing the improvements
         """
-        prompt = f"""
+        prompt = render_prompt("""
         Compare the original and improved versions of this article and provide a concise summary of the improvements made.
         
         Focus on identifying:
@@ -135,17 +187,17 @@ class ReviewerAgent(Agent):
         Format your response as a JSON object with these categories as keys and brief descriptions as values.
         
         ORIGINAL:
-        {original[:1000]}... (truncated)
+        {original}... (truncated)
         
         IMPROVED:
-        {improved[:1000]}... (truncated)
-        """
+        {improved}... (truncated)
+        """, original=original[:1000], improved=improved[:1000])
         
-        improvements_text = generate_text(prompt)
+        # A cheap model is enough here; escalate only if it doesn't return valid JSON
+        improvements_text = generate_with_cascade(prompt, "reviewer.summary", validator=_is_json_object)
         
         # Try to parse as JSON, but provide a fallback if it's not valid JSON
         try:
-            import json
             return json.loads(improvements_text)
         except:
             return {
@@ -3,10 +3,15 @@ Writer Agent for the Agentic Writer System.
 Responsible for generating article content based on outlines.
 """
 
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 
 from src.agents.base import Agent
-from src.utils.llm import generate_text
+from src.utils.config import WRITER_MODE, WRITER_PARALLELISM
+from src.utils.llm import LLMError, generate_text, generate_text_batch, generate_text_stream, render_prompt
+from src.utils.markdown_sections import (
+    FRAME_HEADINGS, block_keys, body_sections, demote_headings, diff_outlines, join_sections, section_markdown,
+    splice_sections, split_sections
+)
 
 class WriterAgent(Agent):
     """
@@ -33,24 +38,49 @@ class WriterAgent(Agent):
         style = context.get("style", "conversational")
         platform = context.get("platform")
         research = context.get("research", {})
-        
-        self.log("Generating article content")
-        
-        # Generate the entire article in one call
-        article_content = self._generate_full_article(
-            title,
-            outline,
-            sections,
-            style,
-            platform,
-            research
-        )
+        mode = context.get("mode", WRITER_MODE)
+        
+        self.log(f"Generating article content ({mode} mode)")
+        
+        if mode == "sections" and sections:
+            # Write the introduction, each section and the conclusion concurrently
+            article_content = self._generate_by_sections(
+                title,
+                sections,
+                style,
+                platform,
+                research
+            )
+        else:
+            # Generate the entire article in one call
+            article_content = self._generate_full_article(
+                title,
+                outline,
+                sections,
+                style,
+                platform,
+                research
+            )
         
         return {
             "article_content": article_content,
             "title": title
         }
     
+    def count_parts(self, sections: List[Dict]) -> int:
+        """
+        Count the parts written for an outline: the introduction, each section and the conclusion.
+        
+        Writing progress is reported against this total in every mode.
+        
+        Args:
+            sections: List of section dictionaries with headings and bullet points
+            
+        Returns:
+            Number of parts
+        """
+        return len(body_sections(sections)) + 2
+    
     def _generate_full_article(self, title: str, outline: str, sections: List[Dict], 
                               style: str, platform: str = None, research: Dict = None) -> str:
         """
@@ -78,7 +108,7 @@ class WriterAgent(Agent):
             sections_str += f"\n## Section {i+1}: {heading}\nKey points to cover:\n{bullet_points}\n"
         
         # Create a comprehensive prompt with examples
-        prompt = f"""
+        prompt = render_prompt("""
         Write a complete, well-structured article titled "{title}"{platform_str}.
         
         Style: {style}
@@ -127,15 +157,264 @@ class WriterAgent(Agent):
         ```
         
         Please write the complete article now, maintaining a cohesive flow throughout.
+        """, title=title, platform_str=platform_str, style=style, outline=outline, sections_str=sections_str,
+           research_summary=research_summary)
+        
+        # Stream the article to the caller as it is written, if anyone is listening
+        token_callback = getattr(self.system, "token_callback", None)
+        if token_callback:
+            chunks = []
+            for chunk in generate_text_stream(prompt, task="writer.article"):
+                chunks.append(chunk)
+                token_callback(chunk)
+            return "".join(chunks).strip()
+        
+        return generate_text(prompt, task="writer.article")
+    
+    def _generate_by_sections(self, title: str, sections: List[Dict], style: str,
+                              platform: str = None, research: Dict = None) -> str:
+        """
+        Generate the article with one request per section plus the introduction and
+        conclusion, running up to WRITER_PARALLELISM of them at once.
+        
+        Progress is reported as each part finishes, and if the system streams article
+        text, parts are passed on in article order as soon as everything before them is done.
+        
+        Args:
+            title: The article title
+            sections: List of section dictionaries with headings and bullet points
+            style: The writing style to use
+            platform: Optional publishing platform
+            research: Optional research information
+            
+        Returns:
+            Complete article text
+        """
+        # The introduction and conclusion get their own requests, so skip outline sections for them
+        sections = body_sections(sections)
+        
+        # Parts in article order: introduction, sections, conclusion
+        parts = [("Introduction", self._introduction_prompt(sections, style, platform, research), "writer.introduction")]
+        for section in sections:
+            parts.append((section["heading"], self._section_prompt(
+                section["heading"],
+                section["bullet_points"],
+                style,
+                platform,
+                self._get_relevant_research(section["heading"], research)
+            ), "writer.section"))
+        parts.append(("Conclusion", self._conclusion_prompt(sections, style, platform), "writer.conclusion"))
+        
+        token_callback = getattr(self.system, "token_callback", None)
+        if token_callback:
+            token_callback(f"# {title}\n\n")
+        
+        results = [None] * len(parts)
+        progress = {"done": 0, "streamed": 0}
+        total = self.count_parts(sections)
+        
+        def finished(i: int, item: Dict):
+            if item["error"] is not None:
+                raise LLMError(f"Writing {parts[i][0]} failed: {item['error']}")
+            results[i] = item["text"]
+            progress["done"] += 1
+            self.log(f"Finished part {progress['done']}/{len(parts)}: {parts[i][0]}")
+            self.system._update_progress("writing", section=parts[i][0], progress=progress["done"], total=total)
+            
+            while token_callback and progress["streamed"] < len(parts) and results[progress["streamed"]] is not None:
+                streamed = progress["streamed"]
+                token_callback(self._part_markdown(parts[streamed][0], results[streamed], streamed, len(parts)))
+                progress["streamed"] += 1
+        
+        generate_text_batch(
+            [prompt for _, prompt, _ in parts],
+            task=[task for _, _, task in parts],
+            max_workers=WRITER_PARALLELISM,
+            on_result=finished
+        )
+        
+        written_sections = [
+            {"heading": section["heading"], "content": content}
+            for section, content in zip(sections, results[1:-1])
+        ]
+        return self._assemble_article(title, results[0], written_sections, results[-1])
+    
+    def rewrite_sections(self, article_content: str, old_sections: List[Dict], new_sections: List[Dict],
+                         style: str, platform: str = None, research: Dict = None) -> Dict:
+        """
+        Update an article to a revised outline, rewriting only the sections that changed.
+        
+        The outlines are diffed by heading, occurrence and bullet points. Added and changed sections
+        are written concurrently and spliced into the article, removed ones are dropped,
+        and everything else is kept as is. An introduction or conclusion whose outline
+        entry was added or changed is rewritten too; one whose entry was removed stays
+        in the article and is reported as skipped.
+        
+        Args:
+            article_content: The current article
+            old_sections: The outline sections the article was written from
+            new_sections: The revised outline sections
+            style: The writing style to use
+            platform: Optional publishing platform
+            research: Optional research information
+            
+        Returns:
+            Dictionary with the updated article, the outline diff, the rewritten headings
+            (and their block keys in the updated article) and the headings of outline
+            edits that were not applied
+        """
+        diff = diff_outlines(old_sections, new_sections)
+        # Sections are keyed by heading and occurrence, so repeated headings stay apart
+        old = dict(zip(block_keys(old_sections), old_sections))
+        new = list(zip(block_keys(new_sections), new_sections))
+        new_keys = {key for key, _ in new}
+        unchanged = {
+            key for key, section in new
+            if key in old and old[key]["bullet_points"] == section["bullet_points"]
+        }
+        edited_frames = [
+            (key, section) for key, section in new if key[0] in FRAME_HEADINGS and key not in unchanged
+        ]
+        skipped = [
+            section["heading"] for key, section in old.items() if key[0] in FRAME_HEADINGS and key not in new_keys
+        ]
+        new = [(key, section) for key, section in new if key[0] not in FRAME_HEADINGS]
+        new_sections = [section for _, section in new]
+        
+        removed = {key for key in old if key not in new_keys and key[0] not in FRAME_HEADINGS}
+        blocks, keys = [], []
+        article = split_sections(article_content)
+        for block, key in zip(article, block_keys(article)):
+            if key not in removed:
+                blocks.append(block)
+                keys.append(key)
+        
+        # Added and changed sections, plus unchanged ones the article is missing
+        rewrite = [(key, section) for key, section in new if key not in unchanged or key not in keys]
+        
+        # New sections go right after the section that precedes them in the outline
+        for i, (key, section) in enumerate(new):
+            if key not in keys:
+                position = self._insert_position(keys, [previous for previous, _ in new[:i]])
+                blocks.insert(position, {"heading": section["heading"], "markdown": ""})
+                keys.insert(position, key)
+        
+        requests = [
+            (self._section_prompt(
+                section["heading"],
+                section["bullet_points"],
+                style,
+                platform,
+                self._get_relevant_research(section["heading"], research)
+            ), "writer.section")
+            for _, section in rewrite
+        ]
+        for key, section in edited_frames:
+            if key[0] == "introduction":
+                requests.append((self._introduction_prompt(
+                    new_sections, style, platform, research, section["bullet_points"]), "writer.introduction"))
+            else:
+                requests.append((self._conclusion_prompt(
+                    new_sections, style, platform, section["bullet_points"]), "writer.conclusion"))
+        
+        self.log(f"Rewriting {len(requests)} of {len(new_sections) + 2} parts")
+        contents = self._generate_parts(requests)
+        replacements = {
+            key: section_markdown(section["heading"], content)
+            for (key, section), content in zip(rewrite, contents)
+        }
+        rewritten_keys = [key for key, _ in rewrite]
+        
+        for (key, section), content in zip(edited_frames, contents[len(rewrite):]):
+            if key[0] == "introduction":
+                # The title stays; only the introduction under it is replaced
+                if (None, 1) not in keys:
+                    blocks.insert(0, {"heading": None, "markdown": ""})
+                    keys.insert(0, (None, 1))
+                title = blocks[keys.index((None, 1))]["markdown"].strip("\n").split("\n", 1)[0]
+                content = demote_headings(content)
+                replacements[(None, 1)] = f"{title}\n\n{content}" if title.startswith("# ") else content
+                rewritten_keys.append((None, 1))
+            else:
+                if ("conclusion", 1) not in keys:
+                    blocks.append({"heading": "Conclusion", "markdown": ""})
+                    keys.append(("conclusion", 1))
+                heading = blocks[keys.index(("conclusion", 1))]["heading"]
+                replacements[("conclusion", 1)] = section_markdown(heading, content)
+                rewritten_keys.append(("conclusion", 1))
+        
+        return {
+            "article_content": join_sections(splice_sections(blocks, replacements, keys)),
+            "diff": diff,
+            "rewritten": [section["heading"] for _, section in rewrite + edited_frames],
+            "rewritten_keys": rewritten_keys,
+            "skipped": skipped
+        }
+    
+    def _insert_position(self, keys: List[Tuple[Optional[str], int]],
+                         preceding: List[Tuple[Optional[str], int]]) -> int:
         """
+        Find where a new section goes in an article.
         
-        return generate_text(prompt)
+        Args:
+            keys: Block keys of the article's sections
+            preceding: Block keys of the outline sections before the new one
+            
+        Returns:
+            Index to insert the new block at
+        """
+        for key in reversed(preceding):
+            if key in keys:
+                return keys.index(key) + 1
+        
+        # No earlier section in the article: go after the title and introduction
+        position = 0
+        while position < len(keys) and keys[position][0] is None:
+            position += 1
+        return position
     
-    def _generate_section_content(self, heading: str, bullet_points: List[str], 
-                                 style: str, platform: str = None, 
-                                 research: Dict = None) -> str:
+    def _generate_parts(self, requests: List[Tuple[str, str]]) -> List[str]:
         """
-        Generate content for a specific section.
+        Generate several parts of the article concurrently.
+        
+        Args:
+            requests: Tuples of prompt and routing task
+            
+        Returns:
+            The generated texts, in the order of the requests
+        """
+        results = generate_text_batch(
+            [prompt for prompt, _ in requests],
+            task=[task for _, task in requests],
+            max_workers=WRITER_PARALLELISM
+        )
+        for item in results:
+            if item["error"] is not None:
+                raise LLMError(f"Writing a section failed: {item['error']}")
+        return [item["text"] for item in results]
+    
+    def _part_markdown(self, heading: str, content: str, index: int, count: int) -> str:
+        """
+        Format one finished part the way _assemble_article lays it out, for streaming.
+        
+        Args:
+            heading: The part heading
+            content: The generated text
+            index: Position of the part (0 is the introduction)
+            count: Number of parts
+            
+        Returns:
+            Markdown for the part
+        """
+        if index == 0:
+            return f"{content}\n\n"
+        return f"## {heading}\n\n{content}\n\n" if index < count - 1 else f"## {heading}\n\n{content}"
+    
+    def _section_prompt(self, heading: str, bullet_points: List[str], 
+                        style: str, platform: str = None, 
+                        research: Dict = None) -> str:
+        """
+        Build the prompt that writes a specific section.
         
         Args:
             heading: The section heading
@@ -145,7 +424,7 @@ class WriterAgent(Agent):
             research: Optional research information relevant to this section
             
         Returns:
-            Generated section content
+            The prompt for the section
         """
         platform_str = f" for {platform}" if platform else ""
         research_str = ""
@@ -155,7 +434,7 @@ class WriterAgent(Agent):
         
         bullet_points_str = "\n".join([f"- {point}" for point in bullet_points])
         
-        prompt = f"""
+        return render_prompt("""
         Write a detailed section for an article{platform_str} with the heading "{heading}".
         
         The section should cover these key points:
@@ -165,23 +444,24 @@ class WriterAgent(Agent):
         
         Make the content engaging, informative, and well-structured with smooth transitions between ideas.
         Use concrete examples and avoid generic statements where possible.
-        """
-        
-        return generate_text(prompt)
+        """, platform_str=platform_str, heading=heading, bullet_points_str=bullet_points_str, style=style,
+           research_str=research_str)
     
-    def _generate_introduction(self, sections: List[Dict], style: str, 
-                              platform: str = None, research: Dict = None) -> str:
+    def _introduction_prompt(self, sections: List[Dict], style: str, 
+                             platform: str = None, research: Dict = None,
+                             bullet_points: List[str] = None) -> str:
         """
-        Generate an introduction for the article.
+        Build the prompt that writes the article's introduction.
         
         Args:
             sections: List of section dictionaries
             style: The writing style to use
             platform: Optional publishing platform
             research: Optional research information
+            bullet_points: Optional points from the outline's introduction entry
             
         Returns:
-            Generated introduction
+            The prompt for the introduction
         """
         # Extract key topics from sections
         topics = [section["heading"] for section in sections]
@@ -193,7 +473,7 @@ class WriterAgent(Agent):
         if research and research.get("summary"):
             research_str = f"\n\nUse the following research information where relevant:\n{research.get('summary')}"
         
-        prompt = f"""
+        return render_prompt("""
         Write an engaging introduction for an article{platform_str} that will cover the following topics:
         {topics_str}
         
@@ -201,26 +481,27 @@ class WriterAgent(Agent):
         - Hook the reader with an interesting opening
         - Provide context for why this topic matters
         - Briefly outline what the article will cover
-        - Set the tone for the rest of the piece
+        - Set the tone for the rest of the piece{points_str}
         
         Write in a {style} style.{research_str}
         
         The introduction should be 2-3 paragraphs long.
-        """
-        
-        return generate_text(prompt)
+        """, platform_str=platform_str, topics_str=topics_str, points_str=self._points_str(bullet_points),
+           style=style, research_str=research_str)
     
-    def _generate_conclusion(self, sections: List[Dict], style: str, platform: str = None) -> str:
+    def _conclusion_prompt(self, sections: List[Dict], style: str, platform: str = None,
+                           bullet_points: List[str] = None) -> str:
         """
-        Generate a conclusion for the article.
+        Build the prompt that writes the article's conclusion.
         
         Args:
             sections: List of section dictionaries
             style: The writing style to use
             platform: Optional publishing platform
+            bullet_points: Optional points from the outline's conclusion entry
             
         Returns:
-            Generated conclusion
+            The prompt for the conclusion
         """
         # Extract key points from sections
         key_points = []
@@ -230,7 +511,7 @@ class WriterAgent(Agent):
         key_points_str = "\n".join([f"- {point}" for point in key_points])
         platform_str = f" for {platform}" if platform else ""
         
-        prompt = f"""
+        return render_prompt("""
         Write a thoughtful conclusion for an article{platform_str} that has covered these key points:
         {key_points_str}
         
@@ -238,14 +519,27 @@ class WriterAgent(Agent):
         - Summarize the main takeaways
         - Provide a sense of closure
         - Leave the reader with something to think about or act on
-        - Not introduce new major points
+        - Not introduce new major points{points_str}
         
         Write in a {style} style.
         
         The conclusion should be 2-3 paragraphs long.
+        """, platform_str=platform_str, key_points_str=key_points_str, points_str=self._points_str(bullet_points),
+           style=style)
+    
+    def _points_str(self, bullet_points: Optional[List[str]]) -> str:
         """
+        Format outline points as an extra guideline for the introduction and conclusion prompts.
         
-        return generate_text(prompt)
+        Args:
+            bullet_points: The points, or None
+            
+        Returns:
+            The guideline line, or an empty string when there are no points
+        """
+        if not bullet_points:
+            return ""
+        return f"\n- Cover these points from the outline: {'; '.join(bullet_points)}"
     
     def _assemble_article(self, title: str, introduction: str, 
                          sections: List[Dict], conclusion: str) -> str:
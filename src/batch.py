@@ -0,0 +1,202 @@
+"""
+Batch runner for the Agentic Writer System.
+Generates many articles concurrently on a pool of worker processes sharing one LLM concurrency cap.
+"""
+
+import os
+import json
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout, redirect_stderr
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from src.utils.config import BATCHES_DIR, PUBLISHING_PLATFORMS, WRITING_STYLES
+
+def load_jobs(path: str) -> List[Dict]:
+    """
+    Read batch jobs from a JSON Lines file.
+
+    Each line is an object with a "topic" and optional "description", "style",
+    "platform" and "id" (which must be unique). Blank lines and lines starting
+    with "#" are ignored.
+
+    Args:
+        path: Path of the jobs file
+
+    Returns:
+        List of jobs with defaults filled in
+    """
+    jobs = []
+    seen = set()
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                job = json.loads(line)
+            except ValueError as e:
+                raise ValueError(f"{path}:{line_number}: invalid JSON: {e}")
+            if not isinstance(job, dict) or not job.get("topic"):
+                raise ValueError(f"{path}:{line_number}: a job needs a topic")
+
+            job.setdefault("description", "")
+            job.setdefault("style", "conversational")
+            job.setdefault("platform", "none")
+            job.setdefault("id", f"job_{len(jobs) + 1}")
+            if job["id"] in seen:
+                # Ids name each job's log file and report entry
+                raise ValueError(f"{path}:{line_number}: duplicate job id {job['id']}")
+            seen.add(job["id"])
+            if job["style"] not in WRITING_STYLES:
+                raise ValueError(f"{path}:{line_number}: unknown style {job['style']}")
+            if job["platform"] not in PUBLISHING_PLATFORMS:
+                raise ValueError(f"{path}:{line_number}: unknown platform {job['platform']}")
+            jobs.append(job)
+    return jobs
+
+def _init_worker(semaphore, workers: int):
+    """
+    Set up a worker process: its LLM requests count against the batch-wide cap
+    and it gets an even share of the rate limits.
+
+    Args:
+        semaphore: The batch's cross-process semaphore
+        workers: Number of worker processes
+    """
+    from src.utils.llm import share_limits
+    share_limits(semaphore, workers)
+
+def _run_job(job: Dict, log_dir: str) -> Dict:
+    """
+    Generate one article in a worker process.
+
+    The job's output goes to its own log file so parallel jobs don't interleave.
+
+    Args:
+        job: The job
+        log_dir: Directory for the job logs
+
+    Returns:
+        Dictionary with the job's status, timings, run id and LLM usage
+    """
+    from src.agentic_system import AgenticSystem
+    from src.utils.llm import get_metrics
+
+    result = {
+        "id": job["id"],
+        "topic": job["topic"],
+        "style": job["style"],
+        "platform": job["platform"],
+        "worker": os.getpid(),
+        "log": os.path.join(log_dir, f"{job['id']}.log")
+    }
+    before = get_metrics(0)["calls"]["overall"]
+    start = time.time()
+
+    with open(result["log"], "w", encoding="utf-8") as log, redirect_stdout(log), redirect_stderr(log):
+        try:
+            system = AgenticSystem(job["topic"], job["description"], job["style"], job["platform"])
+            result["run_id"] = system.run_id
+            system.generate_full_article()
+            system.wait_for_background()
+            result["status"] = "complete"
+            result["paths"] = system.artifacts.get("saved")
+            result["phase_times"] = dict(system.progress["phase_times"])
+        except Exception as e:
+            result["status"] = "failed"
+            result["error"] = str(e) or type(e).__name__
+            print(f"Job failed: {e}")
+
+    after = get_metrics(0)["calls"]["overall"]
+    result["time"] = time.time() - start
+    result["llm"] = {
+        key: after[key] - before[key]
+        for key in ("calls", "cache_hits", "retries", "prompt_tokens", "completion_tokens")
+    }
+    return result
+
+def run_batch(jobs: List[Dict], workers: int, llm_concurrency: int,
+              on_result: Optional[Callable[[Dict, int, int], None]] = None) -> Dict:
+    """
+    Run jobs concurrently on a process pool.
+
+    Worker processes share the persistent LLM response cache on disk, one
+    host-wide cap on in-flight LLM requests and the rate limits.
+
+    Args:
+        jobs: The jobs, as returned by load_jobs
+        workers: Number of worker processes
+        llm_concurrency: Maximum number of LLM requests in flight across all workers
+        on_result: Optional function called with each job result, the number done and the total
+
+    Returns:
+        The batch report
+    """
+    batch_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+    log_dir = os.path.join(BATCHES_DIR, batch_id)
+    os.makedirs(log_dir, exist_ok=True)
+
+    # Spawned workers import everything fresh (no forked threads, sockets or SQLite handles)
+    context = multiprocessing.get_context("spawn")
+    semaphore = context.BoundedSemaphore(max(1, llm_concurrency))
+
+    started = time.time()
+    results = []
+    with ProcessPoolExecutor(max_workers=max(1, workers), mp_context=context,
+                             initializer=_init_worker, initargs=(semaphore, workers)) as executor:
+        futures = {executor.submit(_run_job, job, log_dir): job for job in jobs}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # The worker itself died (e.g. killed), not just the job
+                result = {"id": job["id"], "topic": job["topic"], "style": job["style"],
+                          "platform": job["platform"], "status": "failed", "error": str(e), "time": None}
+            results.append(result)
+            if on_result:
+                on_result(result, len(results), len(jobs))
+    wall_time = time.time() - started
+
+    order = {job["id"]: i for i, job in enumerate(jobs)}
+    results.sort(key=lambda result: order[result["id"]])
+    job_time = sum(result["time"] or 0 for result in results)
+    return {
+        "batch_id": batch_id,
+        "started_at": datetime.fromtimestamp(started).isoformat(),
+        "workers": workers,
+        "llm_concurrency": llm_concurrency,
+        "log_dir": log_dir,
+        "summary": {
+            "jobs": len(results),
+            "complete": sum(1 for result in results if result["status"] == "complete"),
+            "failed": sum(1 for result in results if result["status"] == "failed"),
+            "wall_time": wall_time,
+            "total_job_time": job_time,
+            "speedup": job_time / wall_time if wall_time else None,
+            "llm_calls": sum(result.get("llm", {}).get("calls", 0) for result in results),
+            "cache_hits": sum(result.get("llm", {}).get("cache_hits", 0) for result in results),
+            "prompt_tokens": sum(result.get("llm", {}).get("prompt_tokens", 0) for result in results),
+            "completion_tokens": sum(result.get("llm", {}).get("completion_tokens", 0) for result in results)
+        },
+        "jobs": results
+    }
+
+def write_report(report: Dict, path: Optional[str] = None) -> str:
+    """
+    Write a batch report as JSON.
+
+    Args:
+        report: The report returned by run_batch
+        path: Optional output path (defaults to report.json in the batch directory)
+
+    Returns:
+        Path of the written report
+    """
+    path = path or os.path.join(report["log_dir"], "report.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, default=str)
+    return path
@@ -0,0 +1,347 @@
+"""
+Background job queue for the Agentic Writer System web app.
+Runs article generations on a bounded worker pool and tracks their live progress.
+"""
+
+import time
+import uuid
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, TYPE_CHECKING
+
+# This avoids circular imports
+if TYPE_CHECKING:
+    from src.agentic_system import AgenticSystem
+
+class JobQueueFull(Exception):
+    """Raised when a job is submitted while the queue is at its limit."""
+
+class RunAlreadyActive(Exception):
+    """Raised when a job is submitted for a run that another job is still queued or running for."""
+
+class Job:
+    """
+    One article generation running in the background.
+
+    Attributes:
+        id: The job identifier
+        system: The AgenticSystem doing the work
+        status: "queued", "running", "complete" or "failed"
+        created_at: When the job was submitted
+        started_at: When the job started running (None while queued)
+        finished_at: When the job finished (None until then)
+        error: Error message if the job failed
+
+    Every change is also recorded as a numbered event ("status", "progress" or
+    "draft", the article text as it is written) that clients can follow with events().
+    """
+
+    def __init__(self, system: "AgenticSystem"):
+        """
+        Initialize a queued job.
+
+        Args:
+            system: The AgenticSystem that will generate the article
+        """
+        self.id = uuid.uuid4().hex[:12]
+        self.system = system
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.error = None
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._events = []
+        self._draft = ""
+        self._section = (None, None)
+        self._progress = {
+            "phase": "starting",
+            "section": None,
+            "progress": 0,
+            "total": 100
+        }
+        self._emit("status", self.to_dict())
+
+    def update_progress(self, phase: str, section: str = None, progress: int = None, total: int = None):
+        """
+        Record a progress update from the system (its progress callback).
+
+        Args:
+            phase: The pipeline step being reported on
+            section: Optional section being processed
+            progress: Optional progress value
+            total: Optional total value
+        """
+        with self._lock:
+            # The system keeps reporting the last section; it only applies to the phase that set it
+            if section != self._section[1]:
+                self._section = (phase, section)
+            if phase != self._section[0]:
+                section = None
+            self._progress = {"phase": phase, "section": section, "progress": progress, "total": total}
+        self._emit("progress", self.to_dict())
+
+    def add_draft(self, chunk: str):
+        """
+        Record a chunk of the article draft (the system's token callback).
+
+        Chunks are passed on a paragraph at a time rather than token by token.
+
+        Args:
+            chunk: The text chunk
+        """
+        with self._lock:
+            self._draft += chunk
+            if "\n\n" not in self._draft:
+                return
+            text, _, self._draft = self._draft.rpartition("\n\n")
+        self._emit("draft", {"text": text + "\n\n"})
+
+    def _emit(self, kind: str, data: Dict):
+        """
+        Record an event and wake up anyone waiting for it.
+
+        Args:
+            kind: The event type
+            data: The event payload
+        """
+        with self._changed:
+            if kind != "draft" and self._draft and self.status in ("complete", "failed"):
+                # Flush the rest of the draft before the final status
+                self._events.append({"id": len(self._events) + 1, "event": "draft", "data": {"text": self._draft}})
+                self._draft = ""
+            self._events.append({"id": len(self._events) + 1, "event": kind, "data": data})
+            self._changed.notify_all()
+
+    @property
+    def finished(self) -> bool:
+        """Whether the job has completed or failed."""
+        return self.status in ("complete", "failed")
+
+    def events(self, after: int = 0, timeout: float = 15.0) -> List[Dict]:
+        """
+        Get the events after a given one, waiting for new ones if there are none yet.
+
+        Args:
+            after: Id of the last event already seen (0 for all)
+            timeout: Maximum number of seconds to wait
+
+        Returns:
+            List of {"id", "event", "data"} events, empty if none arrived in time
+            or the job is finished and there are no more
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: len(self._events) > after or self.finished, timeout)
+            return self._events[after:]
+
+    def _set_status(self, status: str, error: Optional[str] = None):
+        """
+        Move the job to a new status.
+
+        Args:
+            status: The new status
+            error: Optional error message
+        """
+        with self._lock:
+            self.status = status
+            if status == "running":
+                self.started_at = time.time()
+            elif status in ("complete", "failed"):
+                self.finished_at = time.time()
+                self.error = error
+        self._emit("status", self.to_dict())
+
+    def _message(self, progress: Dict, done: int, steps: int) -> str:
+        """
+        Describe the job's state in one line.
+
+        Args:
+            progress: The latest progress update
+            done: Number of finished pipeline steps
+            steps: Number of pipeline steps
+
+        Returns:
+            The message
+        """
+        if self.status == "queued":
+            return "Waiting for a free worker"
+        if self.status == "complete":
+            return "Article complete"
+        if self.status == "failed":
+            return f"Failed: {self.error}"
+
+        message = progress["phase"].replace("_", " ").capitalize()
+        if progress["section"]:
+            message += f": {progress['section']}"
+            if progress["progress"] is not None and progress["total"]:
+                message += f" ({progress['progress']}/{progress['total']})"
+        if steps:
+            message += f" - step {done} of {steps} done"
+        return message
+
+    def to_dict(self) -> Dict:
+        """
+        Get a snapshot of the job's status and progress.
+
+        Returns:
+            Dictionary with status, current phase and section, step counts,
+            per-phase times, elapsed time and, once complete, the saved article's ID
+        """
+        with self.system._progress_lock:
+            running = list(self.system.progress["running"])
+            phase_times = dict(self.system.progress["phase_times"])
+        scheduler = self.system._scheduler
+        steps = len(scheduler.nodes) if scheduler else 0
+
+        saved = self.system.artifacts.get("saved") or {}
+
+        with self._lock:
+            progress = dict(self._progress)
+            end = self.finished_at or time.time()
+            done = len(phase_times)
+            return {
+                "job_id": self.id,
+                "run_id": self.system.run_id,
+                "article_id": saved.get("article_id") if self.status == "complete" else None,
+                "topic": self.system.topic,
+                "style": self.system.style,
+                "platform": self.system.platform,
+                "status": self.status,
+                "phase": progress["phase"],
+                "section": progress["section"],
+                "progress": progress["progress"],
+                "total": progress["total"],
+                "steps_done": done,
+                "steps_total": steps,
+                "percent": 100 if self.status == "complete" else (round(100 * done / steps) if steps else 0),
+                "running": running,
+                "phase_times": phase_times,
+                "message": self._message(progress, done, steps),
+                "error": self.error,
+                "created_at": datetime.fromtimestamp(self.created_at).isoformat(),
+                "queued_time": (self.started_at or end) - self.created_at,
+                "elapsed": end - self.started_at if self.started_at else 0.0
+            }
+
+class JobManager:
+    """
+    Runs article generations on a bounded pool of worker threads.
+
+    Submitting returns immediately; at most max_workers jobs run at once and at
+    most max_queued wait for a worker, beyond which submissions are refused.
+    Finished jobs are kept (up to history_limit) so their status can still be read.
+    """
+
+    def __init__(self, max_workers: int = 4, max_queued: int = 32, history_limit: int = 100):
+        """
+        Initialize the manager.
+
+        Args:
+            max_workers: Maximum number of jobs running at once
+            max_queued: Maximum number of jobs waiting for a worker
+            history_limit: Number of finished jobs to keep
+        """
+        self.max_workers = max(1, max_workers)
+        self.max_queued = max_queued
+        self.history_limit = history_limit
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="article-job")
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+
+    def submit(self, system: "AgenticSystem") -> Job:
+        """
+        Queue an article generation.
+
+        Args:
+            system: The AgenticSystem to run
+
+        Returns:
+            The new job
+        """
+        with self._lock:
+            active = next((job for job in self._jobs.values()
+                           if job.system.run_id == system.run_id and job.status in ("queued", "running")), None)
+            if active is not None:
+                raise RunAlreadyActive(f"Run {system.run_id} is already {active.status} as job {active.id}")
+            queued = sum(1 for job in self._jobs.values() if job.status == "queued")
+            if queued >= self.max_queued:
+                raise JobQueueFull(f"{queued} jobs are already waiting; try again later")
+            job = Job(system)
+            self._jobs[job.id] = job
+            self._prune()
+
+        self._executor.submit(self._run, job)
+        return job
+
+    def _run(self, job: Job):
+        """
+        Run a job on a worker thread.
+
+        Args:
+            job: The job
+        """
+        job._set_status("running")
+        try:
+            job.system.run_with_progress_callback(job.update_progress, token_callback=job.add_draft)
+        except Exception as e:
+            job._set_status("failed", str(e) or type(e).__name__)
+            return
+        job._set_status("complete")
+
+    def _prune(self):
+        """
+        Forget the oldest finished jobs beyond the history limit (caller must hold the lock).
+        """
+        finished = [job_id for job_id, job in self._jobs.items() if job.status in ("complete", "failed")]
+        for job_id in finished[:max(0, len(finished) - self.history_limit)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        Look up a job.
+
+        Args:
+            job_id: The job identifier
+
+        Returns:
+            The job, or None if it doesn't exist (or was forgotten)
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def latest(self) -> Optional[Job]:
+        """
+        Get the most recently submitted job.
+
+        Returns:
+            The job, or None if there are none
+        """
+        with self._lock:
+            return next(reversed(self._jobs.values()), None)
+
+    def list(self) -> List[Dict]:
+        """
+        List the known jobs, newest first.
+
+        Returns:
+            List of job snapshots
+        """
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return [job.to_dict() for job in reversed(jobs)]
+
+    def stats(self) -> Dict:
+        """
+        Count jobs by status.
+
+        Returns:
+            Dictionary with the worker and queue limits and the number of jobs per status
+        """
+        with self._lock:
+            counts = {"queued": 0, "running": 0, "complete": 0, "failed": 0}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+        return {"max_workers": self.max_workers, "max_queued": self.max_queued, **counts}
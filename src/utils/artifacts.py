@@ -0,0 +1,310 @@
+"""
+Artifact store for the Agentic Writer System.
+Keeps the outputs of one article run so each is computed once, reused, and checkpointed to disk.
+"""
+
+import os
+import json
+import uuid
+import threading
+from concurrent.futures import Future
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from src.utils.config import RUNS_DIR
+
+# Name of the run manifest inside a run directory (not an artifact)
+_MANIFEST = "run"
+
+def new_run_id() -> str:
+    """
+    Generate an identifier for an article run.
+
+    Returns:
+        A sortable, unique run id
+    """
+    return f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+
+def run_directory(run_id: str) -> str:
+    """
+    Get the checkpoint directory of a run.
+
+    Args:
+        run_id: The run identifier
+
+    Returns:
+        Path of the run directory
+    """
+    return os.path.join(RUNS_DIR, run_id)
+
+def _write_json(path: str, value: Any):
+    """
+    Write a JSON file atomically.
+
+    Args:
+        path: Path of the file
+        value: The value to write
+    """
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(value, f, indent=2, default=str)
+    os.replace(temp_path, path)
+
+def read_manifest(run_id: str) -> Optional[Dict]:
+    """
+    Read the manifest of a run (its inputs, status and completed steps).
+
+    Args:
+        run_id: The run identifier
+
+    Returns:
+        The manifest, or None if the run doesn't exist
+    """
+    path = os.path.join(run_directory(run_id), f"{_MANIFEST}.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def write_manifest(run_id: str, manifest: Dict):
+    """
+    Write the manifest of a run.
+
+    Args:
+        run_id: The run identifier
+        manifest: The manifest to write
+    """
+    directory = run_directory(run_id)
+    os.makedirs(directory, exist_ok=True)
+    _write_json(os.path.join(directory, f"{_MANIFEST}.json"), manifest)
+
+def list_runs(status: Optional[str] = None) -> List[Dict]:
+    """
+    List checkpointed runs, newest first.
+
+    Args:
+        status: Optional status to filter by, e.g. "failed" or "running"
+
+    Returns:
+        List of run manifests
+    """
+    if not os.path.isdir(RUNS_DIR):
+        return []
+
+    runs = []
+    for run_id in os.listdir(RUNS_DIR):
+        try:
+            manifest = read_manifest(run_id)
+        except (OSError, ValueError) as e:
+            print(f"Error reading run manifest {run_id}: {e}")
+            continue
+        if manifest and (status is None or manifest.get("status") == status):
+            runs.append(manifest)
+
+    runs.sort(key=lambda run: run.get("run_id", ""), reverse=True)
+    return runs
+
+class ArtifactStore:
+    """
+    Run-scoped store of agent outputs (research, outline, drafts, summaries).
+
+    Values are keyed by name. get_or_compute runs the computation at most once per
+    name, even when several threads ask for the same artifact at the same time.
+    With a directory, every artifact is also written to <directory>/<name>.json as
+    soon as it is stored, so an interrupted run can be resumed.
+
+    An artifact can carry a fingerprint of the inputs it was computed from, which
+    lets a later run decide whether a stored artifact is still valid for its inputs.
+
+    Attributes:
+        run_id: Identifier of the run the artifacts belong to
+        directory: Optional checkpoint directory
+    """
+
+    def __init__(self, run_id: str = None, directory: Optional[str] = None):
+        """
+        Initialize an empty store.
+
+        Args:
+            run_id: Optional run identifier (a new one is generated if omitted)
+            directory: Optional checkpoint directory
+        """
+        self.run_id = run_id or new_run_id()
+        self.directory = directory
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._values: Dict[str, Any] = {}
+        self._fingerprints: Dict[str, Optional[str]] = {}
+        self._pending: Dict[str, Future] = {}
+
+    def has(self, name: str) -> bool:
+        """
+        Check whether an artifact has been stored.
+
+        Args:
+            name: The artifact name
+
+        Returns:
+            True if the artifact exists
+        """
+        with self._lock:
+            return name in self._values
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """
+        Get a stored artifact.
+
+        Args:
+            name: The artifact name
+            default: Value to return if the artifact doesn't exist
+
+        Returns:
+            The artifact, or default
+        """
+        with self._lock:
+            return self._values.get(name, default)
+
+    def fingerprint(self, name: str) -> Optional[str]:
+        """
+        Get the input fingerprint an artifact was stored with.
+
+        Args:
+            name: The artifact name
+
+        Returns:
+            The fingerprint, or None if the artifact doesn't exist or has none
+        """
+        with self._lock:
+            return self._fingerprints.get(name)
+
+    def put(self, name: str, value: Any, fingerprint: Optional[str] = None):
+        """
+        Store an artifact, replacing any previous value.
+
+        Args:
+            name: The artifact name
+            value: The artifact value
+            fingerprint: Optional fingerprint of the inputs the value was computed from
+        """
+        with self._lock:
+            self._values[name] = value
+            self._fingerprints[name] = fingerprint
+        self._checkpoint(name, value, fingerprint)
+
+    def discard(self, name: str):
+        """
+        Remove an artifact, e.g. one that no longer matches the rest of the run.
+
+        Args:
+            name: The artifact name
+        """
+        with self._lock:
+            self._values.pop(name, None)
+            self._fingerprints.pop(name, None)
+        if self.directory:
+            path = os.path.join(self.directory, f"{name}.json")
+            if os.path.exists(path):
+                os.remove(path)
+
+    def _checkpoint(self, name: str, value: Any, fingerprint: Optional[str]):
+        """
+        Write an artifact to the checkpoint directory, if there is one.
+
+        Args:
+            name: The artifact name
+            value: The artifact value
+            fingerprint: Fingerprint of the inputs the value was computed from
+        """
+        if self.directory:
+            _write_json(os.path.join(self.directory, f"{name}.json"),
+                        {"fingerprint": fingerprint, "value": value})
+
+    def load(self, source: Optional[str] = None,
+             keep: Optional[Callable[[str, Optional[str]], bool]] = None) -> List[str]:
+        """
+        Load checkpointed artifacts.
+
+        Artifacts loaded from another run's directory are checkpointed again into
+        this store's directory, so the new run is self-contained.
+
+        Args:
+            source: Directory to load from (defaults to the store's own directory)
+            keep: Optional function called with each artifact's name and fingerprint;
+                artifacts for which it returns False are skipped
+
+        Returns:
+            Names of the loaded artifacts
+        """
+        source = source or self.directory
+        if not source or not os.path.isdir(source):
+            return []
+
+        loaded = {}
+        for filename in sorted(os.listdir(source)):
+            name, extension = os.path.splitext(filename)
+            if extension != ".json" or name == _MANIFEST:
+                continue
+            with open(os.path.join(source, filename), "r", encoding="utf-8") as f:
+                checkpoint = json.load(f)
+            if keep is None or keep(name, checkpoint["fingerprint"]):
+                loaded[name] = checkpoint
+
+        with self._lock:
+            for name, checkpoint in loaded.items():
+                self._values[name] = checkpoint["value"]
+                self._fingerprints[name] = checkpoint["fingerprint"]
+        if source != self.directory:
+            for name, checkpoint in loaded.items():
+                self._checkpoint(name, checkpoint["value"], checkpoint["fingerprint"])
+        return list(loaded)
+
+    def get_or_compute(self, name: str, compute: Callable[[], Any],
+                       fingerprint: Optional[str] = None) -> Any:
+        """
+        Get an artifact, computing and storing it first if it doesn't exist yet.
+
+        Args:
+            name: The artifact name
+            compute: Function that produces the artifact
+            fingerprint: Optional fingerprint of the inputs compute uses
+
+        Returns:
+            The artifact
+        """
+        with self._lock:
+            if name in self._values:
+                return self._values[name]
+            pending = self._pending.get(name)
+            owner = pending is None
+            if owner:
+                pending = self._pending[name] = Future()
+
+        if not owner:
+            return pending.result()
+
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._pending[name]
+            pending.set_exception(e)
+            raise
+
+        with self._lock:
+            self._values[name] = value
+            self._fingerprints[name] = fingerprint
+            del self._pending[name]
+        self._checkpoint(name, value, fingerprint)
+        pending.set_result(value)
+        return value
+
+    def names(self) -> List[str]:
+        """
+        List the stored artifacts.
+
+        Returns:
+            Artifact names in the order they were stored
+        """
+        with self._lock:
+            return list(self._values)
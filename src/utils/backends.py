@@ -0,0 +1,384 @@
+"""
+LLM backends for the Agentic Writer System.
+Provides interchangeable backends behind generate_text: OpenAI, any OpenAI-compatible server,
+a bundled local stand-in server, and keyword-matched mock responses.
+"""
+
+import re
+import time
+import asyncio
+from typing import Dict, Iterator, List, Optional
+
+import openai
+
+class LLMBackend:
+    """
+    Base class for LLM backends.
+
+    Attributes:
+        name: Identifier of the backend, part of every cache key
+        remote: Whether calls go over the network (and so through the rate limiter and retries)
+    """
+
+    name = "base"
+    remote = True
+
+    def complete(self, messages: List[Dict], model: str, temperature: float) -> Dict:
+        """
+        Generate a complete response.
+
+        Args:
+            messages: The chat messages to send
+            model: The model to use
+            temperature: Controls randomness (0-1)
+
+        Returns:
+            Dictionary with "text", "prompt_tokens" and "completion_tokens" (None when unknown)
+        """
+        raise NotImplementedError("Subclasses must implement the complete method")
+
+    async def acomplete(self, messages: List[Dict], model: str, temperature: float) -> Dict:
+        """
+        Generate a complete response without blocking the event loop.
+
+        Args:
+            messages: The chat messages to send
+            model: The model to use
+            temperature: Controls randomness (0-1)
+
+        Returns:
+            Dictionary with "text", "prompt_tokens" and "completion_tokens" (None when unknown)
+        """
+        return await asyncio.to_thread(self.complete, messages, model, temperature)
+
+    def stream(self, messages: List[Dict], model: str, temperature: float) -> Iterator[str]:
+        """
+        Start a streamed response.
+
+        The request is sent before this returns, so errors such as throttling are
+        raised here rather than on the first iteration.
+
+        Args:
+            messages: The chat messages to send
+            model: The model to use
+            temperature: Controls randomness (0-1)
+
+        Returns:
+            Iterator over chunks of generated text
+        """
+        raise NotImplementedError("Subclasses must implement the stream method")
+
+    def describe(self) -> Dict:
+        """
+        Describe the backend for metrics and logs.
+
+        Returns:
+            Dictionary with the backend's name and settings
+        """
+        return {"name": self.name, "remote": self.remote}
+
+class OpenAIBackend(LLMBackend):
+    """
+    Backend for the OpenAI API or any server that implements its chat completions endpoint.
+    """
+
+    def __init__(self, api_key: Optional[str], base_url: Optional[str] = None, name: str = "openai"):
+        """
+        Initialize the backend.
+
+        Args:
+            api_key: The API key to send
+            base_url: Optional base URL of an OpenAI-compatible server
+            name: Identifier of the backend
+        """
+        self.name = name
+        self.base_url = base_url
+        # Retries are handled by the LLM utilities, together with the rate limiter
+        self.client = openai.OpenAI(api_key=api_key, base_url=base_url, max_retries=0)
+        self.async_client = openai.AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=0)
+
+    def _result(self, response) -> Dict:
+        """
+        Convert a chat completion response to a result dictionary.
+
+        Args:
+            response: The chat completion response
+
+        Returns:
+            Dictionary with text and token counts
+        """
+        usage = getattr(response, "usage", None)
+        return {
+            "text": response.choices[0].message.content.strip(),
+            "prompt_tokens": usage.prompt_tokens if usage else None,
+            "completion_tokens": usage.completion_tokens if usage else None
+        }
+
+    def complete(self, messages: List[Dict], model: str, temperature: float) -> Dict:
+        response = self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+        )
+        return self._result(response)
+
+    async def acomplete(self, messages: List[Dict], model: str, temperature: float) -> Dict:
+        response = await self.async_client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+        )
+        return self._result(response)
+
+    def stream(self, messages: List[Dict], model: str, temperature: float) -> Iterator[str]:
+        response = self.client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            stream=True,
+        )
+        return self._deltas(response)
+
+    def _deltas(self, response) -> Iterator[str]:
+        """
+        Extract the text deltas from a streamed response.
+
+        Args:
+            response: The streamed chat completion response
+
+        Yields:
+            Chunks of generated text
+        """
+        for event in response:
+            if not event.choices:
+                continue
+            delta = event.choices[0].delta.content
+            if delta:
+                yield delta
+
+    def describe(self) -> Dict:
+        description = super().describe()
+        description["base_url"] = self.base_url
+        return description
+
+class StandinBackend(OpenAIBackend):
+    """
+    Backend that talks to the bundled stand-in server, starting one in-process if needed.
+
+    The stand-in speaks the OpenAI protocol, so requests take the same path as real
+    ones (rate limiter, retries, streaming) but with configurable latency and errors.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, **server_options):
+        """
+        Initialize the backend.
+
+        Args:
+            base_url: Optional URL of an already running stand-in server
+            **server_options: Options for the in-process StandinServer when base_url is not given
+        """
+        self.server = None
+        if not base_url:
+            from src.utils.standin_server import StandinServer
+            self.server = StandinServer(**server_options)
+            self.server.start()
+            base_url = self.server.url
+        super().__init__(api_key="standin", base_url=base_url, name="standin")
+
+    def describe(self) -> Dict:
+        description = super().describe()
+        if self.server:
+            description["server"] = self.server.describe()
+        return description
+
+class MockBackend(LLMBackend):
+    """
+    Offline backend that answers with canned responses picked by prompt keywords.
+
+    Attributes:
+        latency: Simulated time per response, in seconds
+    """
+
+    name = "mock"
+    remote = False
+
+    def __init__(self, latency: float = 0.5):
+        """
+        Initialize the backend.
+
+        Args:
+            latency: Simulated time per response, in seconds
+        """
+        self.latency = latency
+
+    def complete(self, messages: List[Dict], model: str, temperature: float) -> Dict:
+        # Add a small delay to simulate API call
+        time.sleep(self.latency)
+        return {"text": mock_text(messages[-1]["content"]), "prompt_tokens": None, "completion_tokens": None}
+
+    async def acomplete(self, messages: List[Dict], model: str, temperature: float) -> Dict:
+        await asyncio.sleep(self.latency)
+        return {"text": mock_text(messages[-1]["content"]), "prompt_tokens": None, "completion_tokens": None}
+
+    def stream(self, messages: List[Dict], model: str, temperature: float) -> Iterator[str]:
+        return self._stream(messages[-1]["content"])
+
+    def _stream(self, prompt: str) -> Iterator[str]:
+        """
+        Stream a mock response word by word, spread over the simulated latency.
+
+        Args:
+            prompt: The prompt that would be sent to the API
+
+        Yields:
+            Chunks of the mock text response
+        """
+        words = re.findall(r"\S+\s*|\s+", mock_text(prompt))
+
+        # Simulate time to first token, then spread the rest over the remaining latency
+        time.sleep(self.latency * 0.2)
+        delay = self.latency * 0.8 / max(len(words), 1)
+
+        for word in words:
+            yield word
+            time.sleep(delay)
+
+    def describe(self) -> Dict:
+        description = super().describe()
+        description["latency"] = self.latency
+        return description
+
+def create_backend(kind: str, api_key: Optional[str] = None, base_url: Optional[str] = None,
+                   mock_latency: float = 0.5, standin_options: Optional[Dict] = None) -> LLMBackend:
+    """
+    Create the backend selected in the configuration.
+
+    Args:
+        kind: One of "openai", "compatible", "standin" or "mock"
+        api_key: API key for the openai and compatible backends
+        base_url: Base URL for the compatible backend (or a running stand-in server)
+        mock_latency: Simulated latency of the mock backend
+        standin_options: Options for an in-process stand-in server
+
+    Returns:
+        The backend instance
+    """
+    kind = kind.lower()
+    if kind == "openai":
+        return OpenAIBackend(api_key)
+    if kind == "compatible":
+        if not base_url:
+            raise ValueError("LLM_BASE_URL must be set for the compatible backend")
+        return OpenAIBackend(api_key or "unused", base_url=base_url, name=f"compatible:{base_url}")
+    if kind == "standin":
+        return StandinBackend(base_url, **(standin_options or {}))
+    if kind == "mock":
+        return MockBackend(mock_latency)
+    raise ValueError(f"Unknown LLM backend: {kind}")
+
+def mock_text(prompt: str) -> str:
+    """
+    Pick a canned response for a prompt based on its keywords.
+
+    Args:
+        prompt: The prompt that would be sent to the API
+
+    Returns:
+        A mock text response
+    """
+    # Simple mock responses based on prompt keywords
+    if "outline" in prompt.lower():
+        return """
+# AI Agents: The Future of Automation
+
+## Introduction
+- What are AI agents and why they matter
+- The evolution of AI from tools to agents
+
+## How AI Agents Work
+- The architecture of an AI agent
+- Decision-making capabilities
+- Learning and adaptation
+
+## Real-World Applications
+- Business process automation
+- Personal assistants
+- Creative collaborators
+
+## Challenges and Limitations
+- Current technological constraints
+- Ethical considerations
+- The human-agent relationship
+
+## The Future of AI Agents
+- Emerging trends and research
+- Predictions for the next decade
+
+## Conclusion
+- Summary of key points
+- Call to action for readers
+"""
+    elif "research" in prompt.lower():
+        return """
+AI agents are software entities that can perceive their environment, make decisions, and take actions to achieve specific goals. Unlike traditional AI systems that perform specific tasks, agents operate with some degree of autonomy and can adapt to changing circumstances.
+
+Key characteristics of AI agents include:
+1. Autonomy - They can operate without direct human intervention
+2. Reactivity - They respond to changes in their environment
+3. Proactivity - They can take initiative to achieve goals
+4. Social ability - They can interact with other agents or humans
+
+Recent developments in large language models (LLMs) have accelerated the capabilities of AI agents, enabling more sophisticated reasoning, planning, and natural language understanding.
+"""
+    elif "section" in prompt.lower():
+        # Generate a section based on the heading in the prompt
+        heading_match = re.search(r'heading "([^"]+)"', prompt)
+        heading = heading_match.group(1) if heading_match else "AI Agents"
+        
+        return f"""
+{heading} represents a significant advancement in artificial intelligence technology. Unlike traditional AI systems that are designed for specific tasks, AI agents can operate with greater autonomy and adaptability.
+
+The key difference lies in their ability to perceive their environment, make decisions based on that information, and take actions to achieve specific goals. This creates a more dynamic and responsive system that can handle complex, changing situations.
+
+Modern AI agents typically combine several technologies:
+1. Machine learning models for understanding and generating content
+2. Decision-making frameworks for choosing actions
+3. Memory systems for maintaining context and learning from past experiences
+4. Communication interfaces for interacting with humans and other systems
+
+These components work together to create systems that can assist with a wide range of tasks, from simple automation to complex creative and analytical work.
+"""
+    elif "introduction" in prompt.lower():
+        return """
+In the rapidly evolving landscape of artificial intelligence, AI agents have emerged as one of the most promising developments. These intelligent systems are transforming how we interact with technology, automating complex tasks, and augmenting human capabilities in unprecedented ways.
+
+AI agents differ from traditional software in their ability to operate autonomously, make decisions, and adapt to changing circumstances. They represent a shift from tools that require explicit instructions to assistants that can understand context, anticipate needs, and take initiative.
+
+This article explores the fascinating world of AI agents - what they are, how they work, their current applications, and the future possibilities they present. Whether you're a technology enthusiast, a business professional looking to leverage AI, or simply curious about the future of automation, understanding AI agents is essential for navigating our increasingly AI-driven world.
+"""
+    elif "conclusion" in prompt.lower():
+        return """
+As we've explored throughout this article, AI agents represent a significant evolution in how we interact with and benefit from artificial intelligence. By combining autonomy, adaptability, and specialized capabilities, these systems are transforming everything from personal productivity to enterprise operations.
+
+The journey of AI agents is just beginning. As underlying technologies like large language models, reinforcement learning, and multimodal AI continue to advance, we can expect agents to become more capable, more intuitive, and more integrated into our daily lives and work.
+
+However, this progress must be balanced with thoughtful consideration of the ethical implications, transparency requirements, and human oversight needed to ensure these systems serve humanity's best interests. The most successful implementations will likely be those that augment human capabilities rather than simply replacing them.
+
+For individuals and organizations looking to benefit from this technology, now is the time to start exploring use cases, experimenting with available tools, and developing strategies for integration. The future belongs to those who can effectively collaborate with these digital partners.
+
+AI agents may have begun as a technological innovation, but their ultimate impact will be measured by how they help us solve problems, enhance creativity, and improve the quality of our lives and work.
+"""
+    elif "improve" in prompt.lower():
+        # For review improvements, return the same text with minor modifications
+        article_match = re.search(r'ARTICLE:\s*(.*?)(?:\s*IMPROVED ARTICLE:|$)', prompt, re.DOTALL)
+        if article_match:
+            article = article_match.group(1).strip()
+            # Make some simple improvements
+            improved = article.replace("very ", "").replace("really ", "")
+            improved = improved.replace("in order to", "to")
+            improved = improved.replace(".", ".\n\n")
+            return improved
+        return "Improved version of the article with better readability, engagement, and coherence."
+    else:
+        # Generic response for other prompts
+        return f"This is a mock response for: {prompt[:50]}...\n\nIn a real environment, this would be generated by the OpenAI API with much more relevant and detailed content based on your specific prompt." 
\ No newline at end of file
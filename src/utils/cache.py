@@ -0,0 +1,447 @@
+"""
+Response cache for the Agentic Writer System.
+Provides a persistent, size-bounded LLM response cache shared by all processes on a host.
+"""
+
+import os
+import time
+import zlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+CREATE INDEX IF NOT EXISTS responses_expires_at ON responses (expires_at);
+"""
+
+# Writes between exact size checks against the database, which also pick up what
+# other processes have written since
+_SIZE_CHECK_INTERVAL = 256
+
+# Share of the byte budget eviction frees down to, so the next writes fit without another check
+_EVICTION_TARGET = 0.9
+
+# Seconds an entry's last access time may lag behind, so most hits stay read-only
+_ACCESS_UPDATE_INTERVAL = 60.0
+
+class MemoryCache:
+    """
+    In-process LRU cache that keeps values zlib-compressed within a byte budget.
+
+    Each entry remembers a variant tag supplied by whoever stored it (e.g. a digest of
+    the prompt before normalization), so hits for a different variant of the same key
+    can be counted separately.
+
+    Attributes:
+        max_bytes: Budget for the compressed values (0 disables the limit)
+    """
+
+    def __init__(self, max_bytes: int = 0):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_bytes: Budget for the compressed values (0 disables the limit)
+        """
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # key -> (compressed value, raw size, expires_at, variant)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._raw_bytes = 0
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "variant_hits": 0}
+
+    def get(self, key: str, variant: Optional[str] = None) -> Optional[str]:
+        """
+        Look up a cached value.
+
+        Args:
+            key: The cache key
+            variant: Optional variant tag of the lookup
+
+        Returns:
+            The cached value, or None on a miss or expired entry
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[2] is not None and entry[2] <= time.time():
+                self._remove(key)
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            if variant is not None and entry[3] is not None and entry[3] != variant:
+                self._stats["variant_hits"] += 1
+            data = entry[0]
+
+        return zlib.decompress(data).decode("utf-8")
+
+    def set(self, key: str, value: str, expires_at: Optional[float] = None,
+            variant: Optional[str] = None):
+        """
+        Store a value, evicting least-recently-used entries beyond the budget.
+
+        Args:
+            key: The cache key
+            value: The value to store
+            expires_at: Optional absolute expiry time
+            variant: Optional variant tag of the stored value
+        """
+        raw = value.encode("utf-8")
+        data = zlib.compress(raw)
+        if self.max_bytes and len(data) > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (data, len(raw), expires_at, variant)
+            self._bytes += len(data)
+            self._raw_bytes += len(raw)
+
+            while self.max_bytes and self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def _remove(self, key: str):
+        """
+        Drop an entry (caller must hold the lock).
+
+        Args:
+            key: The cache key
+        """
+        data, raw_size, _, _ = self._entries.pop(key)
+        self._bytes -= len(data)
+        self._raw_bytes -= raw_size
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (entry[2] is None or entry[2] > time.time())
+
+    def clear(self):
+        """
+        Remove every entry from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._raw_bytes = 0
+
+    def stats(self) -> Dict:
+        """
+        Get counters and the memory saved by compression.
+
+        Returns:
+            Dictionary with hit/miss/eviction counters and size information
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = self._bytes
+            stats["raw_bytes"] = self._raw_bytes
+            stats["max_bytes"] = self.max_bytes
+
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["bytes_saved"] = stats["raw_bytes"] - stats["bytes"]
+        stats["compression_ratio"] = stats["raw_bytes"] / stats["bytes"] if stats["bytes"] else None
+        return stats
+
+class ResponseCache:
+    """
+    SQLite-backed key/value cache for LLM responses.
+
+    The database runs in WAL mode so several processes (CLI runs, web workers)
+    can read and write the same file concurrently. Entries are evicted in
+    least-recently-used order once the total stored size exceeds the byte budget,
+    and expire individually after their TTL. Each process keeps a running total of
+    the stored size and only sums the table when that total crosses the budget or
+    every few hundred writes. Hits refresh an entry's recency at most once a
+    minute, so lookups rarely write. Recently used entries are also kept
+    compressed in process memory, so hot lookups skip the database.
+
+    Attributes:
+        path: Path to the SQLite database file
+        max_bytes: Byte budget for stored values (0 disables the limit)
+        default_ttl: Default time-to-live in seconds (None means no expiry)
+        memory: Optional in-process tier in front of the database
+    """
+
+    def __init__(self, path: str, max_bytes: int = 0, default_ttl: Optional[float] = None,
+                 memory_max_bytes: Optional[int] = None):
+        """
+        Initialize the cache, creating the database file if needed.
+
+        Args:
+            path: Path to the SQLite database file
+            max_bytes: Byte budget for stored values (0 disables the limit)
+            default_ttl: Default time-to-live in seconds (None means no expiry)
+            memory_max_bytes: Optional budget for the compressed in-process tier
+                (None disables the tier)
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.memory = MemoryCache(memory_max_bytes) if memory_max_bytes is not None else None
+
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "writes": 0}
+
+        # Running estimate of the stored size (None until first checked), and writes since the last check
+        self._size_lock = threading.Lock()
+        self._estimated_bytes = None
+        self._writes_since_check = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._connection()
+        conn.executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Get the SQLite connection for the current thread.
+
+        Returns:
+            A connection dedicated to the calling thread
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name: str, amount: int = 1):
+        """
+        Increment one of the cache counters.
+
+        Args:
+            name: The counter name
+            amount: How much to add
+        """
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    def get(self, key: str, variant: Optional[str] = None) -> Optional[str]:
+        """
+        Look up a cached value, in memory first and then in the database.
+
+        Args:
+            key: The cache key
+            variant: Optional variant tag of the lookup (see MemoryCache)
+
+        Returns:
+            The cached value, or None on a miss or expired entry
+        """
+        if self.memory is not None:
+            value = self.memory.get(key, variant)
+            if value is not None:
+                self._count("hits")
+                return value
+
+        conn = self._connection()
+        now = time.time()
+        row = conn.execute(
+            "SELECT value, expires_at, last_access FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+
+        if row is None:
+            self._count("misses")
+            return None
+
+        value, expires_at, last_access = row
+        if expires_at is not None and expires_at <= now:
+            conn.execute("DELETE FROM responses WHERE key = ? AND expires_at <= ?", (key, now))
+            self._count("expirations")
+            self._count("misses")
+            return None
+
+        # Recency only needs to be coarse for LRU eviction; skipping the write keeps
+        # lookups from contending with other processes for the database lock
+        if now - last_access >= _ACCESS_UPDATE_INTERVAL:
+            conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+        self._count("hits")
+        if self.memory is not None:
+            self.memory.set(key, value, expires_at)
+        return value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None, variant: Optional[str] = None):
+        """
+        Store a value, evicting old entries if the byte budget is exceeded.
+
+        Args:
+            key: The cache key
+            value: The value to store
+            ttl: Optional time-to-live in seconds (defaults to default_ttl)
+            variant: Optional variant tag of the value (see MemoryCache)
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        size = len(value.encode("utf-8"))
+
+        if self.memory is not None:
+            self.memory.set(key, value, expires_at, variant)
+
+        # Never store a single value that could not fit in the budget
+        if self.max_bytes and size > self.max_bytes:
+            return
+
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, value, size, created_at, expires_at, last_access) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (key, value, size, now, expires_at, now)
+        )
+        self._count("writes")
+
+        if self._needs_check(size) and self.max_bytes:
+            self._evict(conn)
+
+    def _needs_check(self, size: int) -> bool:
+        """
+        Add a write to the running size estimate and decide whether to check the real size.
+
+        Replacing an existing key counts its size twice, which only brings the check forward.
+
+        Args:
+            size: Size of the value just written
+
+        Returns:
+            True if the estimate is over budget, unknown or due for a recheck
+        """
+        with self._size_lock:
+            self._writes_since_check += 1
+            if self._estimated_bytes is None:
+                return True
+            self._estimated_bytes += size
+            return (self._estimated_bytes > self.max_bytes
+                    or self._writes_since_check >= _SIZE_CHECK_INTERVAL)
+
+    def _evict(self, conn: sqlite3.Connection):
+        """
+        Drop expired entries, then least-recently-used entries until well under budget
+        (see _EVICTION_TARGET), and reset the running size estimate to the real total.
+
+        Args:
+            conn: The connection to use
+        """
+        now = time.time()
+        expired = conn.execute(
+            "DELETE FROM responses WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,)
+        ).rowcount
+        if expired:
+            self._count("expirations", expired)
+
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            self._checked(total)
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            evicted = 0
+            target = int(self.max_bytes * _EVICTION_TARGET)
+            for key, size in conn.execute(
+                "SELECT key, size FROM responses ORDER BY last_access ASC"
+            ).fetchall():
+                if total <= target:
+                    break
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                total -= size
+                evicted += 1
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+        self._checked(total)
+        if evicted:
+            self._count("evictions", evicted)
+
+    def _checked(self, total: int):
+        """
+        Restart the running size estimate from a total read from the database.
+
+        Args:
+            total: The stored size
+        """
+        with self._size_lock:
+            self._estimated_bytes = total
+            self._writes_since_check = 0
+
+    def __contains__(self, key: str) -> bool:
+        """
+        Check whether a live entry exists without touching counters or recency.
+
+        Args:
+            key: The cache key
+
+        Returns:
+            True if the key is cached and not expired
+        """
+        if self.memory is not None and key in self.memory:
+            return True
+        row = self._connection().execute(
+            "SELECT 1 FROM responses WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (key, time.time())
+        ).fetchone()
+        return row is not None
+
+    def clear(self):
+        """
+        Remove every entry from the cache.
+        """
+        if self.memory is not None:
+            self.memory.clear()
+        self._connection().execute("DELETE FROM responses")
+        self._checked(0)
+
+    def stats(self) -> Dict:
+        """
+        Get cache counters and current usage.
+
+        Counters are per process; the entry count reflects the shared database. The byte
+        total is the running size estimate, which catches up with other processes' writes
+        at the next size check.
+
+        Returns:
+            Dictionary with hit/miss/eviction counters and size information
+        """
+        conn = self._connection()
+        entries = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        with self._size_lock:
+            total = self._estimated_bytes
+        if total is None:
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            self._checked(total)
+
+        with self._stats_lock:
+            stats = dict(self._stats)
+
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["entries"] = entries
+        stats["bytes"] = total
+        stats["max_bytes"] = self.max_bytes
+        if self.memory is not None:
+            stats["memory"] = self.memory.stats()
+        return stats
@@ -0,0 +1,476 @@
+"""
+Article catalog for the Agentic Writer System.
+Indexes saved articles' metadata in SQLite so listings and lookups don't parse every metadata file.
+"""
+
+import os
+import json
+import time
+import base64
+import hashlib
+import sqlite3
+import threading
+from typing import Dict, List, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    metadata_file TEXT PRIMARY KEY,
+    article_id TEXT NOT NULL,
+    article_file TEXT NOT NULL,
+    topic TEXT NOT NULL,
+    title TEXT,
+    style TEXT,
+    platform TEXT,
+    timestamp TEXT NOT NULL,
+    word_count INTEGER,
+    run_id TEXT,
+    description TEXT,
+    content_hash TEXT,
+    article_mtime REAL
+);
+CREATE INDEX IF NOT EXISTS articles_id ON articles (article_id);
+CREATE INDEX IF NOT EXISTS articles_timestamp ON articles (timestamp, metadata_file);
+CREATE INDEX IF NOT EXISTS articles_topic_order ON articles (topic, metadata_file);
+CREATE INDEX IF NOT EXISTS articles_topic_prefix ON articles (topic COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS articles_platform_order ON articles (platform COLLATE NOCASE, timestamp, metadata_file);
+CREATE INDEX IF NOT EXISTS articles_style_order ON articles (style COLLATE NOCASE, timestamp, metadata_file);
+CREATE TABLE IF NOT EXISTS catalog_state (
+    key TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+"""
+
+# Columns articles can be sorted by (ties are broken by metadata file name)
+SORT_KEYS = ("timestamp", "topic")
+
+_COLUMNS = ("metadata_file", "article_id", "article_file", "topic", "title", "style", "platform", "timestamp", "word_count",
+            "run_id", "description", "content_hash", "article_mtime")
+
+# Bumped when the schema changes; an older catalog is dropped and rebuilt from the files
+_SCHEMA_VERSION = 3
+
+def _like_prefix(text: str) -> str:
+    """
+    Build a LIKE pattern matching values that start with some text.
+
+    Args:
+        text: The prefix
+
+    Returns:
+        The pattern, with LIKE wildcards in the text escaped by a backslash
+    """
+    for char in ("\\", "%", "_"):
+        text = text.replace(char, "\\" + char)
+    return text + "%"
+
+def article_id(metadata_file: str) -> str:
+    """
+    Derive an article's stable ID from its metadata file name (unique per saved article).
+
+    Args:
+        metadata_file: Name of the article's metadata file
+
+    Returns:
+        The article ID
+    """
+    stem = os.path.splitext(os.path.basename(metadata_file))[0]
+    return hashlib.sha256(stem.encode("utf-8")).hexdigest()[:12]
+
+class ArticleCatalog:
+    """
+    SQLite index of the article metadata files in a directory.
+
+    The metadata files stay the source of truth. save_article adds each new
+    article to the catalog as it writes it; files added or removed some other way
+    are picked up the next time the catalog is read, by comparing file names
+    (without parsing them) whenever the directory has changed. A missing or
+    empty catalog is rebuilt from the files.
+
+    Attributes:
+        path: Path to the SQLite database file
+        metadata_dir: Directory of the metadata files
+    """
+
+    def __init__(self, path: str, metadata_dir: str):
+        """
+        Initialize the catalog, creating and filling the database if needed.
+
+        Args:
+            path: Path to the SQLite database file
+            metadata_dir: Directory of the metadata files
+        """
+        self.path = path
+        self.metadata_dir = metadata_dir
+        self._local = threading.local()
+        self._sync_lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = self._connection()
+        conn.executescript(_SCHEMA)
+        if self._state(conn, "schema_version") != _SCHEMA_VERSION:
+            conn.executescript("DROP TABLE articles; DROP TABLE catalog_state;" + _SCHEMA)
+            self._set_state(conn, "schema_version", _SCHEMA_VERSION)
+            self.rebuild()
+        elif conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0] == 0:
+            self.rebuild()
+
+    def _connection(self) -> sqlite3.Connection:
+        """
+        Get the SQLite connection for the current thread.
+
+        Returns:
+            A connection dedicated to the calling thread
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def _read_metadata(self, metadata_file: str) -> Optional[Dict]:
+        """
+        Read a metadata file into a catalog row.
+
+        Args:
+            metadata_file: Name of the file in the metadata directory
+
+        Returns:
+            The row, or None if the file can't be read
+        """
+        try:
+            with open(os.path.join(self.metadata_dir, metadata_file), "r", encoding="utf-8") as f:
+                metadata = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Error reading metadata file {metadata_file}: {e}")
+            return None
+        return self._row(metadata_file, metadata)
+
+    def _row(self, metadata_file: str, metadata: Dict, content_hash: Optional[str] = None,
+             article_mtime: Optional[float] = None) -> Dict:
+        """
+        Pick the catalogued fields out of an article's metadata.
+
+        Args:
+            metadata_file: Name of the metadata file
+            metadata: The article metadata
+            content_hash: Optional hash of the article text
+            article_mtime: Optional modification time of the article file the hash was taken from
+
+        Returns:
+            The catalog row
+        """
+        return {
+            "metadata_file": metadata_file,
+            # Articles saved before IDs existed get the same ID save_article would have given them
+            "article_id": metadata.get("article_id") or article_id(metadata_file),
+            "article_file": metadata.get("article_file", ""),
+            "topic": metadata.get("topic", "Unknown"),
+            "title": metadata.get("title"),
+            "style": metadata.get("style"),
+            "platform": metadata.get("platform", "None"),
+            "timestamp": metadata.get("timestamp", "Unknown"),
+            "word_count": metadata.get("word_count"),
+            "run_id": metadata.get("run_id"),
+            "description": metadata.get("description", ""),
+            "content_hash": content_hash,
+            "article_mtime": article_mtime
+        }
+
+    def _write(self, conn: sqlite3.Connection, rows: List[Dict], removed: List[str] = ()):
+        """
+        Insert or update rows and delete others in one transaction, recording the write time.
+
+        A row without a content hash keeps the one already recorded for the article.
+
+        Args:
+            conn: The connection to use
+            rows: Rows to insert or replace
+            removed: Metadata file names to delete
+        """
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            updates = [
+                f"{column} = COALESCE(excluded.{column}, {column})" if column in ("content_hash", "article_mtime")
+                else f"{column} = excluded.{column}"
+                for column in _COLUMNS[1:]
+            ]
+            conn.executemany(
+                f"INSERT INTO articles ({', '.join(_COLUMNS)}) "
+                f"VALUES ({', '.join('?' for _ in _COLUMNS)}) "
+                f"ON CONFLICT (metadata_file) DO UPDATE SET {', '.join(updates)}",
+                [tuple(row[column] for column in _COLUMNS) for row in rows]
+            )
+            conn.executemany("DELETE FROM articles WHERE metadata_file = ?", [(name,) for name in removed])
+            conn.execute("INSERT OR REPLACE INTO catalog_state (key, value) VALUES ('last_write', ?)", (time.time(),))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def add(self, metadata_file: str, metadata: Dict, content_hash: Optional[str] = None,
+            article_mtime: Optional[float] = None):
+        """
+        Add or update one article.
+
+        Args:
+            metadata_file: Name of the article's metadata file
+            metadata: The article metadata
+            content_hash: Optional hash of the article text
+            article_mtime: Optional modification time of the article file the hash was taken from
+        """
+        self._write(self._connection(), [self._row(metadata_file, metadata, content_hash, article_mtime)])
+
+    def get(self, metadata_file: str) -> Optional[Dict]:
+        """
+        Look up one article.
+
+        Args:
+            metadata_file: Name of the article's metadata file
+
+        Returns:
+            The catalog row, or None if the article isn't catalogued
+        """
+        row = self._connection().execute(
+            "SELECT * FROM articles WHERE metadata_file = ?", (metadata_file,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def get_by_id(self, article_id: str) -> Optional[Dict]:
+        """
+        Look up one article by its ID.
+
+        Args:
+            article_id: The article ID
+
+        Returns:
+            The catalog row, or None if there is no such article
+        """
+        self.sync()
+        row = self._connection().execute(
+            "SELECT * FROM articles WHERE article_id = ?", (article_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def set_content_hash(self, metadata_file: str, content_hash: str, article_mtime: float):
+        """
+        Record the hash of an article's text (not a listing change, so the last write time stays).
+
+        Args:
+            metadata_file: Name of the article's metadata file
+            content_hash: Hash of the article text
+            article_mtime: Modification time of the article file the hash was taken from
+        """
+        self._connection().execute(
+            "UPDATE articles SET content_hash = ?, article_mtime = ? WHERE metadata_file = ?",
+            (content_hash, article_mtime, metadata_file)
+        )
+
+    def rebuild(self) -> int:
+        """
+        Rebuild the catalog from the metadata files.
+
+        Returns:
+            Number of articles catalogued
+        """
+        files = self._metadata_files()
+        rows = [row for row in (self._read_metadata(name) for name in files) if row]
+        conn = self._connection()
+        known = [row["metadata_file"] for row in conn.execute("SELECT metadata_file FROM articles")]
+        self._write(conn, rows, [name for name in known if name not in files])
+        self._set_state(conn, "scanned_mtime", self._directory_mtime())
+        return len(rows)
+
+    def _metadata_files(self) -> set:
+        """
+        List the metadata file names on disk.
+
+        Returns:
+            Set of file names
+        """
+        return {name for name in os.listdir(self.metadata_dir) if name.endswith(".json")}
+
+    def _directory_mtime(self) -> float:
+        """
+        Get the modification time of the metadata directory (it changes when files are added or removed).
+
+        Returns:
+            The modification time
+        """
+        return os.stat(self.metadata_dir).st_mtime
+
+    def _state(self, conn: sqlite3.Connection, key: str) -> Optional[float]:
+        """
+        Read a catalog state value.
+
+        Args:
+            conn: The connection to use
+            key: The state key
+
+        Returns:
+            The value, or None if it isn't set
+        """
+        row = conn.execute("SELECT value FROM catalog_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_state(self, conn: sqlite3.Connection, key: str, value: float):
+        """
+        Write a catalog state value.
+
+        Args:
+            conn: The connection to use
+            key: The state key
+            value: The value
+        """
+        conn.execute("INSERT OR REPLACE INTO catalog_state (key, value) VALUES (?, ?)", (key, value))
+
+    def sync(self):
+        """
+        Catch up with metadata files added or removed outside save_article.
+
+        Does nothing unless the directory changed since the last sync; otherwise
+        only the new files are parsed.
+        """
+        conn = self._connection()
+        mtime = self._directory_mtime()
+        if self._state(conn, "scanned_mtime") == mtime:
+            return
+
+        with self._sync_lock:
+            files = self._metadata_files()
+            known = {row["metadata_file"] for row in conn.execute("SELECT metadata_file FROM articles")}
+            added = [row for row in (self._read_metadata(name) for name in files - known) if row]
+            removed = list(known - files)
+            if added or removed:
+                self._write(conn, added, removed)
+            self._set_state(conn, "scanned_mtime", mtime)
+
+    def list(self, topic: str = None, platform: str = None, style: str = None,
+             limit: Optional[int] = None, sort: str = "timestamp", descending: bool = True,
+             after: Optional[List] = None) -> List[Dict]:
+        """
+        List articles, newest first by default, optionally filtered.
+
+        Args:
+            topic: Optional text the topic must start with (case-insensitive)
+            platform: Optional platform to filter by (case-insensitive)
+            style: Optional style to filter by (case-insensitive)
+            limit: Optional maximum number of articles
+            sort: Column to sort by, one of SORT_KEYS
+            descending: Whether to sort in descending order
+            after: Optional [sort value, metadata file] of the article to continue after
+
+        Returns:
+            List of catalog rows
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Can't sort by {sort}; use one of {', '.join(SORT_KEYS)}")
+
+        self.sync()
+        clauses, params = [], []
+        if topic:
+            # A prefix pattern, so SQLite can search the NOCASE topic index instead of scanning
+            clauses.append("topic LIKE ? ESCAPE '\\'")
+            params.append(_like_prefix(topic))
+        if platform:
+            clauses.append("platform = ? COLLATE NOCASE")
+            params.append(platform)
+        if style:
+            clauses.append("style = ? COLLATE NOCASE")
+            params.append(style)
+        if after:
+            # Keyset pagination: seek past the last row seen instead of skipping rows
+            clauses.append(f"({sort}, metadata_file) {'<' if descending else '>'} (?, ?)")
+            params.extend(after)
+
+        direction = "DESC" if descending else "ASC"
+        query = "SELECT * FROM articles"
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += f" ORDER BY {sort} {direction}, metadata_file {direction}"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self._connection().execute(query, params)]
+
+    def page(self, limit: int, cursor: Optional[str] = None, sort: str = "timestamp",
+             descending: bool = True, **filters) -> Dict:
+        """
+        Get one page of articles.
+
+        Args:
+            limit: Number of articles per page
+            cursor: Optional cursor returned with the previous page
+            sort: Column to sort by, one of SORT_KEYS
+            descending: Whether to sort in descending order
+            **filters: topic, platform and style filters as in list()
+
+        Returns:
+            Dictionary with the "articles" and the "next_cursor" (None on the last page)
+        """
+        after = self._decode_cursor(cursor) if cursor else None
+        rows = self.list(limit=limit + 1, sort=sort, descending=descending, after=after, **filters)
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = self._encode_cursor([rows[-1][sort], rows[-1]["metadata_file"]])
+        return {"articles": rows, "next_cursor": next_cursor}
+
+    def _encode_cursor(self, position: List) -> str:
+        """
+        Encode a position in a listing as an opaque cursor.
+
+        Args:
+            position: [sort value, metadata file] of the last article on a page
+
+        Returns:
+            The cursor
+        """
+        return base64.urlsafe_b64encode(json.dumps(position).encode("utf-8")).decode("ascii").rstrip("=")
+
+    def _decode_cursor(self, cursor: str) -> List:
+        """
+        Decode a cursor returned by page().
+
+        Args:
+            cursor: The cursor
+
+        Returns:
+            [sort value, metadata file]
+        """
+        try:
+            position = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        except ValueError:
+            raise ValueError("Invalid cursor")
+        if not isinstance(position, list) or len(position) != 2:
+            raise ValueError("Invalid cursor")
+        value, metadata_file = position
+        # bool is an int, but no sort column holds one
+        if isinstance(value, bool) or not isinstance(value, (str, int, float)) or not isinstance(metadata_file, str):
+            raise ValueError("Invalid cursor")
+        return position
+
+    def latest(self, **filters) -> Optional[Dict]:
+        """
+        Get the newest article, optionally filtered as in list().
+
+        Returns:
+            The catalog row, or None if there are no articles
+        """
+        articles = self.list(limit=1, **filters)
+        return articles[0] if articles else None
+
+    def last_modified(self) -> Optional[float]:
+        """
+        Get the time of the catalog's last write.
+
+        Returns:
+            The time, or None if it was never written
+        """
+        self.sync()
+        return self._state(self._connection(), "last_write")
@@ -0,0 +1,224 @@
+"""
+Concurrency utilities for the Agentic Writer System.
+Provides a limiter that caps in-flight work across threads and event loops alike, and a context-keeping parallel map.
+"""
+
+import asyncio
+import threading
+import contextvars
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, List, Optional, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+def map_in_context(func: Callable[[T], R], items: Iterable[T], max_workers: int,
+                   on_result: Optional[Callable[[int, R], None]] = None) -> List[R]:
+    """
+    Apply a function to items on a thread pool, keeping the caller's context.
+
+    Each call runs in a copy of the caller's context, so context variables such as
+    the LLM metrics attribution carry over to the workers.
+
+    Args:
+        func: Function to apply
+        items: The items
+        max_workers: Maximum number of calls running at once
+        on_result: Optional function called in the caller's thread with the index and
+            result of each item as it finishes
+
+    Returns:
+        The results, in the order of the items
+    """
+    items = list(items)
+    if not items:
+        return []
+    results = [None] * len(items)
+    with ThreadPoolExecutor(max_workers=max(1, min(len(items), max_workers))) as executor:
+        futures = {executor.submit(contextvars.copy_context().run, func, item): i for i, item in enumerate(items)}
+        for future in as_completed(futures):
+            i = futures[future]
+            results[i] = future.result()
+            if on_result:
+                on_result(i, results[i])
+    return results
+
+class ConcurrencyLimiter:
+    """
+    Counting semaphore shared by threads and asyncio tasks in one process.
+
+    A plain asyncio.Semaphore is bound to a single event loop and a
+    threading.Semaphore would block the loop, so this limiter keeps one
+    counter under a lock and hands freed slots directly to the next waiter,
+    waking threads through an Event and tasks through their own loop.
+
+    A limiter can also share a cross-process semaphore (see share), so several
+    worker processes stay under one host-wide cap as well as their own limit.
+
+    Attributes:
+        limit: Maximum number of concurrent holders
+        shared: Optional multiprocessing semaphore held in addition to a local slot
+    """
+
+    def __init__(self, limit: int):
+        """
+        Initialize the limiter.
+
+        Args:
+            limit: Maximum number of concurrent holders
+        """
+        self.limit = max(1, limit)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._waiters = deque()
+        self._peak = 0
+        self.shared = None
+
+    def share(self, semaphore):
+        """
+        Also hold a slot of a cross-process semaphore while a local slot is held.
+
+        Args:
+            semaphore: A multiprocessing semaphore created by the parent process (None to stop sharing)
+        """
+        self.shared = semaphore
+
+    def _try_acquire(self) -> bool:
+        """
+        Take a free slot if one is available (caller must hold the lock).
+
+        Returns:
+            True if a slot was taken
+        """
+        if self._in_flight < self.limit and not self._waiters:
+            self._in_flight += 1
+            self._peak = max(self._peak, self._in_flight)
+            return True
+        return False
+
+    def acquire(self):
+        """
+        Block the calling thread until a slot is available.
+        """
+        self._acquire_slot()
+        if self.shared is not None:
+            self.shared.acquire()
+
+    def _acquire_slot(self):
+        """
+        Block the calling thread until a local slot is available.
+        """
+        with self._lock:
+            if self._try_acquire():
+                return
+            event = threading.Event()
+            self._waiters.append((None, event))
+        event.wait()
+
+    async def acquire_async(self):
+        """
+        Wait without blocking the event loop until a slot is available.
+        """
+        await self._acquire_slot_async()
+        if self.shared is None:
+            return
+        try:
+            # A multiprocessing semaphore can't be awaited, so poll it
+            while not self.shared.acquire(block=False):
+                await asyncio.sleep(0.01)
+        except asyncio.CancelledError:
+            self._release_slot()
+            raise
+
+    async def _acquire_slot_async(self):
+        """
+        Wait without blocking the event loop until a local slot is available.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._try_acquire():
+                return
+            future = loop.create_future()
+            waiter = (loop, future)
+            self._waiters.append(waiter)
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                try:
+                    self._waiters.remove(waiter)
+                    removed = True
+                except ValueError:
+                    removed = False
+            # The slot was already handed to us, so pass it on
+            if not removed and future.done() and not future.cancelled():
+                self._release_slot()
+            raise
+
+    def release(self):
+        """
+        Release a slot, handing it to the oldest waiter if there is one.
+        """
+        if self.shared is not None:
+            self.shared.release()
+        self._release_slot()
+
+    def _release_slot(self):
+        """
+        Release a local slot, handing it to the oldest waiter if there is one.
+        """
+        with self._lock:
+            while self._waiters:
+                loop, waiter = self._waiters.popleft()
+                if loop is None:
+                    waiter.set()
+                    return
+                if not loop.is_closed():
+                    loop.call_soon_threadsafe(self._wake, waiter)
+                    return
+            self._in_flight -= 1
+
+    def _wake(self, future: asyncio.Future):
+        """
+        Resolve a task's waiter on its own loop.
+
+        Args:
+            future: The future the waiting task is awaiting
+        """
+        if future.cancelled():
+            # The task gave up after the slot was handed over
+            self._release_slot()
+        elif not future.done():
+            future.set_result(None)
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+    async def __aenter__(self):
+        await self.acquire_async()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
+
+    def stats(self) -> Dict:
+        """
+        Get current usage of the limiter.
+
+        Returns:
+            Dictionary with limit, in-flight, waiting and peak counts
+        """
+        with self._lock:
+            return {
+                "limit": self.limit,
+                "in_flight": self._in_flight,
+                "waiting": len(self._waiters),
+                "peak": self._peak,
+                "shared": self.shared is not None
+            }
@@ -18,17 +18,131 @@ USE_REAL_API = bool(OPENAI_API_KEY)
 USE_REAL_SEARCH = bool(SERPER_API_KEY)
 
 # File paths
-ARTICLES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "articles")
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+ARTICLES_DIR = os.path.join(PROJECT_DIR, "articles")
 METADATA_DIR = os.path.join(ARTICLES_DIR, "metadata")
+RUNS_DIR = os.path.join(ARTICLES_DIR, "runs")
+BATCHES_DIR = os.path.join(ARTICLES_DIR, "batches")
+CACHE_DIR = os.getenv("CACHE_DIR", os.path.join(PROJECT_DIR, ".cache"))
+
+# SQLite index of the saved articles (rebuilt from the metadata files if missing)
+CATALOG_PATH = os.getenv("CATALOG_PATH", os.path.join(ARTICLES_DIR, "catalog.sqlite3"))
+
+# Rendered article HTML, kept on disk and (compressed) in memory
+RENDER_CACHE_DIR = os.path.join(CACHE_DIR, "rendered")
+RENDER_MEMORY_CACHE_MAX_BYTES = int(os.getenv("RENDER_MEMORY_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+# Article listings: default and maximum number of articles per page
+ARTICLES_PAGE_SIZE = int(os.getenv("ARTICLES_PAGE_SIZE", "20"))
+ARTICLES_MAX_PAGE_SIZE = int(os.getenv("ARTICLES_MAX_PAGE_SIZE", "100"))
 
 # Ensure directories exist
 os.makedirs(ARTICLES_DIR, exist_ok=True)
 os.makedirs(METADATA_DIR, exist_ok=True)
+os.makedirs(RUNS_DIR, exist_ok=True)
+os.makedirs(CACHE_DIR, exist_ok=True)
+
+# LLM response cache (shared by all processes on this host)
+LLM_CACHE_PATH = os.path.join(CACHE_DIR, "llm_responses.sqlite3")
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+# Compressed in-process tier in front of the response cache (0 disables it)
+LLM_MEMORY_CACHE_MAX_BYTES = int(os.getenv("LLM_MEMORY_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+# Canonicalize the whitespace of prompt templates before hashing and sending
+LLM_NORMALIZE_PROMPTS = os.getenv("LLM_NORMALIZE_PROMPTS", "1").lower() not in ("0", "false", "no")
 
 # Model settings
 DEFAULT_MODEL = "gpt-4"
 FALLBACK_MODEL = "gpt-3.5-turbo"
 
+# Model tiers, cheapest first
+MODEL_TIERS = {
+    "fast": FALLBACK_MODEL,
+    "default": DEFAULT_MODEL
+}
+MODEL_TIER_ORDER = ["fast", "default"]
+
+# Which tier each agent task runs on. Tasks with "cascade" start on their tier and
+# escalate to the next one only when the response fails the caller's validator.
+MODEL_ROUTES = {
+    "research.subtopics": {"tier": "fast"},
+    "planner.outline": {"tier": "fast", "cascade": True},
+    "writer.article": {"tier": "default"},
+    "writer.section": {"tier": "default"},
+    "writer.introduction": {"tier": "default"},
+    "writer.conclusion": {"tier": "default"},
+    "reviewer.improve": {"tier": "default"},
+    "reviewer.summary": {"tier": "fast", "cascade": True},
+    "humanizer.humanize": {"tier": "default"},
+    "editor.edit": {"tier": "default"}
+}
+MODEL_CASCADE_ENABLED = os.getenv("MODEL_CASCADE_ENABLED", "1").lower() not in ("0", "false", "no")
+
+# Checkpoint each phase's output under RUNS_DIR so interrupted runs can be resumed
+CHECKPOINTS_ENABLED = os.getenv("CHECKPOINTS_ENABLED", "1").lower() not in ("0", "false", "no")
+
+# Maximum number of pipeline steps running at once within one article run
+PIPELINE_MAX_WORKERS = int(os.getenv("PIPELINE_MAX_WORKERS", "4"))
+
+# How WriterAgent drafts articles: "full" (one request for the whole article) or
+# "sections" (introduction, each section and conclusion written concurrently)
+WRITER_MODE = os.getenv("WRITER_MODE", "full")
+WRITER_PARALLELISM = int(os.getenv("WRITER_PARALLELISM", "8"))
+
+# How the review and humanizing passes process articles: "full" (the whole article in
+# one request) or "sections" (each "##" section separately, concurrently)
+REVIEW_MODE = os.getenv("REVIEW_MODE", "full")
+REVIEW_PARALLELISM = int(os.getenv("REVIEW_PARALLELISM", "8"))
+
+# Whether review and humanizing run as two passes ("separate") or as one combined
+# EditorAgent pass ("fused"). Styles and platforms listed (comma-separated) in
+# FUSED_EDIT_STYLES / FUSED_EDIT_PLATFORMS always use the fused pass.
+EDIT_MODE = os.getenv("EDIT_MODE", "separate")
+FUSED_EDIT_STYLES = [s.strip() for s in os.getenv("FUSED_EDIT_STYLES", "").split(",") if s.strip()]
+FUSED_EDIT_PLATFORMS = [p.strip() for p in os.getenv("FUSED_EDIT_PLATFORMS", "").split(",") if p.strip()]
+
+# Maximum number of LLM requests in flight at once within a process
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+
+# Batch runs: worker processes, and the cap on LLM requests in flight across all of them
+BATCH_WORKERS = int(os.getenv("BATCH_WORKERS", "4"))
+BATCH_LLM_CONCURRENCY = int(os.getenv("BATCH_LLM_CONCURRENCY", str(LLM_MAX_CONCURRENCY)))
+
+# Web app: articles generated at once in the background, and how many more may wait
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_QUEUE_LIMIT = int(os.getenv("JOB_QUEUE_LIMIT", "32"))
+
+# Client-side rate limits (match these to the account's quota; 0 disables a limit)
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "500"))
+LLM_TOKENS_PER_MINUTE = float(os.getenv("LLM_TOKENS_PER_MINUTE", "40000"))
+LLM_EXPECTED_COMPLETION_TOKENS = int(os.getenv("LLM_EXPECTED_COMPLETION_TOKENS", "1000"))
+
+# Retries for throttled and transient API errors
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "1.0"))
+LLM_RETRY_MAX_DELAY = float(os.getenv("LLM_RETRY_MAX_DELAY", "60.0"))
+
+# Fall back to mock responses when the API keeps failing (development only)
+LLM_MOCK_FALLBACK = os.getenv("LLM_MOCK_FALLBACK", "").lower() in ("1", "true", "yes")
+
+# LLM backend: "openai", "compatible" (any OpenAI-compatible server at LLM_BASE_URL),
+# "standin" (the bundled local stand-in server) or "mock"
+LLM_BACKEND = os.getenv("LLM_BACKEND", "openai" if USE_REAL_API else "mock")
+LLM_BASE_URL = os.getenv("LLM_BASE_URL")
+
+# Simulated latency of a mock response, in seconds
+MOCK_LATENCY = float(os.getenv("MOCK_LATENCY", "0.5"))
+
+# Behaviour of the in-process stand-in server (used when LLM_BACKEND=standin without LLM_BASE_URL)
+STANDIN_LATENCY_MEDIAN = float(os.getenv("STANDIN_LATENCY_MEDIAN", "0.8"))
+STANDIN_LATENCY_SIGMA = float(os.getenv("STANDIN_LATENCY_SIGMA", "0.5"))
+STANDIN_TOKENS_PER_SECOND = float(os.getenv("STANDIN_TOKENS_PER_SECOND", "50"))
+STANDIN_ERROR_RATE = float(os.getenv("STANDIN_ERROR_RATE", "0"))
+STANDIN_THROTTLE_RATE = float(os.getenv("STANDIN_THROTTLE_RATE", "0"))
+STANDIN_SEED = int(os.getenv("STANDIN_SEED", "0"))
+
 # Writing styles
 WRITING_STYLES = {
     "conversational": "Friendly and casual, like talking to a friend",
@@ -0,0 +1,187 @@
+"""
+Task graph scheduler for the Agentic Writer System.
+Runs pipeline steps as a dependency graph, starting independent steps concurrently.
+"""
+
+import time
+import contextvars
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+class DAGNode:
+    """
+    One step of a task graph.
+
+    Attributes:
+        name: Unique name of the step
+        func: Function called with the results of the dependencies, keyed by name
+        deps: Names of the steps that must finish first
+        start: When the step started (None until it runs)
+        end: When the step finished (None until it finishes)
+        result: The value returned by func
+    """
+
+    def __init__(self, name: str, func: Callable[[Dict[str, Any]], Any], deps: Iterable[str] = ()):
+        """
+        Initialize the node.
+
+        Args:
+            name: Unique name of the step
+            func: Function called with the results of the dependencies, keyed by name
+            deps: Names of the steps that must finish first
+        """
+        self.name = name
+        self.func = func
+        self.deps = list(deps)
+        self.start = None
+        self.end = None
+        self.result = None
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Wall time of the step in seconds, or None if it hasn't finished."""
+        if self.start is None or self.end is None:
+            return None
+        return self.end - self.start
+
+class DAGScheduler:
+    """
+    Runs a graph of steps on a bounded thread pool.
+
+    A step starts as soon as all of its dependencies have finished, so independent
+    steps overlap. Each step runs in a copy of the caller's context, keeping context
+    variables such as the LLM metrics attribution. If a step fails, no new steps are
+    started and the error is raised once the running ones have finished.
+
+    Attributes:
+        max_workers: Maximum number of steps running at once
+    """
+
+    def __init__(self, max_workers: int = 4):
+        """
+        Initialize an empty graph.
+
+        Args:
+            max_workers: Maximum number of steps running at once
+        """
+        self.max_workers = max(1, max_workers)
+        self.nodes: Dict[str, DAGNode] = {}
+        self.start = None
+        self.end = None
+
+    def add(self, name: str, func: Callable[[Dict[str, Any]], Any], deps: Iterable[str] = ()) -> DAGNode:
+        """
+        Add a step to the graph.
+
+        Args:
+            name: Unique name of the step
+            func: Function called with the results of the dependencies, keyed by name
+            deps: Names of steps that must finish first (they must already be added)
+
+        Returns:
+            The new node
+        """
+        if name in self.nodes:
+            raise ValueError(f"Duplicate step: {name}")
+        for dep in deps:
+            if dep not in self.nodes:
+                raise ValueError(f"Step {name} depends on unknown step {dep}")
+        node = DAGNode(name, func, deps)
+        self.nodes[name] = node
+        return node
+
+    def run(self, on_start: Optional[Callable[[str], None]] = None,
+            on_finish: Optional[Callable[[str, float], None]] = None) -> Dict[str, Any]:
+        """
+        Run every step, respecting dependencies.
+
+        Args:
+            on_start: Optional function called with a step's name when it starts
+            on_finish: Optional function called with a step's name and duration when it finishes
+
+        Returns:
+            Dictionary mapping step name to result
+        """
+        self.start = time.time()
+        pending = dict(self.nodes)
+        running = {}
+        done = set()
+        error = None
+
+        def execute(node: DAGNode):
+            node.start = time.time()
+            if on_start:
+                on_start(node.name)
+            try:
+                node.result = node.func({dep: self.nodes[dep].result for dep in node.deps})
+            finally:
+                node.end = time.time()
+            if on_finish:
+                on_finish(node.name, node.duration)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                if error is None:
+                    # Steps were added in dependency order, so submitting in that order is stable
+                    for name in [n for n, node in pending.items() if all(d in done for d in node.deps)]:
+                        node = pending.pop(name)
+                        running[executor.submit(contextvars.copy_context().run, execute, node)] = name
+                else:
+                    pending.clear()
+
+                if not running:
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        future.result()
+                        done.add(name)
+                    except BaseException as e:
+                        if error is None:
+                            error = e
+
+        self.end = time.time()
+        if error is not None:
+            raise error
+        return {name: node.result for name, node in self.nodes.items()}
+
+    def critical_path(self) -> List[str]:
+        """
+        Find the chain of steps that determined the total run time.
+
+        Starting from the step that finished last, follow the dependency that
+        finished last each time, i.e. the one the step was actually waiting on.
+
+        Returns:
+            Step names from first to last
+        """
+        finished = [node for node in self.nodes.values() if node.end is not None]
+        if not finished:
+            return []
+
+        node = max(finished, key=lambda n: n.end)
+        path = [node.name]
+        while node.deps:
+            node = max((self.nodes[dep] for dep in node.deps), key=lambda n: n.end or 0)
+            path.append(node.name)
+        return list(reversed(path))
+
+    def timings(self) -> Dict:
+        """
+        Summarize the run.
+
+        Returns:
+            Dictionary with per-step durations, the critical path, its length
+            and the sum of all step durations
+        """
+        durations = {name: node.duration for name, node in self.nodes.items() if node.duration is not None}
+        path = self.critical_path()
+        return {
+            "steps": durations,
+            "critical_path": path,
+            "critical_path_time": sum(durations[name] for name in path),
+            "total_step_time": sum(durations.values()),
+            "wall_time": (self.end - self.start) if self.start and self.end else None
+        }
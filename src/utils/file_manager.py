@@ -6,10 +6,43 @@ Handles saving articles and metadata.
 import os
 import json
 import time
+import threading
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
-from src.utils.config import ARTICLES_DIR, METADATA_DIR
+from src.utils.catalog import ArticleCatalog, article_id
+from src.utils.config import ARTICLES_DIR, METADATA_DIR, CATALOG_PATH, RENDER_CACHE_DIR, RENDER_MEMORY_CACHE_MAX_BYTES
+from src.utils.render_cache import RenderCache, content_hash
+
+_catalog = None
+_catalog_lock = threading.Lock()
+_render_cache = None
+
+def get_catalog() -> ArticleCatalog:
+    """
+    Get the article catalog, opening (and if needed building) it on first use.
+    
+    Returns:
+        The shared ArticleCatalog
+    """
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = ArticleCatalog(CATALOG_PATH, METADATA_DIR)
+        return _catalog
+
+def get_render_cache() -> RenderCache:
+    """
+    Get the cache of rendered article HTML.
+    
+    Returns:
+        The shared RenderCache
+    """
+    global _render_cache
+    with _catalog_lock:
+        if _render_cache is None:
+            _render_cache = RenderCache(RENDER_CACHE_DIR, RENDER_MEMORY_CACHE_MAX_BYTES)
+        return _render_cache
 
 def generate_filename(topic: str, platform: str = None) -> str:
     """
@@ -36,27 +69,64 @@ def generate_filename(topic: str, platform: str = None) -> str:
     
     return f"article_{clean_topic}"
 
-def save_article(content: str, metadata: Dict[str, Any]) -> Dict[str, str]:
+def reserve_article_name(topic: str, platform: str = None) -> Dict[str, str]:
+    """
+    Claim a unique versioned file name for an article that is about to be saved.
+    
+    The article file is created (empty) right away, so concurrent saves of the same
+    topic and platform in the same second get a numbered suffix instead of the same name.
+    
+    Args:
+        topic: The main topic of the article
+        platform: Optional publishing platform
+        
+    Returns:
+        Dictionary with the versioned file name (without extension) and its timestamp
+    """
+    base_filename = generate_filename(topic, platform)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    
+    versioned_filename = f"{base_filename}_{timestamp}"
+    suffix = 1
+    while True:
+        try:
+            with open(os.path.join(ARTICLES_DIR, f"{versioned_filename}.txt"), "x", encoding="utf-8"):
+                pass
+            break
+        except FileExistsError:
+            suffix += 1
+            versioned_filename = f"{base_filename}_{timestamp}_{suffix}"
+    
+    return {"name": versioned_filename, "timestamp": timestamp}
+
+def save_article(content: str, metadata: Dict[str, Any], reserved: Optional[Dict[str, str]] = None) -> Dict[str, str]:
     """
     Save an article and its metadata to the appropriate directories.
     
+    Saving again with the same reserved name overwrites the same files, so a save
+    that was interrupted can simply be repeated.
+    
     Args:
         content: The article content
         metadata: Dictionary containing article metadata
+        reserved: Optional name from reserve_article_name (a new one is reserved if omitted)
         
     Returns:
-        Dictionary with paths to the saved files
+        Dictionary with the article's ID and paths to the saved files
     """
     # Generate base filename
     base_filename = generate_filename(metadata.get("topic", "untitled"), 
                                      metadata.get("platform"))
     
-    # Add timestamp for versioned file
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    timestamped_filename = f"{base_filename}_{timestamp}.txt"
+    if reserved is None:
+        reserved = reserve_article_name(metadata.get("topic", "untitled"), metadata.get("platform"))
+    versioned_filename = reserved["name"]
+    timestamp = reserved["timestamp"]
+    
+    timestamped_filename = f"{versioned_filename}.txt"
     latest_filename = f"{base_filename}.txt"
     
-    # Save the article content (both timestamped and latest versions)
+    # Save the timestamped and the latest version
     timestamped_path = os.path.join(ARTICLES_DIR, timestamped_filename)
     latest_path = os.path.join(ARTICLES_DIR, latest_filename)
     
@@ -67,10 +137,11 @@ def save_article(content: str, metadata: Dict[str, Any]) -> Dict[str, str]:
         f.write(content)
     
     # Save metadata
-    metadata_filename = f"{base_filename}_{timestamp}.json"
+    metadata_filename = f"{versioned_filename}.json"
     metadata_path = os.path.join(METADATA_DIR, metadata_filename)
     
     # Add file information to metadata
+    metadata["article_id"] = article_id(metadata_filename)
     metadata["timestamp"] = timestamp
     metadata["article_file"] = timestamped_filename
     metadata["generation_time"] = datetime.now().isoformat()
@@ -78,57 +149,175 @@ def save_article(content: str, metadata: Dict[str, Any]) -> Dict[str, str]:
     with open(metadata_path, "w", encoding="utf-8") as f:
         json.dump(metadata, f, indent=2)
     
+    # Render the article once now, so serving it is a cache lookup
+    key = content_hash(content)
+    get_render_cache().render(content, key)
+    
+    # Index the article so listings don't have to read the metadata files
+    get_catalog().add(metadata_filename, metadata, key, os.stat(timestamped_path).st_mtime)
+    
     return {
+        "article_id": metadata["article_id"],
         "article_path": timestamped_path,
         "latest_path": latest_path,
         "metadata_path": metadata_path
     }
 
-def get_article_history(topic: str = None, platform: str = None) -> list:
+def update_article_metadata(metadata_path: str, updates: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Get a list of previously generated articles, optionally filtered by topic or platform.
+    Patch a saved metadata file, e.g. with results computed after the article was saved.
+    
+    Keys may be dotted paths into nested dictionaries, e.g. "generation_process.improvements".
+    The file is replaced atomically, so readers never see a partly written file.
     
     Args:
-        topic: Optional topic to filter by
+        metadata_path: Path to the metadata file
+        updates: Mapping of (dotted) keys to the values to set
+        
+    Returns:
+        The updated metadata
+    """
+    with open(metadata_path, "r", encoding="utf-8") as f:
+        metadata = json.load(f)
+    
+    for key, value in updates.items():
+        *parents, name = key.split(".")
+        target = metadata
+        for parent in parents:
+            target = target.setdefault(parent, {})
+        target[name] = value
+    
+    temp_path = f"{metadata_path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(metadata, f, indent=2)
+    os.replace(temp_path, metadata_path)
+    
+    if os.path.dirname(os.path.abspath(metadata_path)) == os.path.abspath(METADATA_DIR):
+        get_catalog().add(os.path.basename(metadata_path), metadata)
+    
+    return metadata
+
+def _article_info(row: Dict) -> Dict:
+    """
+    Format a catalog row as article information.
+    
+    Args:
+        row: The catalog row
+        
+    Returns:
+        Dictionary with article information
+    """
+    return {
+        "id": row["article_id"],
+        "topic": row["topic"],
+        "title": row["title"],
+        "style": row["style"],
+        "platform": row["platform"],
+        "timestamp": row["timestamp"],
+        "word_count": row["word_count"],
+        "run_id": row["run_id"],
+        "description": row["description"],
+        "article_file": row["article_file"],
+        "metadata_file": row["metadata_file"]
+    }
+
+def get_article_html(article: Dict) -> Optional[str]:
+    """
+    Get an article rendered as HTML.
+    
+    The article's content hash is kept in the catalog, so a page that was rendered
+    before (by save_article or an earlier view) is served from the render cache
+    without reading or converting the Markdown. The article file's modification
+    time guards against files rewritten in place.
+    
+    Args:
+        article: Article information from the catalog (needs "metadata_file")
+        
+    Returns:
+        The HTML, or None if the article file can't be read
+    """
+    catalog = get_catalog()
+    row = catalog.get(article["metadata_file"]) or article
+    article_path = os.path.join(ARTICLES_DIR, row["article_file"])
+    
+    try:
+        mtime = os.stat(article_path).st_mtime
+        if row.get("content_hash") and row.get("article_mtime") == mtime:
+            html = get_render_cache().get(row["content_hash"])
+            if html is not None:
+                return html
+        
+        with open(article_path, "r", encoding="utf-8") as f:
+            content = f.read()
+    except OSError:
+        return None
+    
+    key = content_hash(content)
+    html = get_render_cache().render(content, key)
+    catalog.set_content_hash(row["metadata_file"], key, mtime)
+    return html
+
+def get_article_history(topic: str = None, platform: str = None, style: str = None,
+                        limit: Optional[int] = None) -> list:
+    """
+    Get a list of previously generated articles, optionally filtered by topic, platform or style.
+    
+    Args:
+        topic: Optional text the topic must start with (case-insensitive)
         platform: Optional platform to filter by
+        style: Optional style to filter by
+        limit: Optional maximum number of articles
         
     Returns:
-        List of dictionaries with article information
+        List of dictionaries with article information, newest first
+    """
+    return [_article_info(row) for row in get_catalog().list(topic, platform, style, limit)]
+
+def get_article(article_id: str) -> Optional[Dict]:
     """
-    articles = []
+    Look up a previously generated article by its ID.
     
-    # Get all metadata files
-    metadata_files = [f for f in os.listdir(METADATA_DIR) if f.endswith(".json")]
+    Args:
+        article_id: The article ID (from the metadata or the article listing)
+        
+    Returns:
+        Dictionary with article information, or None if there is no such article
+    """
+    row = get_catalog().get_by_id(article_id)
+    return _article_info(row) if row else None
+
+def get_latest_article(topic: str = None, platform: str = None, style: str = None) -> Optional[Dict]:
+    """
+    Get the most recently generated article, optionally filtered by topic, platform or style.
     
-    for metadata_file in metadata_files:
-        metadata_path = os.path.join(METADATA_DIR, metadata_file)
+    Args:
+        topic: Optional topic to filter by
+        platform: Optional platform to filter by
+        style: Optional style to filter by
         
-        try:
-            with open(metadata_path, "r", encoding="utf-8") as f:
-                metadata = json.load(f)
-                
-            # Apply filters if specified
-            if topic and topic.lower() not in metadata.get("topic", "").lower():
-                continue
-                
-            if platform and platform.lower() != metadata.get("platform", "").lower():
-                continue
-                
-            # Add to results
-            article_info = {
-                "topic": metadata.get("topic", "Unknown"),
-                "platform": metadata.get("platform", "None"),
-                "timestamp": metadata.get("timestamp", "Unknown"),
-                "article_file": metadata.get("article_file", ""),
-                "metadata_file": metadata_file
-            }
-            
-            articles.append(article_info)
-                
-        except Exception as e:
-            print(f"Error reading metadata file {metadata_file}: {e}")
-    
-    # Sort by timestamp (newest first)
-    articles.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-    
-    return articles 
\ No newline at end of file
+    Returns:
+        Dictionary with article information, or None if there are no articles
+    """
+    row = get_catalog().latest(topic=topic, platform=platform, style=style)
+    return _article_info(row) if row else None
+
+def get_article_page(limit: int, cursor: Optional[str] = None, sort: str = "timestamp",
+                     descending: bool = True, topic: str = None, platform: str = None,
+                     style: str = None) -> Dict:
+    """
+    Get one page of previously generated articles, optionally filtered by topic, platform or style.
+    
+    Args:
+        limit: Number of articles per page
+        cursor: Optional cursor returned with the previous page
+        sort: Field to sort by ("timestamp" or "topic")
+        descending: Whether to sort in descending order
+        topic: Optional topic to filter by
+        platform: Optional platform to filter by
+        style: Optional style to filter by
+        
+    Returns:
+        Dictionary with the "articles" and the "next_cursor" (None on the last page)
+    """
+    page = get_catalog().page(limit, cursor, sort, descending, topic=topic, platform=platform, style=style)
+    return {"articles": [_article_info(row) for row in page["articles"]], "next_cursor": page["next_cursor"]}
@@ -1,26 +1,84 @@
 """
 LLM utility module for the Agentic Writer System.
-Handles interactions with OpenAI API and provides mock responses when needed.
+Sends requests to the configured LLM backend and provides mock responses when needed.
 """
 
+import re
 import json
 import time
+import asyncio
 import openai
 import hashlib
-from typing import Dict, List, Optional
-import random
-import re
-from datetime import datetime
+import textwrap
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from src.utils.config import (
+    OPENAI_API_KEY, DEFAULT_MODEL, LLM_MAX_CONCURRENCY,
+    MODEL_TIERS, MODEL_TIER_ORDER, MODEL_ROUTES, MODEL_CASCADE_ENABLED,
+    LLM_CACHE_PATH, LLM_CACHE_MAX_BYTES, LLM_CACHE_TTL_SECONDS,
+    LLM_MEMORY_CACHE_MAX_BYTES, LLM_NORMALIZE_PROMPTS,
+    LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE, LLM_EXPECTED_COMPLETION_TOKENS,
+    LLM_MAX_RETRIES, LLM_RETRY_BASE_DELAY, LLM_RETRY_MAX_DELAY, LLM_MOCK_FALLBACK,
+    LLM_BACKEND, LLM_BASE_URL, MOCK_LATENCY,
+    STANDIN_LATENCY_MEDIAN, STANDIN_LATENCY_SIGMA, STANDIN_TOKENS_PER_SECOND,
+    STANDIN_ERROR_RATE, STANDIN_THROTTLE_RATE, STANDIN_SEED
+)
+from src.utils.backends import MockBackend, create_backend
+from src.utils.cache import ResponseCache
+from src.utils.concurrency import ConcurrencyLimiter, map_in_context
+from src.utils.rate_limit import RateLimiter, RetryPolicy
+from src.utils.metrics import registry as _metrics
+
+# Backend that serves every request: OpenAI, a compatible server, the local stand-in or mock
+backend = create_backend(
+    LLM_BACKEND,
+    api_key=OPENAI_API_KEY,
+    base_url=LLM_BASE_URL,
+    mock_latency=MOCK_LATENCY,
+    standin_options={
+        "latency_median": STANDIN_LATENCY_MEDIAN,
+        "latency_sigma": STANDIN_LATENCY_SIGMA,
+        "tokens_per_second": STANDIN_TOKENS_PER_SECOND,
+        "error_rate": STANDIN_ERROR_RATE,
+        "throttle_rate": STANDIN_THROTTLE_RATE,
+        "seed": STANDIN_SEED
+    }
+)
+
+# Answers requests when a remote backend keeps failing and LLM_MOCK_FALLBACK is set
+_mock_backend = MockBackend(MOCK_LATENCY)
 
-from src.utils.config import OPENAI_API_KEY, USE_REAL_API, DEFAULT_MODEL
+# Caps in-flight requests across all threads and event loops in this process
+_concurrency = ConcurrencyLimiter(LLM_MAX_CONCURRENCY)
 
-# Initialize the OpenAI client if API key is available
-client = None
-if USE_REAL_API:
-    client = openai.OpenAI(api_key=OPENAI_API_KEY)
+# Keeps request and token rates under the account quota, and retries throttled calls
+_rate_limiter = RateLimiter(LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE)
+_retry_policy = RetryPolicy(LLM_MAX_RETRIES, LLM_RETRY_BASE_DELAY, LLM_RETRY_MAX_DELAY)
 
-# Simple in-memory cache for LLM responses
-_response_cache = {}
+# Escalations made by generate_with_cascade, keyed by task
+_cascade_stats: Dict[str, int] = {}
+_cascade_lock = threading.Lock()
+
+# Requests currently being generated, keyed by cache key, so identical calls can share them
+_flights: Dict[str, Future] = {}
+_flights_lock = threading.Lock()
+_flight_stats = {"coalesced": 0}
+
+# Persistent cache for LLM responses, shared by every process on this host
+_response_cache = ResponseCache(
+    LLM_CACHE_PATH,
+    max_bytes=LLM_CACHE_MAX_BYTES,
+    default_ttl=LLM_CACHE_TTL_SECONDS or None,
+    memory_max_bytes=LLM_MEMORY_CACHE_MAX_BYTES or None
+)
+
+# Prompts rendered from templates, those changed by normalization, and the characters it removed
+_prompt_stats = {"prompts": 0, "normalized": 0, "chars_removed": 0}
+_prompt_stats_lock = threading.Lock()
 
 def _log(message: str):
     """
@@ -32,161 +90,909 @@ def _log(message: str):
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
     print(f"[{timestamp}] [LLM] {message}")
 
-def generate_text(prompt: str, model: str = DEFAULT_MODEL, temperature: float = 0.7) -> str:
+def normalize_prompt(template: str) -> str:
     """
-    Generate text using OpenAI API or mock responses.
+    Canonicalize the whitespace of a prompt template.
+    
+    Agent prompts are indented triple-quoted strings, so the template is dedented,
+    trailing whitespace is dropped, runs of blank lines collapse to one, and the
+    result is stripped. Only apply this to templates: text filled into them (articles,
+    code samples) has whitespace that matters.
+    
+    Args:
+        template: The prompt template as written in the agent
+        
+    Returns:
+        The normalized template
+    """
+    lines = [line.rstrip() for line in textwrap.dedent(template).split("\n")]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+class _RenderedPrompt(str):
+    """A prompt built by render_prompt, tagged with a digest of its unnormalized form."""
+    
+    variant: Optional[str] = None
+
+def render_prompt(template: str, **values) -> str:
+    """
+    Fill in a prompt template.
+    
+    With LLM_NORMALIZE_PROMPTS the template is normalized first (see normalize_prompt),
+    so cosmetic differences share a cache entry and bill fewer input tokens. The values
+    are inserted exactly as given.
+    
+    Args:
+        template: The prompt template, with {name} placeholders
+        **values: Values for the placeholders
+        
+    Returns:
+        The prompt
+    """
+    prompt = template.format(**values)
+    if not LLM_NORMALIZE_PROMPTS:
+        return prompt
+    
+    rendered = _RenderedPrompt(normalize_prompt(template).format(**values))
+    rendered.variant = hashlib.md5(prompt.encode()).hexdigest()
+    with _prompt_stats_lock:
+        _prompt_stats["prompts"] += 1
+        if rendered != prompt:
+            _prompt_stats["normalized"] += 1
+            _prompt_stats["chars_removed"] += len(prompt) - len(rendered)
+    return rendered
+
+def _prepare_prompt(prompt: str) -> Tuple[str, str]:
+    """
+    Tag a prompt with a digest of its form before normalization, for the response cache.
+    
+    Args:
+        prompt: The prompt as passed by the caller
+        
+    Returns:
+        Tuple of the prompt to send and the variant tag for the response cache
+    """
+    variant = getattr(prompt, "variant", None) or hashlib.md5(prompt.encode()).hexdigest()
+    return str(prompt), variant
+
+def _cache_key(prompt: str, model: str, temperature: float) -> str:
+    """
+    Build the cache key for a request.
+    
+    Each backend is keyed separately, so e.g. mock or stand-in responses are never
+    served once a real API key is configured.
     
     Args:
         prompt: The prompt to send to the model
-        model: The model to use (default: gpt-4)
+        model: The model to use
         temperature: Controls randomness (0-1)
         
     Returns:
-        Generated text response
+        Hex digest identifying the request
     """
-    # Create a cache key based on the prompt and parameters
-    cache_key = hashlib.md5(f"{prompt}|{model}|{temperature}".encode()).hexdigest()
+    return hashlib.md5(f"{prompt}|{model}|{temperature}|{backend.name}".encode()).hexdigest()
+
+def _build_messages(prompt: str) -> List[Dict]:
+    """
+    Build the chat messages for a prompt.
     
-    # Check if we have a cached response
-    if cache_key in _response_cache:
-        _log(f"Using cached response for prompt: {prompt[:50]}...")
-        return _response_cache[cache_key]
+    Args:
+        prompt: The prompt to send to the model
+        
+    Returns:
+        List of chat messages
+    """
+    return [
+        {"role": "system", "content": "You are a helpful assistant."},
+        {"role": "user", "content": prompt}
+    ]
+
+def get_cache_stats() -> Dict:
+    """
+    Get hit/miss/eviction counters and usage for the response cache, plus what prompt
+    normalization saved.
     
-    start_time = time.time()
-    _log(f"Generating text with model {model}, prompt: {prompt[:50]}...")
+    The memory tier's "variant_hits" counts hits for a prompt that differed from the
+    one that filled the entry only in whitespace, i.e. misses without normalization.
     
-    if USE_REAL_API and client:
-        try:
-            response = client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=temperature,
-            )
-            result = response.choices[0].message.content.strip()
-        except Exception as e:
-            _log(f"Error calling OpenAI API: {e}")
-            _log("Falling back to mock response...")
-            result = _get_mock_response(prompt)
+    Returns:
+        Dictionary of cache statistics
+    """
+    stats = _response_cache.stats()
+    with _prompt_stats_lock:
+        stats["normalization"] = dict(_prompt_stats)
+    stats["normalization"]["enabled"] = LLM_NORMALIZE_PROMPTS
+    stats["normalization"]["tokens_saved"] = stats["normalization"]["chars_removed"] // 4
+    return stats
+
+class _FlightAbandoned(Exception):
+    """Raised to callers waiting on a request whose owner gave up before it finished."""
+
+def _begin_flight(cache_key: str) -> Tuple[Future, bool]:
+    """
+    Join the in-flight request for a cache key, or register a new one.
+    
+    Args:
+        cache_key: The cache key of the request
+        
+    Returns:
+        Tuple of the flight's future and whether the caller owns it
+    """
+    with _flights_lock:
+        flight = _flights.get(cache_key)
+        if flight is not None:
+            _flight_stats["coalesced"] += 1
+            return flight, False
+        flight = Future()
+        _flights[cache_key] = flight
+        return flight, True
+
+def _end_flight(cache_key: str, flight: Future, result: Optional[str] = None,
+                error: Optional[BaseException] = None):
+    """
+    Publish the outcome of an owned request to every caller waiting on it.
+    
+    Args:
+        cache_key: The cache key of the request
+        flight: The future returned by _begin_flight
+        result: The generated text, if the request succeeded
+        error: The exception raised, if the request failed
+    """
+    with _flights_lock:
+        _flights.pop(cache_key, None)
+    if error is not None:
+        flight.set_exception(error)
     else:
-        result = _get_mock_response(prompt)
+        flight.set_result(result)
+
+class LLMError(Exception):
+    """Raised when a request to the LLM backend fails for good."""
+
+def _estimate_tokens(prompt: str) -> int:
+    """
+    Estimate the tokens a request will use, for rate limiting.
     
-    # Cache the response
-    _response_cache[cache_key] = result
+    Args:
+        prompt: The prompt to send to the model
+        
+    Returns:
+        Estimated prompt plus completion tokens
+    """
+    return len(prompt) // 4 + LLM_EXPECTED_COMPLETION_TOKENS
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """
+    Read the delay requested by the server from an API error, if any.
     
-    elapsed = time.time() - start_time
-    _log(f"Text generation completed in {elapsed:.2f} seconds, {len(result)} chars")
+    Args:
+        error: The exception raised by the OpenAI client
+        
+    Returns:
+        Seconds to wait, or None if the server didn't say
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
     
-    return result
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+    
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return float(retry_after)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
 
-def _get_mock_response(prompt: str) -> str:
+def _retry_delay(error: Exception, attempt: int) -> Optional[float]:
     """
-    Generate a mock response for testing without API access.
+    Decide whether a failed request should be retried, and after how long.
+    
+    Throttling (429), timeouts, connection errors and server errors are retried;
+    anything else (bad request, authentication) fails immediately.
     
     Args:
-        prompt: The prompt that would be sent to the API
+        error: The exception raised by the OpenAI client
+        attempt: Number of attempts made so far
         
     Returns:
-        A mock text response
+        Seconds to wait before retrying, or None to give up
     """
-    # Add a small delay to simulate API call
-    time.sleep(0.5)
+    status = getattr(error, "status_code", None)
+    retryable = (
+        isinstance(error, openai.APIConnectionError)
+        or status in (408, 409, 429)
+        or (status is not None and status >= 500)
+    )
+    if status == 429:
+        _rate_limiter.record("throttled")
+    if not retryable or attempt > _retry_policy.max_retries:
+        return None
     
-    # Simple mock responses based on prompt keywords
-    if "outline" in prompt.lower():
-        return """
-# AI Agents: The Future of Automation
+    retry_after = _retry_after(error)
+    if retry_after is not None:
+        # Hold back every caller, not just this one, until the server is ready again
+        _rate_limiter.pause(retry_after)
+    _rate_limiter.record("retries")
+    return _retry_policy.delay(attempt, retry_after)
 
-## Introduction
-- What are AI agents and why they matter
-- The evolution of AI from tools to agents
+def _call_with_retries(request: Callable, estimated_tokens: int, call: Dict, keep_slot: bool = False):
+    """
+    Send a request through the rate limiter, retrying throttled and transient failures.
+    
+    Each attempt holds an in-flight slot only while the request is sent; it is released
+    before waiting on the rate limiter or a retry delay, so a throttled request doesn't
+    block other callers.
+    
+    Args:
+        request: Function that sends the request and returns the response
+        estimated_tokens: Estimated tokens the request will use
+        call: Metrics record of the call, updated with the number of retries
+        keep_slot: Keep holding the slot of the successful attempt, for the caller to
+            release (e.g. once a stream has been read)
+        
+    Returns:
+        The response returned by request
+    """
+    attempt = 0
+    while True:
+        _rate_limiter.acquire(estimated_tokens)
+        _concurrency.acquire()
+        try:
+            response = request()
+        except Exception as e:
+            _concurrency.release()
+            attempt += 1
+            delay = _retry_delay(e, attempt)
+            if delay is None:
+                _rate_limiter.record("failures")
+                raise LLMError(f"{backend.name} request failed after {attempt} attempt(s): {e}") from e
+            call["retries"] = attempt
+            _log(f"{backend.name} request failed ({e}), retrying in {delay:.2f} seconds (attempt {attempt}/{_retry_policy.max_retries})")
+            time.sleep(delay)
+            continue
+        except BaseException:
+            _concurrency.release()
+            raise
+        if not keep_slot:
+            _concurrency.release()
+        return response
 
-## How AI Agents Work
-- The architecture of an AI agent
-- Decision-making capabilities
-- Learning and adaptation
+async def _acall_with_retries(request: Callable, estimated_tokens: int, call: Dict):
+    """
+    Send a request through the rate limiter without blocking the event loop,
+    retrying throttled and transient failures.
+    
+    As with _call_with_retries, the in-flight slot is only held while the request is sent.
+    
+    Args:
+        request: Function that returns an awaitable sending the request
+        estimated_tokens: Estimated tokens the request will use
+        call: Metrics record of the call, updated with the number of retries
+        
+    Returns:
+        The response returned by the awaited request
+    """
+    attempt = 0
+    while True:
+        await _rate_limiter.acquire_async(estimated_tokens)
+        try:
+            async with _concurrency:
+                return await request()
+        except Exception as e:
+            attempt += 1
+            delay = _retry_delay(e, attempt)
+            if delay is None:
+                _rate_limiter.record("failures")
+                raise LLMError(f"{backend.name} request failed after {attempt} attempt(s): {e}") from e
+            call["retries"] = attempt
+            _log(f"{backend.name} request failed ({e}), retrying in {delay:.2f} seconds (attempt {attempt}/{_retry_policy.max_retries})")
+            await asyncio.sleep(delay)
 
-## Real-World Applications
-- Business process automation
-- Personal assistants
-- Creative collaborators
+def _settle_usage(result: Dict, estimated_tokens: int, call: Dict):
+    """
+    Correct the token bucket with the usage reported by the backend.
+    
+    Args:
+        result: The backend result, with "prompt_tokens" and "completion_tokens"
+        estimated_tokens: Tokens reserved for the request
+        call: Metrics record of the call, updated with the reported token counts
+    """
+    if result["prompt_tokens"] is None or result["completion_tokens"] is None:
+        return
+    _rate_limiter.settle(estimated_tokens, result["prompt_tokens"] + result["completion_tokens"])
+    call["prompt_tokens"] = result["prompt_tokens"]
+    call["completion_tokens"] = result["completion_tokens"]
+    call["tokens_estimated"] = False
 
-## Challenges and Limitations
-- Current technological constraints
-- Ethical considerations
-- The human-agent relationship
+def _new_call(prompt: str) -> Dict:
+    """
+    Start the metrics record for a call.
+    
+    Token counts are estimated until the backend reports real usage.
+    
+    Args:
+        prompt: The prompt to send to the model
+        
+    Returns:
+        Dictionary with retry and token fields
+    """
+    return {
+        "retries": 0,
+        "prompt_tokens": len(prompt) // 4,
+        "completion_tokens": 0,
+        "tokens_estimated": True
+    }
 
-## The Future of AI Agents
-- Emerging trends and research
-- Predictions for the next decade
+def _record(model: str, task: Optional[str], start_time: float, call: Optional[Dict] = None, result: Optional[str] = None,
+            cache_hit: bool = False, coalesced: bool = False, streamed: bool = False,
+            error: Optional[BaseException] = None):
+    """
+    Record a finished call in the metrics registry.
+    
+    Args:
+        model: The model the call was made with
+        task: Optional routing task the call was made for
+        start_time: When the call started
+        call: Optional metrics record from _new_call (None for calls that never reached the API)
+        result: Optional generated text, used to estimate completion tokens
+        cache_hit: Whether the response came from the cache
+        coalesced: Whether the call waited on an identical in-flight request
+        streamed: Whether the response was streamed
+        error: Optional exception if the call failed
+    """
+    call = call or {"retries": 0, "prompt_tokens": 0, "completion_tokens": 0, "tokens_estimated": False}
+    if call["tokens_estimated"] and result is not None:
+        call["completion_tokens"] = len(result) // 4
+    
+    _metrics.record_call(
+        model=model,
+        task=task,
+        prompt_tokens=call["prompt_tokens"],
+        completion_tokens=call["completion_tokens"],
+        latency=time.time() - start_time,
+        cache_hit=cache_hit,
+        coalesced=coalesced,
+        retries=call["retries"],
+        streamed=streamed,
+        tokens_estimated=call["tokens_estimated"],
+        error=str(error) if error is not None else None
+    )
 
-## Conclusion
-- Summary of key points
-- Call to action for readers
-"""
-    elif "research" in prompt.lower():
-        return """
-AI agents are software entities that can perceive their environment, make decisions, and take actions to achieve specific goals. Unlike traditional AI systems that perform specific tasks, agents operate with some degree of autonomy and can adapt to changing circumstances.
+def _complete(prompt: str, model: str, temperature: float, call: Dict) -> Tuple[str, bool]:
+    """
+    Send a request to the backend, falling back to a mock response if allowed.
+    
+    Only remote backends go through the rate limiter and retries.
+    
+    Args:
+        prompt: The prompt to send to the model
+        model: The model to use
+        temperature: Controls randomness (0-1)
+        call: Metrics record of the call
+        
+    Returns:
+        Tuple of the generated text and whether it may be cached
+    """
+    messages = _build_messages(prompt)
+    if not backend.remote:
+        with _concurrency:
+            return backend.complete(messages, model, temperature)["text"], True
+    
+    estimated_tokens = _estimate_tokens(prompt)
+    try:
+        result = _call_with_retries(
+            lambda: backend.complete(messages, model, temperature),
+            estimated_tokens,
+            call
+        )
+    except LLMError as e:
+        if not LLM_MOCK_FALLBACK:
+            raise
+        _log(f"Error calling {backend.name} backend: {e}")
+        _log("Falling back to mock response...")
+        # Never persist a fallback, or it would be served instead of a real answer later
+        with _concurrency:
+            return _mock_backend.complete(messages, model, temperature)["text"], False
+    _settle_usage(result, estimated_tokens, call)
+    return result["text"], True
 
-Key characteristics of AI agents include:
-1. Autonomy - They can operate without direct human intervention
-2. Reactivity - They respond to changes in their environment
-3. Proactivity - They can take initiative to achieve goals
-4. Social ability - They can interact with other agents or humans
+async def _acomplete(prompt: str, model: str, temperature: float, call: Dict) -> Tuple[str, bool]:
+    """
+    Send a request to the backend without blocking the event loop, falling back to
+    a mock response if allowed.
+    
+    Args:
+        prompt: The prompt to send to the model
+        model: The model to use
+        temperature: Controls randomness (0-1)
+        call: Metrics record of the call
+        
+    Returns:
+        Tuple of the generated text and whether it may be cached
+    """
+    messages = _build_messages(prompt)
+    if not backend.remote:
+        async with _concurrency:
+            return (await backend.acomplete(messages, model, temperature))["text"], True
+    
+    estimated_tokens = _estimate_tokens(prompt)
+    try:
+        result = await _acall_with_retries(
+            lambda: backend.acomplete(messages, model, temperature),
+            estimated_tokens,
+            call
+        )
+    except LLMError as e:
+        if not LLM_MOCK_FALLBACK:
+            raise
+        _log(f"Error calling {backend.name} backend: {e}")
+        _log("Falling back to mock response...")
+        async with _concurrency:
+            return (await _mock_backend.acomplete(messages, model, temperature))["text"], False
+    _settle_usage(result, estimated_tokens, call)
+    return result["text"], True
 
-Recent developments in large language models (LLMs) have accelerated the capabilities of AI agents, enabling more sophisticated reasoning, planning, and natural language understanding.
-"""
-    elif "section" in prompt.lower():
-        # Generate a section based on the heading in the prompt
-        heading_match = re.search(r'heading "([^"]+)"', prompt)
-        heading = heading_match.group(1) if heading_match else "AI Agents"
+def resolve_model(task: Optional[str] = None) -> str:
+    """
+    Pick the model for a task from the routing table.
+    
+    Args:
+        task: Optional routing task, e.g. "reviewer.summary"
         
-        return f"""
-{heading} represents a significant advancement in artificial intelligence technology. Unlike traditional AI systems that are designed for specific tasks, AI agents can operate with greater autonomy and adaptability.
+    Returns:
+        The model name (DEFAULT_MODEL for unknown or missing tasks)
+    """
+    route = MODEL_ROUTES.get(task or "", {})
+    return MODEL_TIERS.get(route.get("tier", "default"), DEFAULT_MODEL)
 
-The key difference lies in their ability to perceive their environment, make decisions based on that information, and take actions to achieve specific goals. This creates a more dynamic and responsive system that can handle complex, changing situations.
+def _cascade_models(task: str) -> List[str]:
+    """
+    List the models a cascading task may try, cheapest first.
+    
+    Args:
+        task: The routing task
+        
+    Returns:
+        Model names in escalation order
+    """
+    route = MODEL_ROUTES.get(task, {})
+    tier = route.get("tier", "default")
+    if not (route.get("cascade") and MODEL_CASCADE_ENABLED) or tier not in MODEL_TIER_ORDER:
+        return [resolve_model(task)]
+    
+    models = []
+    for name in MODEL_TIER_ORDER[MODEL_TIER_ORDER.index(tier):]:
+        if MODEL_TIERS[name] not in models:
+            models.append(MODEL_TIERS[name])
+    return models
 
-Modern AI agents typically combine several technologies:
-1. Machine learning models for understanding and generating content
-2. Decision-making frameworks for choosing actions
-3. Memory systems for maintaining context and learning from past experiences
-4. Communication interfaces for interacting with humans and other systems
+def generate_with_cascade(prompt: str, task: str, validator: Callable[[str], bool],
+                          temperature: float = 0.7) -> str:
+    """
+    Generate text with the cheapest model routed for a task, escalating only when validation fails.
+    
+    Args:
+        prompt: The prompt to send to the model
+        task: The routing task, e.g. "planner.outline"
+        validator: Function that returns True if a response is usable
+        temperature: Controls randomness (0-1)
+        
+    Returns:
+        The first valid response, or the last model's response if none validate
+    """
+    models = _cascade_models(task)
+    
+    for i, model in enumerate(models):
+        result = generate_text(prompt, model, temperature, task=task)
+        
+        try:
+            valid = validator(result)
+        except Exception:
+            valid = False
+        
+        if valid or i == len(models) - 1:
+            return result
+        
+        next_model = models[i + 1]
+        _log(f"Response from {model} failed validation for {task}, escalating to {next_model}")
+        with _cascade_lock:
+            _cascade_stats[task] = _cascade_stats.get(task, 0) + 1
+    
+    return result
 
-These components work together to create systems that can assist with a wide range of tasks, from simple automation to complex creative and analytical work.
-"""
-    elif "introduction" in prompt.lower():
-        return """
-In the rapidly evolving landscape of artificial intelligence, AI agents have emerged as one of the most promising developments. These intelligent systems are transforming how we interact with technology, automating complex tasks, and augmenting human capabilities in unprecedented ways.
+def get_cascade_stats() -> Dict:
+    """
+    Get how often each cascading task had to escalate to a larger model.
+    
+    Returns:
+        Dictionary mapping task to escalation count
+    """
+    with _cascade_lock:
+        return dict(_cascade_stats)
 
-AI agents differ from traditional software in their ability to operate autonomously, make decisions, and adapt to changing circumstances. They represent a shift from tools that require explicit instructions to assistants that can understand context, anticipate needs, and take initiative.
+def generate_text(prompt: str, model: Optional[str] = None, temperature: float = 0.7,
+                  task: Optional[str] = None) -> str:
+    """
+    Generate text with the configured backend.
+    
+    The prompt is sent as given (agents build theirs with render_prompt). Concurrent calls
+    for the same prompt are coalesced: the first caller sends the request and the
+    others wait for its result.
+    
+    Args:
+        prompt: The prompt to send to the model
+        model: Optional model to use (default: routed by task)
+        temperature: Controls randomness (0-1)
+        task: Optional routing task, e.g. "research.subtopics"
+        
+    Returns:
+        Generated text response
+    """
+    start_time = time.time()
+    prompt, variant = _prepare_prompt(prompt)
+    model = model or resolve_model(task)
+    
+    # Create a cache key based on the prompt and parameters
+    cache_key = _cache_key(prompt, model, temperature)
+    
+    # Check if we have a cached response
+    cached = _response_cache.get(cache_key, variant)
+    if cached is not None:
+        _log(f"Using cached response for prompt: {prompt[:50]}...")
+        _record(model, task, start_time, cache_hit=True)
+        return cached
+    
+    # Wait for an identical request that is already in flight, if there is one
+    while True:
+        flight, owner = _begin_flight(cache_key)
+        if owner:
+            break
+        _log(f"Waiting for identical in-flight request: {prompt[:50]}...")
+        try:
+            result = flight.result()
+        except _FlightAbandoned:
+            # The owner stopped before finishing, so take the request over
+            continue
+        _record(model, task, start_time, coalesced=True)
+        return result
+    
+    call = _new_call(prompt)
+    try:
+        # The previous owner may have finished between our cache check and joining
+        cached = _response_cache.get(cache_key, variant)
+        if cached is not None:
+            _end_flight(cache_key, flight, result=cached)
+            _record(model, task, start_time, cache_hit=True)
+            return cached
+        
+        _log(f"Generating text with model {model}, prompt: {prompt[:50]}...")
+        
+        result, cacheable = _complete(prompt, model, temperature, call)
+        
+        # Cache the response
+        if cacheable:
+            _response_cache.set(cache_key, result, variant=variant)
+    except Exception as e:
+        _end_flight(cache_key, flight, error=e)
+        _record(model, task, start_time, call, error=e)
+        raise
+    except BaseException as e:
+        # Cancelled or interrupted, which says nothing about the request; let a waiting caller take over
+        _end_flight(cache_key, flight, error=_FlightAbandoned())
+        _record(model, task, start_time, call, error=e)
+        raise
+    
+    _end_flight(cache_key, flight, result=result)
+    _record(model, task, start_time, call, result)
+    
+    elapsed = time.time() - start_time
+    _log(f"Text generation completed in {elapsed:.2f} seconds, {len(result)} chars")
+    
+    return result
 
-This article explores the fascinating world of AI agents - what they are, how they work, their current applications, and the future possibilities they present. Whether you're a technology enthusiast, a business professional looking to leverage AI, or simply curious about the future of automation, understanding AI agents is essential for navigating our increasingly AI-driven world.
-"""
-    elif "conclusion" in prompt.lower():
-        return """
-As we've explored throughout this article, AI agents represent a significant evolution in how we interact with and benefit from artificial intelligence. By combining autonomy, adaptability, and specialized capabilities, these systems are transforming everything from personal productivity to enterprise operations.
+async def agenerate_text(prompt: str, model: Optional[str] = None, temperature: float = 0.7,
+                         task: Optional[str] = None) -> str:
+    """
+    Generate text without blocking the event loop.
+    
+    Shares the backend, response cache, in-flight limit and request coalescing
+    with generate_text, so awaiting several calls at once overlaps their network waits.
+    
+    Args:
+        prompt: The prompt to send to the model
+        model: Optional model to use (default: routed by task)
+        temperature: Controls randomness (0-1)
+        task: Optional routing task, e.g. "research.subtopics"
+        
+    Returns:
+        Generated text response
+    """
+    start_time = time.time()
+    prompt, variant = _prepare_prompt(prompt)
+    model = model or resolve_model(task)
+    cache_key = _cache_key(prompt, model, temperature)
+    
+    cached = _response_cache.get(cache_key, variant)
+    if cached is not None:
+        _log(f"Using cached response for prompt: {prompt[:50]}...")
+        _record(model, task, start_time, cache_hit=True)
+        return cached
+    
+    while True:
+        flight, owner = _begin_flight(cache_key)
+        if owner:
+            break
+        _log(f"Waiting for identical in-flight request: {prompt[:50]}...")
+        try:
+            result = await asyncio.wrap_future(flight)
+        except _FlightAbandoned:
+            continue
+        _record(model, task, start_time, coalesced=True)
+        return result
+    
+    call = _new_call(prompt)
+    try:
+        cached = _response_cache.get(cache_key, variant)
+        if cached is not None:
+            _end_flight(cache_key, flight, result=cached)
+            _record(model, task, start_time, cache_hit=True)
+            return cached
+        
+        _log(f"Generating text (async) with model {model}, prompt: {prompt[:50]}...")
+        
+        result, cacheable = await _acomplete(prompt, model, temperature, call)
+        
+        if cacheable:
+            _response_cache.set(cache_key, result, variant=variant)
+    except Exception as e:
+        _end_flight(cache_key, flight, error=e)
+        _record(model, task, start_time, call, error=e)
+        raise
+    except BaseException as e:
+        # Cancelled or interrupted, which says nothing about the request; let a waiting caller take over
+        _end_flight(cache_key, flight, error=_FlightAbandoned())
+        _record(model, task, start_time, call, error=e)
+        raise
+    
+    _end_flight(cache_key, flight, result=result)
+    _record(model, task, start_time, call, result)
+    
+    elapsed = time.time() - start_time
+    _log(f"Async text generation completed in {elapsed:.2f} seconds, {len(result)} chars")
+    
+    return result
+
+def generate_text_batch(prompts: List[str], model: Optional[str] = None, temperature: float = 0.7,
+                        max_workers: Optional[int] = None, task: Union[str, List[str], None] = None,
+                        on_result: Optional[Callable[[int, Dict], None]] = None) -> List[Dict]:
+    """
+    Generate text for several independent prompts concurrently.
+    
+    Identical prompts (for the same task) are sent once and share the result. A failure
+    on one prompt is reported on its own item and does not affect the rest of the batch.
+    
+    Args:
+        prompts: The prompts to send to the model
+        model: Optional model to use (default: routed by task)
+        temperature: Controls randomness (0-1)
+        max_workers: Optional worker pool size (default: the in-flight request limit)
+        task: Optional routing task, e.g. "writer.section", or a list with one task per prompt
+        on_result: Optional function called with the index and item of each prompt as it finishes
+        
+    Returns:
+        List of dictionaries with "text" and "error" keys, in the same order as prompts
+    """
+    if not prompts:
+        return []
+    
+    tasks = task if isinstance(task, list) else [task] * len(prompts)
+    positions = {}
+    for i, request in enumerate(zip(prompts, tasks)):
+        positions.setdefault(request, []).append(i)
+    requests = list(positions)
+    workers = min(len(requests), max_workers or LLM_MAX_CONCURRENCY)
+    
+    start_time = time.time()
+    _log(f"Generating batch of {len(prompts)} prompts ({len(requests)} unique) with {workers} workers")
+    
+    def generate(request: Tuple[str, Optional[str]]) -> Dict:
+        prompt, task = request
+        try:
+            return {"text": generate_text(prompt, model, temperature, task=task), "error": None}
+        except Exception as e:
+            _log(f"Error generating batch item: {e}")
+            return {"text": None, "error": str(e)}
+    
+    results = [None] * len(prompts)
+    
+    def finished(index: int, item: Dict):
+        for i in positions[requests[index]]:
+            results[i] = dict(item)
+            if on_result:
+                on_result(i, results[i])
+    
+    map_in_context(generate, requests, workers, on_result=finished)
+    
+    elapsed = time.time() - start_time
+    _log(f"Batch generation completed in {elapsed:.2f} seconds")
+    
+    return results
+
+def generate_text_stream(prompt: str, model: Optional[str] = None, temperature: float = 0.7,
+                         task: Optional[str] = None) -> Iterator[str]:
+    """
+    Generate text, yielding chunks as soon as the model produces them.
+    
+    The joined result is cached once the stream completes, so a later call with the
+    same prompt (streamed or not) is served from the cache as a single chunk. A call
+    that joins an identical request already in flight receives its result as one chunk.
+    The stream holds an in-flight slot until it is read to the end or closed, so open
+    streams count against LLM_MAX_CONCURRENCY like any other request.
+    
+    Args:
+        prompt: The prompt to send to the model
+        model: Optional model to use (default: routed by task)
+        temperature: Controls randomness (0-1)
+        task: Optional routing task, e.g. "research.subtopics"
+        
+    Yields:
+        Chunks of generated text
+    """
+    start_time = time.time()
+    prompt, variant = _prepare_prompt(prompt)
+    model = model or resolve_model(task)
+    cache_key = _cache_key(prompt, model, temperature)
+    
+    cached = _response_cache.get(cache_key, variant)
+    if cached is not None:
+        _log(f"Using cached response for prompt: {prompt[:50]}...")
+        _record(model, task, start_time, cache_hit=True, streamed=True)
+        yield cached
+        return
+    
+    while True:
+        flight, owner = _begin_flight(cache_key)
+        if owner:
+            break
+        _log(f"Waiting for identical in-flight request: {prompt[:50]}...")
+        try:
+            result = flight.result()
+        except _FlightAbandoned:
+            continue
+        _record(model, task, start_time, coalesced=True, streamed=True)
+        yield result
+        return
+    
+    call = _new_call(prompt)
+    first_chunk_time = None
+    _log(f"Streaming text with model {model}, prompt: {prompt[:50]}...")
+    
+    messages = _build_messages(prompt)
+    chunks = []
+    cacheable = True
+    try:
+        if backend.remote:
+            estimated_tokens = _estimate_tokens(prompt)
+            try:
+                # The slot stays held until the stream is read to the end or abandoned
+                stream = _call_with_retries(
+                    lambda: backend.stream(messages, model, temperature),
+                    estimated_tokens,
+                    call,
+                    keep_slot=True
+                )
+                try:
+                    for delta in stream:
+                        if first_chunk_time is None:
+                            first_chunk_time = time.time()
+                        chunks.append(delta)
+                        yield delta
+                finally:
+                    _concurrency.release()
+            except Exception as e:
+                _log(f"Error streaming from {backend.name} backend: {e}")
+                # Text already handed to the caller can't be taken back
+                if chunks or not LLM_MOCK_FALLBACK:
+                    raise
+                _log("Falling back to mock response...")
+                cacheable = False
+                with _concurrency:
+                    for delta in _mock_backend.stream(messages, model, temperature):
+                        chunks.append(delta)
+                        yield delta
+        else:
+            with _concurrency:
+                for delta in backend.stream(messages, model, temperature):
+                    if first_chunk_time is None:
+                        first_chunk_time = time.time()
+                    chunks.append(delta)
+                    yield delta
+        
+        result = "".join(chunks).strip()
+        if cacheable:
+            _response_cache.set(cache_key, result, variant=variant)
+        if backend.remote and cacheable:
+            # Streamed responses carry no usage, so settle with an estimate from the text
+            _rate_limiter.settle(estimated_tokens, len(prompt) // 4 + len(result) // 4)
+    except Exception as e:
+        _end_flight(cache_key, flight, error=e)
+        _record(model, task, start_time, call, streamed=True, error=e)
+        raise
+    except BaseException:
+        # The caller stopped consuming the stream (or was interrupted); let a waiting caller take over
+        _end_flight(cache_key, flight, error=_FlightAbandoned())
+        raise
+    
+    _end_flight(cache_key, flight, result=result)
+    _record(model, task, start_time, call, result, streamed=True)
+    
+    elapsed = time.time() - start_time
+    first_chunk = (first_chunk_time or time.time()) - start_time
+    _log(f"Text streaming completed in {elapsed:.2f} seconds (first chunk after {first_chunk:.2f}), {len(result)} chars")
 
-The journey of AI agents is just beginning. As underlying technologies like large language models, reinforcement learning, and multimodal AI continue to advance, we can expect agents to become more capable, more intuitive, and more integrated into our daily lives and work.
+def get_rate_limit_stats() -> Dict:
+    """
+    Get rate limiter waits and retry counters.
+    
+    Returns:
+        Dictionary of rate limiter statistics
+    """
+    return _rate_limiter.stats()
 
-However, this progress must be balanced with thoughtful consideration of the ethical implications, transparency requirements, and human oversight needed to ensure these systems serve humanity's best interests. The most successful implementations will likely be those that augment human capabilities rather than simply replacing them.
+def get_metrics(recent: int = 20) -> Dict:
+    """
+    Get per-call LLM metrics together with backend, cache, rate limiter and concurrency statistics.
+    
+    Args:
+        recent: Number of most recent call records to include
+        
+    Returns:
+        Dictionary of metrics
+    """
+    return {
+        "backend": backend.describe(),
+        "calls": _metrics.snapshot(recent),
+        "cache": get_cache_stats(),
+        "rate_limit": get_rate_limit_stats(),
+        "concurrency": get_concurrency_stats(),
+        "cascade_escalations": get_cascade_stats()
+    }
 
-For individuals and organizations looking to benefit from this technology, now is the time to start exploring use cases, experimenting with available tools, and developing strategies for integration. The future belongs to those who can effectively collaborate with these digital partners.
+def share_limits(semaphore, processes: int):
+    """
+    Make this process one of several sharing the LLM limits.
+    
+    Used by worker processes of a batch: requests also count against a cross-process
+    concurrency cap, and the rate limits are split evenly so that all processes
+    together stay within the account's quota.
+    
+    Args:
+        semaphore: A multiprocessing semaphore created by the parent process
+        processes: Number of processes sharing the quota
+    """
+    _concurrency.share(semaphore)
+    _rate_limiter.scale(1.0 / max(1, processes))
 
-AI agents may have begun as a technological innovation, but their ultimate impact will be measured by how they help us solve problems, enhance creativity, and improve the quality of our lives and work.
-"""
-    elif "improve" in prompt.lower():
-        # For review improvements, return the same text with minor modifications
-        article_match = re.search(r'ARTICLE:\s*(.*?)(?:\s*IMPROVED ARTICLE:|$)', prompt, re.DOTALL)
-        if article_match:
-            article = article_match.group(1).strip()
-            # Make some simple improvements
-            improved = article.replace("very ", "").replace("really ", "")
-            improved = improved.replace("in order to", "to")
-            improved = improved.replace(".", ".\n\n")
-            return improved
-        return "Improved version of the article with better readability, engagement, and coherence."
-    else:
-        # Generic response for other prompts
-        return f"This is a mock response for: {prompt[:50]}...\n\nIn a real environment, this would be generated by the OpenAI API with much more relevant and detailed content based on your specific prompt." 
\ No newline at end of file
+def get_concurrency_stats() -> Dict:
+    """
+    Get usage of the process-wide in-flight request limit and request coalescing.
+    
+    Returns:
+        Dictionary with limit, in-flight, waiting and peak counts, plus coalescing counters
+    """
+    stats = _concurrency.stats()
+    with _flights_lock:
+        stats["coalesced"] = _flight_stats["coalesced"]
+        stats["in_flight_keys"] = len(_flights)
+    return stats
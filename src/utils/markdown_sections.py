@@ -0,0 +1,262 @@
+"""
+Markdown section utilities for the Agentic Writer System.
+Splits articles into "##" sections, diffs outlines and splices sections back together.
+"""
+
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.utils.concurrency import map_in_context
+
+# Numbering the writer sometimes copies from its prompt, e.g. "Section 2: Getting Started"
+_SECTION_PREFIX = re.compile(r"^(section|part)\s+\d+\s*[:.-]\s*", re.IGNORECASE)
+
+# Outline headings that are written separately from the body sections
+FRAME_HEADINGS = ("introduction", "conclusion")
+
+def section_key(heading: Optional[str]) -> Optional[str]:
+    """
+    Normalize a heading for matching, ignoring case, spacing and section numbering.
+
+    Args:
+        heading: The heading text (None for the part before the first section)
+
+    Returns:
+        The normalized heading, or None
+    """
+    if heading is None:
+        return None
+    heading = _SECTION_PREFIX.sub("", heading.strip().strip("#").strip())
+    return " ".join(heading.lower().split())
+
+def split_sections(markdown: str) -> List[Dict]:
+    """
+    Split an article into its "##" sections.
+
+    The title and introduction before the first section form a block with
+    heading None. Joining the blocks' markdown gives back the article.
+
+    Args:
+        markdown: The article text
+
+    Returns:
+        List of {"heading", "markdown"} blocks in article order
+    """
+    blocks = []
+    heading = None
+    lines = []
+    in_code = False
+
+    for line in markdown.split("\n"):
+        if line.strip().startswith("```"):
+            in_code = not in_code
+        if not in_code and line.startswith("## "):
+            if lines or heading is not None:
+                blocks.append({"heading": heading, "markdown": "\n".join(lines)})
+            heading = line[3:].strip()
+            lines = []
+        lines.append(line)
+
+    if lines or heading is not None:
+        blocks.append({"heading": heading, "markdown": "\n".join(lines)})
+    return blocks
+
+def block_keys(blocks: List[Dict]) -> List[Tuple[Optional[str], int]]:
+    """
+    Key section blocks by heading and occurrence, so repeated headings stay apart.
+
+    Args:
+        blocks: List of {"heading", "markdown"} blocks
+
+    Returns:
+        (section_key of the heading, occurrence number) for each block, in order
+    """
+    seen = {}
+    keys = []
+    for block in blocks:
+        key = section_key(block["heading"])
+        seen[key] = seen.get(key, 0) + 1
+        keys.append((key, seen[key]))
+    return keys
+
+def section_body(block: Dict) -> str:
+    """
+    Get the text of a section block without its heading line.
+
+    Args:
+        block: A {"heading", "markdown"} block
+
+    Returns:
+        The section text
+    """
+    if block["heading"] is None:
+        return block["markdown"]
+    return block["markdown"].split("\n", 1)[1].strip("\n") if "\n" in block["markdown"] else ""
+
+def section_markdown(heading: str, content: str) -> str:
+    """
+    Format generated text as one "##" section.
+
+    A leading line repeating the heading is dropped and headings at the section's
+    level or above are demoted, so the text can't split into several sections.
+
+    Args:
+        heading: The section heading
+        content: The generated section text
+
+    Returns:
+        Markdown for the section
+    """
+    lines = content.strip("\n").split("\n")
+    if lines and lines[0].lstrip().startswith("#") and section_key(lines[0]) == section_key(heading):
+        lines = lines[1:]
+    return f"## {heading}\n\n" + demote_headings("\n".join(lines))
+
+def demote_headings(content: str) -> str:
+    """
+    Turn "#" and "##" headings in generated text into "###" ones, outside code blocks.
+
+    Args:
+        content: The generated text
+
+    Returns:
+        The text, with surrounding blank lines removed
+    """
+    lines = content.strip("\n").split("\n")
+    in_code = False
+    for i, line in enumerate(lines):
+        if line.strip().startswith("```"):
+            in_code = not in_code
+        elif not in_code and (line.startswith("# ") or line.startswith("## ")):
+            lines[i] = "### " + line.lstrip("#").strip()
+    return "\n".join(lines).strip("\n")
+
+def join_sections(blocks: List[Dict]) -> str:
+    """
+    Join section blocks back into an article.
+
+    Args:
+        blocks: List of {"heading", "markdown"} blocks
+
+    Returns:
+        The article text
+    """
+    return "\n\n".join(block["markdown"].strip("\n") for block in blocks if block["markdown"].strip())
+
+def body_sections(sections: List[Dict]) -> List[Dict]:
+    """
+    Drop the introduction and conclusion from a parsed outline.
+
+    Args:
+        sections: Outline sections with "heading" and "bullet_points"
+
+    Returns:
+        The body sections
+    """
+    return [section for section in sections if section_key(section["heading"]) not in FRAME_HEADINGS]
+
+def diff_outlines(old_sections: List[Dict], new_sections: List[Dict]) -> Dict:
+    """
+    Compare two parsed outlines section by section.
+
+    Sections are matched by heading and occurrence (see block_keys). A matched section
+    whose bullet points differ is changed; a renamed section shows up as removed plus added.
+
+    Args:
+        old_sections: The previous outline sections
+        new_sections: The revised outline sections
+
+    Returns:
+        Dictionary with "added", "changed", "removed" and "unchanged" headings
+    """
+    old = dict(zip(block_keys(old_sections), old_sections))
+    new_keys = block_keys(new_sections)
+
+    diff = {"added": [], "changed": [], "removed": [], "unchanged": []}
+    for key, section in zip(new_keys, new_sections):
+        previous = old.get(key)
+        if previous is None:
+            diff["added"].append(section["heading"])
+        elif previous["bullet_points"] != section["bullet_points"]:
+            diff["changed"].append(section["heading"])
+        else:
+            diff["unchanged"].append(section["heading"])
+    kept = set(new_keys)
+    diff["removed"] = [section["heading"] for key, section in old.items() if key not in kept]
+    return diff
+
+def splice_sections(base: List[Dict], replacements: Dict[Tuple[Optional[str], int], str],
+                    keys: Optional[List[Tuple[Optional[str], int]]] = None) -> List[Dict]:
+    """
+    Replace sections of an article by heading and occurrence.
+
+    Args:
+        base: Blocks of the article to splice into
+        replacements: New markdown keyed by block key (see block_keys)
+        keys: Optional keys of the base blocks, when they differ from block_keys(base)
+            (e.g. because sections were inserted or removed)
+
+    Returns:
+        The blocks with the replacements applied
+    """
+    keys = block_keys(base) if keys is None else keys
+    return [
+        {"heading": block["heading"], "markdown": replacements[key]} if key in replacements else block
+        for block, key in zip(base, keys)
+    ]
+
+def article_overview(blocks: List[Dict]) -> str:
+    """
+    Describe an article in a few lines: its title and section headings.
+
+    Args:
+        blocks: The article's section blocks
+
+    Returns:
+        The overview text
+    """
+    title = ""
+    if blocks and blocks[0]["heading"] is None:
+        first_line = blocks[0]["markdown"].strip().split("\n", 1)[0]
+        if first_line.startswith("# "):
+            title = first_line[2:].strip()
+    headings = [block["heading"] for block in blocks if block["heading"] is not None]
+    return f'Article title: "{title}"\nSections: introduction; {"; ".join(headings)}'
+
+def map_sections(markdown: str, transform: Callable[[str, str, str], str], max_workers: int) -> str:
+    """
+    Rewrite an article section by section, concurrently, and reassemble it.
+
+    transform is called with the text of one part (the introduction or a "##" section,
+    without its heading), the part's name and an overview of the whole article, and
+    returns the new text. The title and headings are kept; empty parts are skipped.
+
+    Args:
+        markdown: The article text
+        transform: Function producing the new text of a part
+        max_workers: Maximum number of parts processed at once
+
+    Returns:
+        The rewritten article
+    """
+    blocks = split_sections(markdown)
+    overview = article_overview(blocks)
+
+    def rewrite(block: Dict) -> Dict:
+        if block["heading"] is not None:
+            body = section_body(block)
+            if not body.strip():
+                return block
+            return {"heading": block["heading"],
+                    "markdown": section_markdown(block["heading"], transform(body, block["heading"], overview))}
+
+        # The title stays; only the introduction under it is rewritten
+        title, introduction = "", block["markdown"].strip("\n")
+        if introduction.startswith("# "):
+            title, _, introduction = introduction.partition("\n")
+        if not introduction.strip():
+            return block
+        introduction = transform(introduction.strip("\n"), "introduction", overview).strip("\n")
+        return {"heading": None, "markdown": f"{title}\n\n{introduction}" if title else introduction}
+
+    return join_sections(map_in_context(rewrite, blocks, max_workers))
@@ -0,0 +1,293 @@
+"""
+Metrics module for the Agentic Writer System.
+Records per-call LLM metrics and aggregates them into latency histograms and token counts.
+"""
+
+import math
+import time
+import threading
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+# Which agent and pipeline phase the current LLM call belongs to
+_call_context = contextvars.ContextVar("llm_call_context", default={})
+
+@contextmanager
+def llm_context(agent: Optional[str] = None, phase: Optional[str] = None):
+    """
+    Attribute LLM calls made inside the block to an agent and/or phase.
+
+    Args:
+        agent: Optional name of the calling agent
+        phase: Optional pipeline phase
+    """
+    context = dict(_call_context.get())
+    if agent is not None:
+        context["agent"] = agent
+    if phase is not None:
+        context["phase"] = phase
+    token = _call_context.set(context)
+    try:
+        yield
+    finally:
+        _call_context.reset(token)
+
+def current_context() -> Dict:
+    """
+    Get the agent and phase attributed to calls made right now.
+
+    Returns:
+        Dictionary with "agent" and "phase" keys
+    """
+    context = _call_context.get()
+    return {
+        "agent": context.get("agent", "system"),
+        "phase": context.get("phase", "none")
+    }
+
+class Histogram:
+    """
+    Streaming histogram with logarithmic buckets.
+
+    Memory stays bounded by the range of recorded values rather than their number,
+    and quantiles are accurate to within the bucket growth factor (5% by default).
+    """
+
+    def __init__(self, min_value: float = 0.001, growth: float = 1.05):
+        """
+        Initialize an empty histogram.
+
+        Args:
+            min_value: Values at or below this share the first bucket
+            growth: Ratio between the bounds of consecutive buckets
+        """
+        self.min_value = min_value
+        self.growth = growth
+        self._log_growth = math.log(growth)
+        self._buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def record(self, value: float):
+        """
+        Add a value to the histogram.
+
+        Args:
+            value: The value to record
+        """
+        if value <= self.min_value:
+            index = 0
+        else:
+            index = int(math.log(value / self.min_value) / self._log_growth) + 1
+        self._buckets[index] = self._buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """
+        Estimate a percentile of the recorded values.
+
+        Args:
+            percent: The percentile to estimate (0-100)
+
+        Returns:
+            The estimated value, or None if nothing was recorded
+        """
+        if not self.count:
+            return None
+
+        target = percent / 100 * self.count
+        cumulative = 0
+        for index in sorted(self._buckets):
+            cumulative += self._buckets[index]
+            if cumulative >= target:
+                # Use the geometric midpoint of the bucket, clamped to what was seen
+                value = self.min_value * self.growth ** (index - 0.5) if index else self.min_value
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def summary(self) -> Dict:
+        """
+        Summarize the histogram.
+
+        Returns:
+            Dictionary with count, mean, min, max and p50/p95/p99
+        """
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99)
+        }
+
+class _CallStats:
+    """
+    Aggregated counters and latency histogram for a group of calls.
+    """
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.calls = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.latency = Histogram()
+
+    def add(self, call: Dict):
+        """
+        Add one call to the aggregate.
+
+        Args:
+            call: The call record
+        """
+        self.calls += 1
+        self.cache_hits += 1 if call["cache_hit"] else 0
+        self.coalesced += 1 if call["coalesced"] else 0
+        self.errors += 1 if call["error"] else 0
+        self.retries += call["retries"]
+        self.prompt_tokens += call["prompt_tokens"]
+        self.completion_tokens += call["completion_tokens"]
+        self.latency.record(call["latency"])
+
+    def summary(self) -> Dict:
+        """
+        Summarize the aggregate.
+
+        Returns:
+            Dictionary of counters and latency percentiles
+        """
+        return {
+            "calls": self.calls,
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.calls - self.cache_hits,
+            "cache_hit_rate": self.cache_hits / self.calls if self.calls else 0.0,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "retries": self.retries,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "latency": self.latency.summary()
+        }
+
+class MetricsRegistry:
+    """
+    Thread-safe registry of LLM call metrics.
+
+    Keeps aggregates overall and by model, task, agent and phase, plus a bounded
+    list of the most recent calls.
+    """
+
+    def __init__(self, recent_limit: int = 200):
+        """
+        Initialize an empty registry.
+
+        Args:
+            recent_limit: Number of recent call records to keep
+        """
+        self._lock = threading.Lock()
+        self._recent_limit = recent_limit
+        self.reset()
+
+    def reset(self):
+        """
+        Discard every recorded metric.
+        """
+        with self._lock:
+            self._started = time.time()
+            self._overall = _CallStats()
+            self._groups: Dict[str, Dict[str, _CallStats]] = {"model": {}, "task": {}, "agent": {}, "phase": {}}
+            self._recent = deque(maxlen=self._recent_limit)
+
+    def record_call(self, model: str, prompt_tokens: int, completion_tokens: int, latency: float,
+                    cache_hit: bool = False, coalesced: bool = False, retries: int = 0,
+                    streamed: bool = False, tokens_estimated: bool = False,
+                    error: Optional[str] = None, agent: Optional[str] = None,
+                    phase: Optional[str] = None, task: Optional[str] = None):
+        """
+        Record one LLM call.
+
+        Agent and phase default to the current llm_context.
+
+        Args:
+            model: The model the call was made with
+            prompt_tokens: Prompt tokens used
+            completion_tokens: Completion tokens used
+            latency: Wall time of the call in seconds
+            cache_hit: Whether the response came from the cache
+            coalesced: Whether the call waited on an identical in-flight request
+            retries: Number of retries the call needed
+            streamed: Whether the response was streamed
+            tokens_estimated: Whether token counts are estimates rather than reported usage
+            error: Optional error message if the call failed
+            agent: Optional calling agent
+            phase: Optional pipeline phase
+            task: Optional routing task the call was made for
+        """
+        context = current_context()
+        call = {
+            "timestamp": time.time(),
+            "model": model,
+            "agent": agent or context["agent"],
+            "phase": phase or context["phase"],
+            "task": task or "untagged",
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "tokens_estimated": tokens_estimated,
+            "latency": latency,
+            "cache_hit": cache_hit,
+            "coalesced": coalesced,
+            "retries": retries,
+            "streamed": streamed,
+            "error": error
+        }
+
+        with self._lock:
+            self._overall.add(call)
+            for group, stats in self._groups.items():
+                stats.setdefault(call[group], _CallStats()).add(call)
+            self._recent.append(call)
+
+    def snapshot(self, recent: int = 20) -> Dict:
+        """
+        Get a summary of everything recorded so far.
+
+        Args:
+            recent: Number of most recent call records to include
+
+        Returns:
+            Dictionary with overall, per-model, per-task, per-agent and per-phase summaries
+        """
+        with self._lock:
+            snapshot = {
+                "since": self._started,
+                "overall": self._overall.summary()
+            }
+            for group, stats in self._groups.items():
+                snapshot[f"by_{group}"] = {name: s.summary() for name, s in stats.items()}
+            snapshot["recent_calls"] = list(self._recent)[-recent:] if recent else []
+            return snapshot
+
+    def recent_calls(self) -> List[Dict]:
+        """
+        Get the most recent call records.
+
+        Returns:
+            List of call records, oldest first
+        """
+        with self._lock:
+            return list(self._recent)
+
+# Process-wide registry used by the LLM utilities
+registry = MetricsRegistry()
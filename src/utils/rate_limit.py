@@ -0,0 +1,229 @@
+"""
+Rate limiting utilities for the Agentic Writer System.
+Provides a client-side request/token limiter and a retry policy with backoff and jitter.
+"""
+
+import time
+import random
+import asyncio
+import threading
+from typing import Dict, Optional
+
+class _TokenBucket:
+    """
+    Token bucket that may go into debt, so callers are served in arrival order.
+
+    Attributes:
+        capacity: Maximum number of tokens the bucket can hold
+        rate: Tokens added per second
+    """
+
+    def __init__(self, per_minute: float):
+        """
+        Initialize a full bucket.
+
+        Args:
+            per_minute: Tokens allowed per minute
+        """
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.level = per_minute
+        self.updated = time.monotonic()
+
+    def reserve(self, amount: float, now: float) -> float:
+        """
+        Take tokens from the bucket (caller must hold the limiter lock).
+
+        Args:
+            amount: Number of tokens to take
+            now: The current monotonic time
+
+        Returns:
+            Seconds to wait before the reservation may be used
+        """
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        self.level -= min(amount, self.capacity)
+        return -self.level / self.rate if self.level < 0 else 0.0
+
+    def refund(self, amount: float):
+        """
+        Return tokens to the bucket (negative amounts take extra tokens).
+
+        Args:
+            amount: Number of tokens to return
+        """
+        self.level = min(self.capacity, self.level + amount)
+
+class RateLimiter:
+    """
+    Client-side limiter for requests per minute and tokens per minute.
+
+    Callers reserve a request plus an estimate of its tokens before sending it and
+    settle the estimate against actual usage afterwards. A throttling response can
+    pause every caller until the server's Retry-After has passed.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        """
+        Initialize the limiter.
+
+        Args:
+            requests_per_minute: Requests allowed per minute (0 disables the limit)
+            tokens_per_minute: Tokens allowed per minute (0 disables the limit)
+        """
+        self._lock = threading.Lock()
+        self._requests = _TokenBucket(requests_per_minute) if requests_per_minute else None
+        self._tokens = _TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._paused_until = 0.0
+        self._stats = {
+            "requests": 0,
+            "waits": 0,
+            "wait_seconds": 0.0,
+            "retries": 0,
+            "throttled": 0,
+            "retry_after_honored": 0,
+            "failures": 0
+        }
+
+    def scale(self, factor: float):
+        """
+        Scale the limits, e.g. to give each of several processes its share of the quota.
+
+        Args:
+            factor: Multiplier applied to both limits
+        """
+        with self._lock:
+            for bucket in (self._requests, self._tokens):
+                if bucket:
+                    bucket.capacity *= factor
+                    bucket.rate *= factor
+                    bucket.level = min(bucket.level, bucket.capacity)
+
+    def _reserve(self, tokens: int) -> float:
+        """
+        Reserve capacity for one request.
+
+        Args:
+            tokens: Estimated tokens for the request
+
+        Returns:
+            Seconds to wait before sending the request
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._paused_until - now)
+            if self._requests:
+                wait = max(wait, self._requests.reserve(1, now))
+            if self._tokens:
+                wait = max(wait, self._tokens.reserve(tokens, now))
+
+            self._stats["requests"] += 1
+            if wait > 0:
+                self._stats["waits"] += 1
+                self._stats["wait_seconds"] += wait
+            return wait
+
+    def acquire(self, tokens: int = 0):
+        """
+        Block until a request with the given token estimate may be sent.
+
+        Args:
+            tokens: Estimated tokens for the request
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, tokens: int = 0):
+        """
+        Wait without blocking the event loop until a request may be sent.
+
+        Args:
+            tokens: Estimated tokens for the request
+        """
+        wait = self._reserve(tokens)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def settle(self, estimated: int, actual: int):
+        """
+        Correct the token bucket once a request's real usage is known.
+
+        Args:
+            estimated: Tokens reserved for the request
+            actual: Tokens the request actually used
+        """
+        if self._tokens:
+            with self._lock:
+                self._tokens.refund(estimated - actual)
+
+    def pause(self, seconds: float):
+        """
+        Hold back every caller for a while, e.g. after the server sent Retry-After.
+
+        Args:
+            seconds: How long to pause
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._stats["retry_after_honored"] += 1
+
+    def record(self, name: str):
+        """
+        Increment one of the limiter counters.
+
+        Args:
+            name: The counter name ("retries", "throttled" or "failures")
+        """
+        with self._lock:
+            self._stats[name] += 1
+
+    def stats(self) -> Dict:
+        """
+        Get wait and retry counters.
+
+        Returns:
+            Dictionary of limiter statistics
+        """
+        with self._lock:
+            return dict(self._stats)
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter.
+
+    Attributes:
+        max_retries: Maximum number of retries after the first attempt
+        base_delay: Delay cap for the first retry, in seconds
+        max_delay: Upper bound for a backoff delay, in seconds (a server's Retry-After may exceed it)
+    """
+
+    def __init__(self, max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 60.0):
+        """
+        Initialize the policy.
+
+        Args:
+            max_retries: Maximum number of retries after the first attempt
+            base_delay: Delay cap for the first retry, in seconds
+            max_delay: Upper bound for a backoff delay, in seconds
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """
+        Compute how long to wait before the next attempt.
+
+        Args:
+            attempt: Number of attempts made so far (1 for the first retry)
+            retry_after: Optional delay requested by the server, used as a lower bound
+
+        Returns:
+            Seconds to wait
+        """
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+        if retry_after is not None:
+            return max(retry_after, backoff)
+        return backoff
@@ -0,0 +1,110 @@
+"""
+Rendered article cache for the Agentic Writer System.
+Keeps the HTML of articles, keyed by a hash of their Markdown, in memory and on disk.
+"""
+
+import os
+import hashlib
+from typing import Optional
+
+import markdown
+
+from src.utils.cache import MemoryCache
+
+def content_hash(content: str) -> str:
+    """
+    Hash article Markdown for use as a cache key.
+
+    Args:
+        content: The article Markdown
+
+    Returns:
+        The hex digest
+    """
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+class RenderCache:
+    """
+    Two-tier cache of Markdown rendered to HTML.
+
+    Recently served pages are kept compressed in process memory; every rendered
+    page is also written to disk, so other processes and restarts skip the
+    conversion too. Disk entries live under a directory named after the markdown
+    version, so upgrading the renderer starts from a clean slate.
+
+    Attributes:
+        directory: Directory of the rendered pages for this markdown version
+        memory: The in-process tier
+    """
+
+    def __init__(self, directory: str, memory_max_bytes: int = 0):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Base directory for rendered pages
+            memory_max_bytes: Budget for the compressed in-process tier (0 disables the limit)
+        """
+        self.directory = os.path.join(directory, f"markdown-{markdown.__version__}")
+        self.memory = MemoryCache(memory_max_bytes)
+
+    def _path(self, key: str) -> str:
+        """
+        Get the file holding a rendered page.
+
+        Args:
+            key: The content hash
+
+        Returns:
+            The file path
+        """
+        return os.path.join(self.directory, key[:2], f"{key}.html")
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a rendered page, in memory first and then on disk.
+
+        Args:
+            key: The content hash
+
+        Returns:
+            The HTML, or None if the page hasn't been rendered
+        """
+        html = self.memory.get(key)
+        if html is not None:
+            return html
+
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                html = f.read()
+        except OSError:
+            return None
+        self.memory.set(key, html)
+        return html
+
+    def render(self, content: str, key: Optional[str] = None) -> str:
+        """
+        Get the HTML for article Markdown, converting and storing it on a miss.
+
+        Args:
+            content: The article Markdown
+            key: Optional content hash, if the caller already computed it
+
+        Returns:
+            The HTML
+        """
+        key = key or content_hash(content)
+        html = self.get(key)
+        if html is not None:
+            return html
+
+        html = markdown.markdown(content)
+        self.memory.set(key, html)
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(html)
+        os.replace(temp_path, path)
+        return html
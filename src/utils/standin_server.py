@@ -0,0 +1,364 @@
+"""
+Local stand-in LLM server for the Agentic Writer System.
+Speaks the OpenAI chat completions protocol with realistic, configurable latency,
+streaming speed and fault injection, so the pipeline can be load-tested offline.
+
+Run it standalone with:
+    python -m src.utils.standin_server --port 8765 --latency-median 0.8 --throttle-rate 0.05
+"""
+
+import re
+import json
+import math
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+from src.utils.backends import mock_text
+
+class StandinServer:
+    """
+    OpenAI-compatible HTTP server with deterministic outputs and simulated timing.
+
+    Time to first token follows a log-normal distribution, the rest of the response
+    is produced at a fixed tokens-per-second rate, and a configurable share of
+    requests fail with 429 (including Retry-After) or 500. Response text depends
+    only on the prompt; latencies and injected faults come from a seeded generator.
+
+    Attributes:
+        host: Interface to listen on
+        port: Port to listen on (0 picks a free port when started)
+        latency_median: Median time to first token, in seconds
+        latency_sigma: Spread of the log-normal time to first token
+        tokens_per_second: Streaming speed after the first token
+        error_rate: Share of requests answered with a 500 error
+        throttle_rate: Share of requests answered with a 429 error
+        retry_after: Retry-After value sent with 429 responses, in seconds
+        seed: Seed for latency and fault injection
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_median: float = 0.8,
+                 latency_sigma: float = 0.5, tokens_per_second: float = 50.0,
+                 error_rate: float = 0.0, throttle_rate: float = 0.0,
+                 retry_after: float = 1.0, seed: int = 0):
+        """
+        Initialize the server without starting it.
+
+        Args:
+            host: Interface to listen on
+            port: Port to listen on (0 picks a free port when started)
+            latency_median: Median time to first token, in seconds
+            latency_sigma: Spread of the log-normal time to first token
+            tokens_per_second: Streaming speed after the first token
+            error_rate: Share of requests answered with a 500 error
+            throttle_rate: Share of requests answered with a 429 error
+            retry_after: Retry-After value sent with 429 responses, in seconds
+            seed: Seed for latency and fault injection
+
+        Raises:
+            ValueError: If tokens_per_second is not positive
+        """
+        if tokens_per_second <= 0:
+            raise ValueError("tokens_per_second must be positive")
+        self.host = host
+        self.port = port
+        self.latency_median = latency_median
+        self.latency_sigma = latency_sigma
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.seed = seed
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "completed": 0, "streamed": 0, "throttled": 0, "errors": 0}
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        """Base URL to use as an OpenAI client's base_url."""
+        return f"http://{self.host}:{self.port}/v1"
+
+    def bind(self):
+        """
+        Create the HTTP server and resolve the port it listens on, so url is usable.
+        """
+        handler = type("StandinHandler", (_StandinHandler,), {"standin": self})
+        self._httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+
+    def start(self):
+        """
+        Start serving in a background thread.
+        """
+        self.bind()
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def serve_forever(self):
+        """
+        Serve in the calling thread until interrupted (binding first unless bind was called).
+        """
+        if self._httpd is None:
+            self.bind()
+        self._httpd.serve_forever()
+
+    def stop(self):
+        """
+        Stop the server.
+        """
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def _count(self, name: str):
+        """
+        Increment one of the server counters.
+
+        Args:
+            name: The counter name
+        """
+        with self._lock:
+            self._stats[name] += 1
+
+    def _plan(self) -> Dict:
+        """
+        Draw the outcome and timing of the next request.
+
+        Returns:
+            Dictionary with "fault" (None, "throttle" or "error") and "first_token" delay
+        """
+        with self._lock:
+            roll = self._random.random()
+            first_token = self._random.lognormvariate(math.log(max(self.latency_median, 1e-6)),
+                                                      self.latency_sigma)
+
+        if roll < self.throttle_rate:
+            fault = "throttle"
+        elif roll < self.throttle_rate + self.error_rate:
+            fault = "error"
+        else:
+            fault = None
+        return {"fault": fault, "first_token": first_token}
+
+    def stats(self) -> Dict:
+        """
+        Get request counters.
+
+        Returns:
+            Dictionary of server statistics
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def describe(self) -> Dict:
+        """
+        Describe the server settings.
+
+        Returns:
+            Dictionary of settings and the server URL
+        """
+        return {
+            "url": self.url,
+            "latency_median": self.latency_median,
+            "latency_sigma": self.latency_sigma,
+            "tokens_per_second": self.tokens_per_second,
+            "error_rate": self.error_rate,
+            "throttle_rate": self.throttle_rate,
+            "retry_after": self.retry_after,
+            "seed": self.seed
+        }
+
+class _StandinHandler(BaseHTTPRequestHandler):
+    """
+    Request handler for the stand-in server (the standin attribute is set per server).
+    """
+
+    standin: StandinServer = None
+
+    def log_message(self, format, *args):
+        # Keep load tests quiet
+        pass
+
+    def _send_json(self, status: int, payload: Dict, headers: Optional[Dict] = None):
+        """
+        Send a JSON response.
+
+        Args:
+            status: HTTP status code
+            payload: The JSON body
+            headers: Optional extra headers
+        """
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/v1/models":
+            self._send_json(200, {"object": "list", "data": [{"id": "standin", "object": "model"}]})
+        elif self.path.rstrip("/") == "/stats":
+            self._send_json(200, self.standin.stats())
+        else:
+            self._send_json(404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/v1/chat/completions":
+            self._send_json(404, {"error": {"message": "Not found", "type": "invalid_request_error"}})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        messages = request.get("messages", [])
+        model = request.get("model", "standin")
+        prompt = messages[-1].get("content", "") if messages else ""
+
+        standin = self.standin
+        standin._count("requests")
+        plan = standin._plan()
+
+        if plan["fault"] == "throttle":
+            standin._count("throttled")
+            self._send_json(
+                429,
+                {"error": {"message": "Rate limit reached (stand-in)", "type": "rate_limit_exceeded"}},
+                {"Retry-After": f"{standin.retry_after:g}"}
+            )
+            return
+        if plan["fault"] == "error":
+            standin._count("errors")
+            self._send_json(500, {"error": {"message": "Internal error (stand-in)", "type": "server_error"}})
+            return
+
+        text = mock_text(prompt).strip()
+        chunks = re.findall(r"\S+\s*|\s+", text)
+        prompt_tokens = sum(len(m.get("content", "")) for m in messages) // 4
+        created = int(time.time())
+        completion_id = f"chatcmpl-standin-{created}"
+
+        time.sleep(plan["first_token"])
+
+        if request.get("stream"):
+            self._stream(chunks, model, completion_id, created)
+            standin._count("streamed")
+            return
+
+        time.sleep(len(chunks) / standin.tokens_per_second)
+        self._send_json(200, {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": text},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": len(chunks),
+                "total_tokens": prompt_tokens + len(chunks)
+            }
+        })
+        standin._count("completed")
+
+    def _stream(self, chunks: List[str], model: str, completion_id: str, created: int):
+        """
+        Send a response as server-sent events, one chunk per simulated token.
+
+        Args:
+            chunks: The pieces of text to send
+            model: The model named in the request
+            completion_id: ID of the completion
+            created: Creation timestamp
+        """
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        delay = 1.0 / self.standin.tokens_per_second
+        for i, chunk in enumerate(chunks + [None]):
+            event = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "delta": {"content": chunk} if chunk is not None else {},
+                    "finish_reason": None if chunk is not None else "stop"
+                }]
+            }
+            self.wfile.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            if chunk is not None and i:
+                time.sleep(delay)
+
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+def _positive_float(value: str) -> float:
+    """
+    Parse a command-line value that must be a number above zero.
+
+    Args:
+        value: The argument text
+
+    Returns:
+        The number
+    """
+    number = float(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return number
+
+def main():
+    """
+    Run the stand-in server from the command line.
+    """
+    parser = argparse.ArgumentParser(description="Run a local OpenAI-compatible stand-in LLM server")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on")
+    parser.add_argument("--latency-median", type=float, default=0.8, help="Median time to first token in seconds")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Spread of the log-normal time to first token")
+    parser.add_argument("--tokens-per-second", type=_positive_float, default=50.0, help="Streaming speed after the first token")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with a 500 error")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of requests answered with a 429 error")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After sent with 429 responses")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for latency and fault injection")
+    args = parser.parse_args()
+
+    server = StandinServer(
+        host=args.host,
+        port=args.port,
+        latency_median=args.latency_median,
+        latency_sigma=args.latency_sigma,
+        tokens_per_second=args.tokens_per_second,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        seed=args.seed
+    )
+    # Bind first, so a port of 0 is resolved before the URL is printed
+    server.bind()
+    print(f"Stand-in LLM server listening on {server.url}")
+    print("Use it with LLM_BACKEND=standin LLM_BASE_URL=" + server.url)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
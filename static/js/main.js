@@ -31,43 +31,109 @@ document.addEventListener('DOMContentLoaded', function() {
     const statusElement = document.getElementById('status-text');
     const detailsElement = document.getElementById('progress-details');
     
+    const draftElement = document.getElementById('draft-preview');
+    
     if (progressElement && statusElement) {
-        // Function to update progress
-        function updateProgress() {
-            fetch('/api/progress')
-                .then(response => response.json())
-                .then(data => {
-                    // Update progress bar
-                    if (data.progress && data.total) {
-                        const percentage = (data.progress / data.total) * 100;
-                        progressElement.style.width = `${percentage}%`;
-                    }
-                    
-                    // Update status text
-                    if (data.phase) {
-                        statusElement.textContent = data.message || `${data.phase}...`;
-                    }
-                    
-                    // Update details
-                    if (data.section) {
-                        detailsElement.textContent = `Working on: ${data.section}`;
-                    }
-                })
-                .catch(error => {
-                    console.error('Error fetching progress:', error);
-                });
+        // Show a progress update (from the event stream or a poll)
+        function showProgress(data) {
+            // Update progress bar
+            if (data.percent !== undefined) {
+                progressElement.style.width = `${Math.max(data.percent, 5)}%`;
+            }
+            
+            // Update status text
+            if (data.message) {
+                statusElement.textContent = data.message;
+            }
+            
+            // Update details
+            if (data.running && data.running.length) {
+                detailsElement.textContent = `Working on: ${data.running.join(', ')}`;
+            } else if (data.section) {
+                detailsElement.textContent = `Working on: ${data.section}`;
+            }
         }
         
-        // Update progress every 2 seconds
-        const progressInterval = setInterval(updateProgress, 2000);
+        // Handle the end of a job; returns whether it is done
+        function finishJob(data) {
+            if (data.status !== 'complete' && data.status !== 'failed' && data.status !== 'error') {
+                return false;
+            }
+            if (data.redirect) {
+                window.location.href = data.redirect;
+            } else if (data.status === 'failed' && data.run_id) {
+                detailsElement.textContent = `Run ${data.run_id} can be resumed from its checkpoints.`;
+            }
+            return true;
+        }
         
-        // Clear interval when page is unloaded
-        window.addEventListener('beforeunload', function() {
-            clearInterval(progressInterval);
-        });
+        // Follow a queued generation job until it finishes
+        window.trackJob = function(jobId) {
+            if (!window.EventSource) {
+                pollJob(jobId);
+                return;
+            }
+            
+            // Updates are pushed over one connection as they happen
+            const events = new EventSource(`/api/events/${jobId}`);
+            
+            events.addEventListener('progress', function(event) {
+                showProgress(JSON.parse(event.data));
+            });
+            
+            events.addEventListener('status', function(event) {
+                const data = JSON.parse(event.data);
+                showProgress(data);
+                if (finishJob(data)) {
+                    events.close();
+                }
+            });
+            
+            // The draft appears a paragraph or section at a time while it is written
+            events.addEventListener('draft', function(event) {
+                if (draftElement) {
+                    draftElement.style.display = 'block';
+                    draftElement.textContent += JSON.parse(event.data).text;
+                    draftElement.scrollTop = draftElement.scrollHeight;
+                }
+            });
+            
+            // Close the connection when the page is unloaded
+            window.addEventListener('beforeunload', function() {
+                events.close();
+            });
+        };
         
-        // Initial update
-        updateProgress();
+        // Fallback for browsers without server-sent events
+        function pollJob(jobId) {
+            let progressInterval = null;
+            
+            // Function to update progress
+            function updateProgress() {
+                fetch(`/api/progress/${jobId}`)
+                    .then(response => response.json())
+                    .then(data => {
+                        showProgress(data);
+                        if (finishJob(data)) {
+                            clearInterval(progressInterval);
+                        }
+                    })
+                    .catch(error => {
+                        console.error('Error fetching progress:', error);
+                    });
+            }
+            
+            // Update progress every 2 seconds
+            progressInterval = setInterval(updateProgress, 2000);
+            
+            // Clear interval when page is unloaded
+            window.addEventListener('beforeunload', function() {
+                clearInterval(progressInterval);
+            });
+            
+            // Initial update
+            updateProgress();
+        }
     }
     
     // Form validation
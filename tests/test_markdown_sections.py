@@ -0,0 +1,118 @@
+"""
+Tests for revising an article to an edited outline.
+Checks that repeated headings are matched by occurrence and that sections added in review are kept.
+"""
+
+import unittest
+from unittest import mock
+
+from src import agentic_system
+from src.agentic_system import AgenticSystem
+from src.utils.markdown_sections import block_keys, diff_outlines, splice_sections, split_sections
+
+OLD_OUTLINE = [
+    {"heading": "Introduction", "bullet_points": ["Why loops matter"]},
+    {"heading": "Examples", "bullet_points": ["A for loop"]},
+    {"heading": "Pitfalls", "bullet_points": ["Off-by-one errors"]},
+    {"heading": "Examples", "bullet_points": ["A while loop"]},
+    {"heading": "Conclusion", "bullet_points": ["Recap"]}
+]
+
+NEW_OUTLINE = [
+    {"heading": "Introduction", "bullet_points": ["Why loops matter"]},
+    {"heading": "Examples", "bullet_points": ["A for loop"]},
+    {"heading": "Pitfalls", "bullet_points": ["Off-by-one errors"]},
+    {"heading": "Examples", "bullet_points": ["A while loop", "Breaking out early"]},
+    {"heading": "Conclusion", "bullet_points": ["Recap"]}
+]
+
+DRAFT = """# Loops
+
+Loops repeat work.
+
+## Examples
+
+First examples.
+
+## Pitfalls
+
+Some pitfalls.
+
+## Examples
+
+Second examples.
+
+## Conclusion
+
+That's loops."""
+
+class RepeatedHeadingTest(unittest.TestCase):
+    """Outlines and articles with two "Examples" sections."""
+
+    def test_diff_tells_repeated_headings_apart(self):
+        diff = diff_outlines(OLD_OUTLINE, NEW_OUTLINE)
+        self.assertEqual(diff["changed"], ["Examples"])
+        self.assertEqual(diff["unchanged"], ["Introduction", "Examples", "Pitfalls", "Conclusion"])
+        self.assertEqual(diff["added"], [])
+        self.assertEqual(diff["removed"], [])
+
+    def test_splice_replaces_one_occurrence(self):
+        blocks = splice_sections(split_sections(DRAFT), {("examples", 2): "## Examples\n\nNew examples."})
+        self.assertEqual(
+            [block["markdown"].strip() for block in blocks if block["heading"] == "Examples"],
+            ["## Examples\n\nFirst examples.", "## Examples\n\nNew examples."]
+        )
+
+    def test_rewrite_sections_rewrites_one_occurrence(self):
+        with mock.patch.object(agentic_system, "CHECKPOINTS_ENABLED", False):
+            system = AgenticSystem("Loops", "")
+        with mock.patch.object(system.writer, "_generate_parts", return_value=["Rewritten examples."]) as generate:
+            result = system.writer.rewrite_sections(DRAFT, OLD_OUTLINE, NEW_OUTLINE, "conversational")
+
+        self.assertEqual(len(generate.call_args[0][0]), 1)
+        self.assertEqual(result["rewritten_keys"], [("examples", 2)])
+        self.assertIn("## Examples\n\nFirst examples.", result["article_content"])
+        self.assertIn("## Examples\n\nRewritten examples.", result["article_content"])
+        self.assertNotIn("Second examples.", result["article_content"])
+
+class PolishSectionsTest(unittest.TestCase):
+    """Polishing revised sections of a reviewed article."""
+
+    def setUp(self):
+        with mock.patch.object(agentic_system, "CHECKPOINTS_ENABLED", False):
+            self.system = AgenticSystem("Loops", "")
+        self.system.edit_mode = "separate"
+        # The reviewer added a section the draft doesn't have
+        reviewed = DRAFT.replace("## Conclusion", "## Key Takeaways\n\nLoops are handy.\n\n## Conclusion")
+        self.system.improved_article = reviewed
+        self.system.final_article = reviewed
+        self.scopes = []
+        self.system.reviewer.act = self.fake_pass("improved_article", "Reviewed")
+        self.system.humanizer.act = self.fake_pass("humanized_article", "Humanized")
+
+    def fake_pass(self, field, label):
+        def act(task, context):
+            self.scopes.append(context.get("scope"))
+            return {field: f"{label}: {context['article_content']}"}
+        return act
+
+    def test_keeps_added_sections_and_passes_scope(self):
+        self.system.article_content = DRAFT.replace("Second examples.", "Rewritten examples.")
+        self.system._polish_sections([("examples", 2)], DRAFT)
+
+        final = split_sections(self.system.final_article)
+        self.assertEqual(
+            [key for key, _ in block_keys(final)],
+            [None, "examples", "pitfalls", "examples", "key takeaways", "conclusion"]
+        )
+        self.assertIn("## Examples\n\nFirst examples.", self.system.final_article)
+        self.assertIn("## Examples\n\nHumanized: Reviewed: Rewritten examples.", self.system.final_article)
+        self.assertIn("## Examples\n\nReviewed: Rewritten examples.", self.system.improved_article)
+        self.assertIn("## Key Takeaways\n\nLoops are handy.", self.system.improved_article)
+        self.assertEqual(len(self.scopes), 2)
+        for scope in self.scopes:
+            self.assertIn('Article title: "Loops"', scope)
+            self.assertTrue(scope.endswith("This part: Examples"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+Tests for building prompts from the agents' templates.
+Checks that normalization tidies the template but leaves the text filled into it alone.
+"""
+
+import hashlib
+import unittest
+from unittest import mock
+
+from src.utils import llm
+
+# The two spaces after "loop:" are a Markdown hard line break
+ARTICLE = """# Counting in Python
+
+Use a loop:  
+it counts to three.
+
+```python
+def count():
+    for i in range(3):
+        if i:
+            return 1
+
+
+    return 0
+```
+"""
+
+TEMPLATE = """
+        Improve this article in a {style} style.
+
+
+        Keep its structure.
+
+        ARTICLE:
+        {content}
+
+        IMPROVED ARTICLE:
+        """
+
+class RenderPromptTest(unittest.TestCase):
+    """Prompts rendered with normalization on."""
+
+    def setUp(self):
+        patcher = mock.patch.object(llm, "LLM_NORMALIZE_PROMPTS", True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_normalizes_the_template(self):
+        prompt = llm.render_prompt(TEMPLATE, style="casual", content="Some text.")
+        self.assertEqual(
+            prompt,
+            "Improve this article in a casual style.\n\nKeep its structure.\n\n"
+            "ARTICLE:\nSome text.\n\nIMPROVED ARTICLE:"
+        )
+
+    def test_keeps_indented_code_in_values(self):
+        prompt = llm.render_prompt(TEMPLATE, style="casual", content=ARTICLE)
+        self.assertIn(ARTICLE, prompt)
+        self.assertIn("        if i:\n            return 1\n\n\n    return 0", prompt)
+        self.assertIn("Use a loop:  \n", prompt)
+
+    def test_sent_prompt_is_unchanged(self):
+        prompt = llm.render_prompt(TEMPLATE, style="casual", content=ARTICLE)
+        sent, variant = llm._prepare_prompt(prompt)
+        self.assertEqual(sent, prompt)
+        self.assertIs(type(sent), str)
+        # The variant tag identifies the prompt as written, before normalization
+        written = TEMPLATE.format(style="casual", content=ARTICLE)
+        self.assertEqual(variant, hashlib.md5(written.encode()).hexdigest())
+
+    def test_whitespace_variants_share_a_prompt(self):
+        indented = llm.render_prompt(TEMPLATE, style="casual", content=ARTICLE)
+        flat = llm.render_prompt("\n".join(line.strip() for line in TEMPLATE.split("\n")),
+                                 style="casual", content=ARTICLE)
+        self.assertEqual(indented, flat)
+
+    def test_disabled_normalization_fills_in_as_written(self):
+        with mock.patch.object(llm, "LLM_NORMALIZE_PROMPTS", False):
+            prompt = llm.render_prompt(TEMPLATE, style="casual", content=ARTICLE)
+        self.assertEqual(prompt, TEMPLATE.format(style="casual", content=ARTICLE))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+"""
+Tests for resuming checkpointed runs.
+Checks that a run interrupted after saving still finishes its improvements summary.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from src import agentic_system
+from src.agentic_system import AgenticSystem
+from src.agents.reviewer import ReviewerAgent
+from src.utils import artifacts
+
+DRAFT = "# Loops\n\nLoops repeat work.\n\n## Examples\n\nA for loop."
+FINAL = "# Loops\n\nLoops repeat work, again and again.\n\n## Examples\n\nA for loop, explained."
+
+class ResumeAfterSavingTest(unittest.TestCase):
+    """A run that stopped after its article was saved but before the summary was done."""
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        for patcher in (mock.patch.object(artifacts, "RUNS_DIR", self.directory),
+                        mock.patch.object(agentic_system, "CHECKPOINTS_ENABLED", True)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        system = AgenticSystem("Loops", "")
+        system.platform_style = {}
+        system._store("subtopics", [])
+        system.research = {"summary": ""}
+        system.outline = {"outline": "## Examples\n- A for loop", "sections": []}
+        system.article_content = DRAFT
+        system.improved_article = FINAL
+        system.final_article = FINAL
+
+        self.metadata_path = os.path.join(self.directory, "article.json")
+        with open(self.metadata_path, "w", encoding="utf-8") as f:
+            json.dump({"generation_process": {"improvements": {"status": "pending"}}}, f)
+        system.artifacts.put("saved", {"metadata_path": self.metadata_path})
+        system._update_manifest(status="failed")
+        self.run_id = system.run_id
+
+    def test_resume_restarts_the_summary(self):
+        improvements = {"summary": "Expanded the examples."}
+        with mock.patch.object(ReviewerAgent, "act", return_value={"improvements": improvements}) as act:
+            system = AgenticSystem.resume(self.run_id)
+            system.run_with_progress_callback(None)
+            self.assertTrue(system.wait_for_background(5))
+
+        act.assert_called_once()
+        self.assertEqual(act.call_args[0][1]["original_article"], DRAFT)
+        self.assertEqual(act.call_args[0][1]["improved_article"], FINAL)
+        with open(self.metadata_path, "r", encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["generation_process"]["improvements"], improvements)
+        self.assertEqual(system.artifacts.get("improvements"), improvements)
+
+if __name__ == "__main__":
+    unittest.main()
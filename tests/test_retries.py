@@ -0,0 +1,117 @@
+"""
+Tests for retrying throttled LLM requests.
+Runs the bundled stand-in server and checks that Retry-After is honoured and retries run out.
+"""
+
+import time
+import threading
+import unittest
+from unittest import mock
+
+from src.utils import llm
+from src.utils.backends import StandinBackend
+from src.utils.concurrency import ConcurrencyLimiter
+from src.utils.rate_limit import RateLimiter, RetryPolicy
+from src.utils.standin_server import StandinServer
+
+MESSAGES = [{"role": "user", "content": "Write a sentence about tests."}]
+
+class ThrottledRetryTest(unittest.TestCase):
+    """Requests to a stand-in server that throttles every request."""
+
+    retry_after = 0.2
+    max_retries = 2
+
+    def setUp(self):
+        self.server = StandinServer(latency_median=0.01, latency_sigma=0.0, throttle_rate=1.0,
+                                    retry_after=self.retry_after)
+        self.server.start()
+        self.addCleanup(self.server.stop)
+
+        self.rate_limiter = RateLimiter(0, 0)
+        # A tiny backoff, so any wait beyond it comes from the server's Retry-After
+        policy = RetryPolicy(self.max_retries, base_delay=0.01, max_delay=0.01)
+        for name, value in (("backend", StandinBackend(self.server.url)),
+                            ("_rate_limiter", self.rate_limiter),
+                            ("_retry_policy", policy)):
+            patcher = mock.patch.object(llm, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _request(self):
+        return llm.backend.complete(MESSAGES, "gpt-4o-mini", 0.7)
+
+    def test_retries_until_exhausted(self):
+        call = llm._new_call(MESSAGES[0]["content"])
+        start = time.time()
+        with self.assertRaises(llm.LLMError) as raised:
+            llm._call_with_retries(self._request, 10, call)
+        elapsed = time.time() - start
+
+        attempts = self.max_retries + 1
+        self.assertIn(f"after {attempts} attempt(s)", str(raised.exception))
+        self.assertEqual(call["retries"], self.max_retries)
+        self.assertEqual(self.server.stats()["throttled"], attempts)
+        self.assertEqual(self.server.stats()["completed"], 0)
+
+        stats = self.rate_limiter.stats()
+        self.assertEqual(stats["throttled"], attempts)
+        self.assertEqual(stats["retries"], self.max_retries)
+        self.assertEqual(stats["failures"], 1)
+
+        # Every retry waited at least as long as the server asked
+        self.assertGreaterEqual(elapsed, self.max_retries * self.retry_after)
+
+    def test_retry_delay_honours_retry_after(self):
+        try:
+            self._request()
+        except Exception as e:
+            error = e
+        else:
+            self.fail("the stand-in server did not throttle the request")
+
+        self.assertEqual(getattr(error, "status_code", None), 429)
+        self.assertAlmostEqual(llm._retry_after(error), self.retry_after)
+        self.assertGreaterEqual(llm._retry_delay(error, 1), self.retry_after)
+        self.assertIsNone(llm._retry_delay(error, self.max_retries + 1))
+
+    def test_releases_slot_while_waiting_to_retry(self):
+        limiter = ConcurrencyLimiter(1)
+        patcher = mock.patch.object(llm, "_concurrency", limiter)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        def retry():
+            with self.assertRaises(llm.LLMError):
+                prompt = MESSAGES[0]["content"]
+                llm._complete(prompt, "gpt-4o-mini", 0.7, llm._new_call(prompt))
+
+        thread = threading.Thread(target=retry)
+        thread.start()
+        # Let the first attempt be throttled, so the call is waiting to retry
+        time.sleep(self.retry_after / 2)
+        start = time.time()
+        with limiter:
+            waited = time.time() - start
+        thread.join()
+
+        self.assertLess(waited, self.retry_after / 2)
+        self.assertEqual(limiter.stats()["in_flight"], 0)
+
+    def test_recovers_when_throttling_stops(self):
+        call = llm._new_call(MESSAGES[0]["content"])
+
+        def request():
+            # Let the next attempt through once the first has been throttled
+            if self.server.stats()["throttled"]:
+                self.server.throttle_rate = 0.0
+            return self._request()
+
+        result = llm._call_with_retries(request, 10, call)
+        self.assertTrue(result["text"])
+        self.assertEqual(call["retries"], 1)
+        self.assertEqual(self.server.stats()["throttled"], 1)
+        self.assertEqual(self.server.stats()["completed"], 1)
+
+if __name__ == "__main__":
+    unittest.main()